@@ -0,0 +1,70 @@
+"""
+* Summarises rejected rows from the error log (replaces
+  archive/validation_report.parse_error_log).
+* Streams the log through mmap, in parallel shards, and - by default -
+  continues from where the previous run stopped:
+      python analyze_logs.py                  # new lines since last run
+      python analyze_logs.py --full           # re-read the whole log
+"""
+
+import os
+import csv
+import sys
+import argparse
+
+import config
+from src.log_analyzer import LogAnalyzer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise rejected rows in the error log")
+    parser.add_argument("log_file", nargs="?", default=config.ERROR_LOG_FILE)
+    parser.add_argument("--state", default=config.LOG_ANALYZER_STATE,
+                        help="Offset/totals file for incremental runs")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore (and reset) the saved offset")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", default=os.path.join(
+        config.PATHS["reports_errors"], "error_messages.csv"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.full and os.path.exists(args.state):
+        os.remove(args.state)
+
+    summary = LogAnalyzer(args.log_file, state_file=args.state, workers=args.workers).analyze()
+
+    print("=" * 60)
+    print("ERROR SUMMARY")
+    print("=" * 60)
+    print(f"Rows logged: {summary['records']}")
+    print(f"Period: {summary['first_timestamp']} .. {summary['last_timestamp']}")
+    print("\nBy type:")
+    for error_type, count in summary["by_type"].most_common():
+        print(f"  {error_type}: {count}")
+
+    print("\nValidation error details:")
+    for message, count in summary["messages"].most_common():
+        print(f"  {message}: {count}")
+
+    if summary["summarised_rows"]:
+        print(f"\nRejected rows per error code ({summary['summarised_rows']} rows, "
+              f"from sampled-logging totals):")
+        for code, count in summary["rejects_by_code"].most_common():
+            print(f"  {code}: {count}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["error_message", "count"])
+        writer.writerows(summary["messages"].most_common())
+    print(f"\nMessage counts exported to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
-import psycopg2
-from data_loader import CSVLoader
+import os
+import sys
+
+# Run from anywhere: the project root holds config.py and src/
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from src.migrations import MigrationRunner
 
 db_config = {
     "host": "localhost",
@@ -8,14 +14,9 @@ db_config = {
     "password": "dev123"
 }
 
-conn = psycopg2.connect(**db_config)
-cursor = conn.cursor()
-
-with open('add_constraints.sql', 'r') as f:
-    sql = f.read()
-    cursor.execute(sql)
+# The constraints (formerly add_constraints.sql) live in
+# migrations/001_create_leads.sql now - applying pending migrations adds them
+with MigrationRunner(db_config, os.path.join(PROJECT_DIR, "migrations")) as runner:
+    applied = runner.migrate()
 
-conn.commit()
-print("Constraints added successfully")
-cursor.close()
-conn.close()
+print(f"Constraints added successfully ({len(applied)} migration(s) applied)")
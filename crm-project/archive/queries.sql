@@ -1,10 +1,11 @@
 -- @query: Leads By Status
+-- Reads the loader-maintained summary table (migrations/002_summary_tables.sql), not leads
 SELECT
     status,
-    COUNT(*) as lead_count,
-    -- Calculate percantage of total (subquery in SELECT)
-    ROUND(100.0 * COUNT(*) / (SELECT COUNT(*) FROM leads), 2) as percentage
-FROM leads
+    SUM(lead_count) as lead_count,
+    -- Percentage of total: window SUM over the grouped SUMs
+    ROUND(100.0 * SUM(lead_count) / SUM(SUM(lead_count)) OVER (), 2) as percentage
+FROM lead_counts_by_status_industry
 GROUP BY status
 ORDER BY lead_count DESC;
 
@@ -60,4 +61,44 @@ GROUP BY domain
 ORDER BY lead_count DESC
 LIMIT 10;
 
+-- @query: Email domain counts
+SELECT
+    domain,
+    lead_count
+FROM lead_counts_by_domain
+ORDER BY lead_count DESC
+LIMIT 10;
 
+-- @query: Daily lead volume
+SELECT
+    day,
+    lead_count
+FROM lead_counts_daily
+WHERE day >= CURRENT_DATE - 30
+ORDER BY day DESC;
+
+-- @query: Rejects by error code
+-- Reasons rows were quarantined in the last 7 days (lead_rejects, filled at load time)
+SELECT
+    code AS error_code,
+    COUNT(*) AS row_count,
+    COUNT(DISTINCT source_file) AS files
+FROM lead_rejects, unnest(error_codes) AS code
+WHERE rejected_at >= CURRENT_DATE - INTERVAL '7 days'
+GROUP BY code
+ORDER BY row_count DESC;
+
+-- @query: Status changes in the last 7 days
+-- Versions of leads_history that replaced an earlier version (SCD Type 2)
+SELECT
+    older.status AS from_status,
+    newer.status AS to_status,
+    COUNT(*) AS lead_count
+FROM leads_history newer
+JOIN leads_history older
+    ON older.lead_id = newer.lead_id
+   AND older.valid_to = newer.valid_from
+WHERE newer.valid_from >= CURRENT_DATE - INTERVAL '7 days'
+  AND older.status IS DISTINCT FROM newer.status
+GROUP BY 1, 2
+ORDER BY lead_count DESC;
@@ -0,0 +1,347 @@
+"""
+* End-to-end benchmark for the ETL stages.
+* Generates 10k / 100k / 1M row datasets (generate_test_data.generate_bulk,
+  default error ratios), times each stage on its own (parse, validate,
+  load per strategy, exports, reports) and writes rows/sec + peak RSS per
+  stage as JSON.
+* Runs against a scratch database (config.BENCHMARK["database"]) - leads
+  there is truncated between load strategies. Create it once with:
+      createdb crm_benchmark
+* Compare mode flags stages that got slower / bigger than a stored baseline:
+      python benchmark.py --save-baseline benchmarks/baseline.json
+      python benchmark.py --baseline benchmarks/baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+from datetime import datetime
+
+import pandas as pd
+
+import config
+from generate_test_data import generate_bulk, DEFAULT_ERROR_RATIOS
+from src.validator import LeadValidator
+from src.data_loader import CSVLoader, LOAD_STRATEGIES
+from src.migrations import MigrationRunner
+from src.query_runner import QueryRunner
+from src.reports import ReportEngine
+
+
+def dataset_path(rows, seed):
+    """Generate (once) and return the dataset for rows / seed"""
+    prefix = f"leads_{rows}_{seed}"
+    filepath = os.path.join(config.PATHS["benchmarks"], f"{prefix}_1.csv")
+
+    if not os.path.exists(filepath):
+        print(f"Generating {filepath}...")
+        generate_bulk(
+            rows,
+            seed=seed,
+            ratios=DEFAULT_ERROR_RATIOS,
+            output_dir=config.PATHS["benchmarks"],
+            prefix=prefix,
+        )
+
+    return filepath
+
+
+def _reset_peak_rss():
+    """Reset the kernel's RSS high-water mark (Linux) so peaks are per stage"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass  # not Linux (or not allowed) - peaks become process-wide
+
+
+def _peak_rss_mb():
+    """Peak resident set size since the last reset, in MB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Benchmark:
+    """Times each stage and collects one result dict per (size, stage)"""
+
+    def __init__(self, db_config, strategies, row_strategy_max_rows, skip_db=False):
+        self.db_config = db_config
+        self.strategies = strategies
+        self.row_strategy_max_rows = row_strategy_max_rows
+        self.skip_db = skip_db
+        self.results = []
+
+    def measure(self, size, stage, rows, func):
+        """
+        Run func() and record its wall time, rows/sec and peak RSS.
+
+        Args:
+            size: Dataset size (rows in the generated file)
+            stage: Stage name, e.g. "validate" or "load_copy"
+            rows: Rows the stage handles (used for rows/sec)
+            func: Zero-argument callable; its return value is passed back
+
+        Returns:
+            Whatever func() returned
+        """
+        _reset_peak_rss()
+        start = time.perf_counter()
+        value = func()
+        seconds = time.perf_counter() - start
+
+        result = {
+            "size": size,
+            "stage": stage,
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+        }
+        self.results.append(result)
+
+        print(
+            f"  {stage:<16} {rows:>10,} rows  {seconds:>9.3f}s  "
+            f"{result['rows_per_sec'] or 0:>12,.0f} rows/s  "
+            f"{result['peak_rss_mb']:>8.1f} MB"
+        )
+        return value
+
+    def run_size(self, size, seed):
+        """Run every stage for one dataset size"""
+        filepath = dataset_path(size, seed)
+
+        print(f"\n{size:,} rows ({filepath})")
+
+        df = self.measure(size, "parse", size, lambda: self._parse(filepath))
+
+        validator = LeadValidator()
+        valid_mask, _ = self.measure(
+            size, "validate", len(df), lambda: validator.validate_frame(df)
+        )
+        valid_df = df[valid_mask]
+
+        if self.skip_db:
+            return
+
+        for strategy in self.strategies:
+            if strategy == "row" and size > self.row_strategy_max_rows:
+                print(f"  load_row         skipped (> {self.row_strategy_max_rows:,} rows)")
+                continue
+            self._load(size, strategy, valid_df)
+
+        self._export_and_report(size)
+
+    def _parse(self, filepath):
+        """Read the file in CHUNK_SIZE chunks, exactly like the pipeline"""
+        if not config.CHUNK_SIZE:
+            return pd.read_csv(filepath, dtype=str).fillna("")
+
+        with pd.read_csv(filepath, dtype=str, chunksize=config.CHUNK_SIZE) as reader:
+            return pd.concat(list(reader)).fillna("")
+
+    def _load(self, size, strategy, valid_df):
+        with CSVLoader(
+            self.db_config,
+            strategy=strategy,
+            page_size=config.LOAD_PAGE_SIZE,
+            aggregates=config.AGGREGATES,
+            history=config.LEAD_HISTORY,
+        ) as loader:
+            loader.clear_table("leads")
+            stats = self.measure(
+                size,
+                f"load_{strategy}",
+                len(valid_df),
+                lambda: loader.load_dataframe(valid_df, "leads"),
+            )
+
+        self.results[-1]["loaded"] = stats["loaded"]
+        self.results[-1]["duplicates"] = stats["duplicates"]
+        self.results[-1]["failed"] = stats["failed"]
+
+    def _export_and_report(self, size):
+        """Exports and reports run over whatever the last load left in leads"""
+        output_dir = config.PATHS["benchmarks"]
+
+        with QueryRunner(self.db_config) as runner:
+            rows = runner.run_query("SELECT COUNT(*) AS count FROM leads")[0]["count"]
+
+            self.measure(
+                size,
+                "export_copy",
+                rows,
+                lambda: runner.export_to_csv(
+                    "SELECT * FROM leads", os.path.join(output_dir, "export_copy.csv")
+                ),
+            )
+            self.measure(
+                size,
+                "export_stream",
+                rows,
+                lambda: runner.export_to_csv(
+                    "SELECT * FROM leads",
+                    os.path.join(output_dir, "export_stream.csv"),
+                    transform=lambda record: record,
+                ),
+            )
+
+            engine = ReportEngine(
+                runner,
+                daily_dir=os.path.join(output_dir, "reports"),
+                errors_dir=os.path.join(output_dir, "reports"),
+                from_aggregates=config.AGGREGATES,
+            )
+            self.measure(size, "reports", rows, engine.generate)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline run.
+
+    A stage regresses when its rows/sec drops, or its peak RSS grows, by
+    more than threshold (0.10 = 10%). Stages missing from either run are
+    ignored.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    previous = {(r["size"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\nComparison with baseline from {baseline['meta']['timestamp']}:")
+    for result in results:
+        before = previous.get((result["size"], result["stage"]))
+        if before is None:
+            continue
+
+        label = f"{result['size']:,} {result['stage']}"
+        flags = []
+
+        if before["rows_per_sec"] and result["rows_per_sec"]:
+            change = result["rows_per_sec"] / before["rows_per_sec"] - 1
+            if change < -threshold:
+                flags.append(f"throughput {change:+.1%}")
+        else:
+            change = 0.0
+
+        rss_change = result["peak_rss_mb"] / before["peak_rss_mb"] - 1
+        if rss_change > threshold:
+            flags.append(f"peak RSS {rss_change:+.1%}")
+
+        status = "REGRESSION " + ", ".join(flags) if flags else "ok"
+        print(f"  {label:<28} {change:+7.1%} rows/s  {rss_change:+7.1%} RSS  {status}")
+
+        if flags:
+            regressions.append(f"{label}: {', '.join(flags)}")
+
+    return regressions
+
+
+def parse_args(argv=None):
+    settings = config.BENCHMARK
+
+    parser = argparse.ArgumentParser(description="Benchmark the CRM ETL stages")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=settings["sizes"],
+        help="Dataset sizes in rows",
+    )
+    parser.add_argument(
+        "--strategies", nargs="+", choices=LOAD_STRATEGIES,
+        default=list(LOAD_STRATEGIES), help="Load strategies to time",
+    )
+    parser.add_argument("--seed", type=int, default=settings["seed"])
+    parser.add_argument(
+        "--database", default=settings["database"],
+        help="Scratch database to load into (its leads table gets truncated)",
+    )
+    parser.add_argument("--output", help="Results JSON (default: timestamped file)")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="Also write results to this path")
+    parser.add_argument(
+        "--threshold", type=float, default=settings["regression_threshold"],
+        help="Allowed slowdown / RSS growth before flagging (0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--skip-db", action="store_true",
+        help="Only time parse and validate (no PostgreSQL needed)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_config = {**config.DB_CONFIG, "database": args.database}
+
+    print("=" * 80)
+    print("CRM ETL Benchmark")
+    print("=" * 80)
+
+    if not args.skip_db:
+        with MigrationRunner(db_config, "migrations") as runner:
+            runner.migrate()
+
+    benchmark = Benchmark(
+        db_config,
+        args.strategies,
+        config.BENCHMARK["row_strategy_max_rows"],
+        skip_db=args.skip_db,
+    )
+    for size in args.sizes:
+        benchmark.run_size(size, args.seed)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": None if args.skip_db else args.database,
+            "seed": args.seed,
+            "settings": {
+                "page_size": config.LOAD_PAGE_SIZE,
+                "chunk_size": config.CHUNK_SIZE,
+                "aggregates": config.AGGREGATES,
+            },
+        },
+        "results": benchmark.results,
+    }
+
+    output = args.output or os.path.join(
+        config.PATHS["benchmarks"],
+        f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+    )
+    for path in filter(None, (output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(benchmark.results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nNo regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
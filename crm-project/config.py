@@ -6,15 +6,88 @@ DB_CONFIG = {
     "password": "dev123",
 }
 
+# Connection pool shared by CSVLoader and QueryRunner (see src/db_pool.py)
+DB_POOL = {
+    "min_size": 1,
+    "max_size": 5,
+    "timeout": 30,  # seconds to wait for a free connection
+    "health_check_interval": 30,  # ping connections idle longer than this
+}
+
 
 # Directory paths
 PATHS = {
     "input": "data/input",
     "processed": "data/processed",
     "failed": "data/failed",
+    "manifest": "data/manifest",
     "reports_daily": "reports/daily",
     "reports_errors": "reports/errors",
     "logs": "logs/",
+    "benchmarks": "data/benchmark",
+}
+
+
+# Loading
+# "row" = one INSERT per row,
+# "batch" = multi-row INSERTs with savepoints (bad rows isolated by bisection),
+# "copy" = COPY into staging + one set-based merge
+# "upsert" = like "copy", but existing leads are updated (status changes
+#            only move forward along VALID_STATUSES; turns off DEDUP_EMAILS)
+LOAD_STRATEGY = "copy"
+
+# Rows per INSERT for the "batch" strategy
+LOAD_PAGE_SIZE = 1000
+
+# Rows per chunk when streaming input files (None = whole file at once)
+CHUNK_SIZE = 50_000
+
+# Maintain the summary tables from migrations/002_summary_tables.sql at load time
+# (reports and get_row_count then read them instead of scanning leads)
+AGGREGATES = True
+
+# Keep every version of each lead in leads_history (SCD Type 2, see
+# migrations/006_leads_history.sql), merged in the same transaction as each load
+LEAD_HISTORY = True
+
+# Skip rows whose email is already stored (or seen earlier in the run)
+# before they are sent to the database; they are stored in lead_rejects
+# as "duplicate_email". Costs ~8 bytes of memory per stored lead.
+DEDUP_EMAILS = True
+
+# Worker processes for ETL.process_all_files (1 = sequential)
+WORKERS = 1
+
+# Also write valid rows to data/processed/valid_<file> (not needed to load)
+WRITE_PROCESSED = False
+
+# Rejected rows always go to the lead_rejects table; this also writes them
+# to data/failed/invalid_<file> (with an error_codes column)
+WRITE_REJECTS_FILE = False
+
+# Format of the valid/invalid row files and reports: "csv" or "parquet"
+# (parquet needs pyarrow; each file becomes a dataset directory of
+# compressed part files, one per chunk)
+OUTPUT_FORMAT = "csv"
+PARQUET_COMPRESSION = "zstd"
+
+
+# Run metrics (src/metrics.py), written at the end of every pipeline run
+METRICS = {
+    "json_dir": "reports/metrics",  # one run_<timestamp>.json per run
+    # Point at node_exporter's --collector.textfile.directory to scrape it
+    "prometheus_file": "reports/metrics/crm_etl.prom",
+    "progress_interval": 10,  # seconds between progress/ETA log lines
+}
+
+
+# Benchmark (benchmark.py) - runs against its own scratch database
+BENCHMARK = {
+    "database": "crm_benchmark",  # leads here is truncated between runs
+    "sizes": [10_000, 100_000, 1_000_000],
+    "seed": 42,
+    "row_strategy_max_rows": 100_000,  # "row" loads of 1M rows take too long
+    "regression_threshold": 0.10,  # flag >10% slower / more memory
 }
 
 
@@ -36,3 +109,15 @@ LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 LOG_FILE = "logs/etl_pipeline.log"
 ERROR_LOG_FILE = "logs/etl_errors.log"  # <-- ADD THIS LINE
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Byte offset + running totals for incremental analyze_logs.py runs
+LOG_ANALYZER_STATE = "logs/etl_errors.state.json"
+
+# Queue-based logging: handlers run on a background listener thread, so
+# callers never block on console/file I/O
+LOG_QUEUE = True
+
+# Per-row rejects: log the first N verbatim, then counts per error type
+# every LOG_ROW_ERRORS_SUMMARY_EVERY rejects (plus a total at the end)
+LOG_ROW_ERRORS_VERBATIM = 20
+LOG_ROW_ERRORS_SUMMARY_EVERY = 10_000
@@ -1,6 +1,11 @@
+import io
 import os
 import csv
+import sys
 import random
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 import config
 
 from faker import Faker
@@ -78,9 +83,12 @@ def generate_cross_field_error():
     return lead
 
 
+FIELDNAMES = ["company_name", "contact_person", "email", "industry", "status"]
+
+
 def write_csv(filename, data):
     with open(filename, "w", newline="") as f:
-        fieldnames = ["company_name", "contact_person", "email", "industry", "status"]
+        fieldnames = FIELDNAMES
 
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
@@ -178,6 +186,326 @@ def generate_invalid_leads():
     write_csv("data/input/invalid_leads.csv", leads)
     print("  Created with 50 invalid leads.")
 
+# ---------------------------------------------------------------------------
+# High-volume generation
+#
+# Faker is slow (~tens of microseconds per call), so it is only used to
+# pre-sample small value pools. Rows are then assembled from the pools with
+# a seeded random.Random per chunk, in parallel worker processes, and
+# streamed to disk chunk by chunk in order. Same seed + arguments = same
+# bytes out, whatever the number of workers.
+# ---------------------------------------------------------------------------
+
+# Error types the generator can inject, with their default share of rows
+DEFAULT_ERROR_RATIOS = {
+    "missing_field": 0.04,
+    "invalid_email": 0.03,
+    "invalid_industry": 0.02,
+    "duplicate_email": 0.05,
+    "cross_field": 0.01,
+}
+
+# Values sampled from Faker per pool
+POOL_SIZE = 2_000
+
+# Rows generated per worker task
+GENERATION_CHUNK_SIZE = 50_000
+
+# Chunks per worker that may be generating or waiting to be written at
+# once - bounds memory however many rows are requested
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def build_value_pools(seed, pool_size=POOL_SIZE):
+    """
+    Pre-sample Faker values once, up front.
+
+    The pools depend only on the seed (and the installed Faker version).
+    """
+    pool_faker = Faker()
+    pool_faker.seed_instance(seed)
+
+    return {
+        "companies": [pool_faker.company() for _ in range(pool_size)],
+        "names": [pool_faker.name() for _ in range(pool_size)],
+        "user_names": [pool_faker.user_name() for _ in range(pool_size)],
+        "domains": [pool_faker.free_email_domain() for _ in range(50)]
+        + [pool_faker.domain_name() for _ in range(pool_size // 10)],
+    }
+
+
+def email_for_row(pools, row_index):
+    """
+    The (unique) email of row row_index.
+
+    A pure function of the row index, so a duplicate of any earlier row can
+    be produced without remembering every email generated so far.
+    """
+    user_names = pools["user_names"]
+    domains = pools["domains"]
+    user = user_names[(row_index * 7919) % len(user_names)]
+    return f"{user}{row_index}@{domains[row_index % len(domains)]}"
+
+
+def generate_rows(start, count, seed, pools, ratios):
+    """
+    Generate rows [start, start + count) as CSV text (no header).
+
+    Every chunk seeds its own Random from (seed, start), so chunks can be
+    produced in any order, by any process, with identical results.
+    """
+    rng = random.Random(seed * 1_000_003 + start)
+    thresholds = []
+    cumulative = 0.0
+    for error, ratio in ratios.items():
+        cumulative += ratio
+        thresholds.append((cumulative, error))
+
+    companies = pools["companies"]
+    names = pools["names"]
+    industries = config.ALLOWED_INDUSTRIES
+    statuses = config.VALID_STATUSES
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    for row_index in range(start, start + count):
+        lead = [
+            rng.choice(companies),
+            rng.choice(names),
+            email_for_row(pools, row_index),
+            rng.choice(industries),
+            rng.choice(statuses),
+        ]
+
+        roll = rng.random()
+        error = next((error for limit, error in thresholds if roll < limit), None)
+
+        if error == "missing_field":
+            lead[rng.choice((0, 2))] = ""
+        elif error == "invalid_email":
+            lead[2] = lead[2].replace("@", "_at_")
+        elif error == "invalid_industry":
+            lead[3] = "Olympic Curling"
+        elif error == "duplicate_email" and row_index > 0:
+            lead[2] = email_for_row(pools, rng.randrange(row_index))
+        elif error == "cross_field":
+            lead[1] = ""
+            lead[4] = "Converted"
+
+        writer.writerow(lead)
+
+    return buffer.getvalue()
+
+
+def _generate_chunk(task):
+    """ProcessPoolExecutor entry point (must be a module-level function)"""
+    return generate_rows(*task)
+
+
+def _ordered_results(executor, tasks, window):
+    """
+    Yield _generate_chunk(task) for every task, in task order.
+
+    executor.map() would submit every task up front and keep every result
+    until it is consumed. Here at most window chunks are generating, or
+    done and waiting for their turn, at any time.
+    """
+    tasks = iter(tasks)
+    running = {}  # future -> task index
+    finished = {}  # task index -> chunk that finished ahead of its turn
+    submitted = next_index = 0
+
+    while True:
+        while len(running) + len(finished) < window:
+            task = next(tasks, None)
+            if task is None:
+                break
+            running[executor.submit(_generate_chunk, task)] = submitted
+            submitted += 1
+
+        if next_index in finished:
+            yield finished.pop(next_index)
+            next_index += 1
+            continue
+
+        if not running:
+            return
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            finished[running.pop(future)] = future.result()
+
+
+def plan_files(rows, files, chunk_size=GENERATION_CHUNK_SIZE):
+    """
+    Split rows into files of (almost) equal size, and each file into chunks.
+
+    Returns:
+        List of (file_number, [(start_row, chunk_rows), ...])
+    """
+    plan = []
+    start = 0
+    for file_number in range(files):
+        file_rows = rows // files + (1 if file_number < rows % files else 0)
+        chunks = []
+        end = start + file_rows
+        while start < end:
+            chunk_rows = min(chunk_size, end - start)
+            chunks.append((start, chunk_rows))
+            start += chunk_rows
+        plan.append((file_number, chunks))
+    return plan
+
+
+def generate_bulk(rows, files=1, seed=42, ratios=None, workers=None,
+                  output_dir="data/input", prefix="leads", copy=False):
+    """
+    Generate rows leads across files files.
+
+    Args:
+        rows: Total data rows
+        files: Number of output files (rows are split evenly)
+        seed: Fixed seed - same arguments always give the same data
+        ratios: {error type: share of rows}, defaults to DEFAULT_ERROR_RATIOS
+        workers: Worker processes (None = one per core)
+        output_dir: Where to write <prefix>_<n>.csv
+        prefix: Output file name prefix
+        copy: Load straight into PostgreSQL (via CSVLoader's COPY strategy)
+              instead of writing files
+
+    Returns:
+        List of files written ([] in copy mode)
+    """
+    ratios = DEFAULT_ERROR_RATIOS if ratios is None else ratios
+    unknown = set(ratios) - set(DEFAULT_ERROR_RATIOS)
+    if unknown:
+        raise ValueError(f"Unknown error types: {sorted(unknown)}")
+    if sum(ratios.values()) > 1:
+        raise ValueError("Error ratios add up to more than 1")
+
+    pools = build_value_pools(seed)
+    plan = plan_files(rows, files)
+    written = []
+
+    seeder = _DatabaseSeeder(config.DB_CONFIG) if copy else None
+
+    tasks = [
+        (start, count, seed, pools, ratios)
+        for _, chunks in plan
+        for start, count in chunks
+    ]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Chunks come back in task order, so files are written in order
+            # while later chunks are still being generated
+            window = CHUNKS_IN_FLIGHT_PER_WORKER * (workers or os.cpu_count() or 1)
+            results = _ordered_results(executor, tasks, window)
+
+            for file_number, chunks in plan:
+                if seeder:
+                    for _ in chunks:
+                        seeder.load(next(results))
+                    continue
+
+                filepath = os.path.join(output_dir, f"{prefix}_{file_number + 1}.csv")
+                os.makedirs(output_dir, exist_ok=True)
+                with open(filepath, "w", newline="") as f:
+                    f.write(",".join(FIELDNAMES) + "\n")
+                    for _ in chunks:
+                        f.write(next(results))
+
+                written.append(filepath)
+                print(f"  Wrote {filepath} ({sum(count for _, count in chunks):,} rows)")
+    finally:
+        if seeder:
+            seeder.close()
+
+    return written
+
+
+class _DatabaseSeeder:
+    """
+    Validates generated chunks and loads the valid rows with COPY.
+
+    Goes through CSVLoader so duplicates, summary tables and row counters
+    are handled exactly as in a pipeline run.
+    """
+
+    def __init__(self, db_config):
+        from src.data_loader import CSVLoader
+        from src.validator import LeadValidator
+
+        self.loader = CSVLoader(
+            db_config,
+            strategy="copy",
+            aggregates=config.AGGREGATES,
+            history=config.LEAD_HISTORY,
+        )
+        self.loader.__enter__()
+        self.validator = LeadValidator()
+        self.loaded = 0
+        self.rejected = 0
+
+    def load(self, text):
+        records = csv.DictReader(io.StringIO(text), fieldnames=FIELDNAMES)
+        valid = []
+        for record in records:
+            if self.validator.validate_lead(record):
+                valid.append(record)
+            else:
+                self.rejected += 1
+
+        stats = self.loader.load_records(valid, "leads")
+        self.loaded += stats["loaded"]
+
+    def close(self):
+        self.loader.close()
+        print(f"  Seeded {self.loaded:,} leads ({self.rejected:,} invalid rows skipped)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate lead CSVs (no --rows: the four small fixture files)"
+    )
+    parser.add_argument("--rows", type=int, help="Total rows for bulk generation")
+    parser.add_argument("--files", type=int, default=1, help="Files to split rows into")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--output-dir", default=config.PATHS["input"])
+    parser.add_argument("--prefix", default="leads")
+    parser.add_argument(
+        "--copy", action="store_true",
+        help="Seed PostgreSQL with the valid rows instead of writing files",
+    )
+    for error, ratio in DEFAULT_ERROR_RATIOS.items():
+        parser.add_argument(
+            f"--{error.replace('_', '-')}", type=float, default=ratio,
+            dest=error, help=f"Share of rows with a {error} error (default {ratio})",
+        )
+    return parser.parse_args(argv)
+
+
+def main_bulk(args):
+    ratios = {error: getattr(args, error) for error in DEFAULT_ERROR_RATIOS}
+
+    print("=" * 50)
+    print(f"Generating {args.rows:,} leads (seed {args.seed})")
+    print(f"  Error ratios: {ratios}")
+    print("=" * 50)
+
+    generate_bulk(
+        args.rows,
+        files=args.files,
+        seed=args.seed,
+        ratios=ratios,
+        workers=args.workers,
+        output_dir=args.output_dir,
+        prefix=args.prefix,
+        copy=args.copy,
+    )
+
 
 def main():
     """Generate all 3 test files"""
@@ -209,4 +537,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.rows:
+        main_bulk(args)
+    else:
+        main()
@@ -1,16 +1,42 @@
 # logging_config.py
+import atexit
 import logging
+import logging.handlers
+import multiprocessing.util
+import queue
 import config
 import os
+from collections import Counter
 
 
-def setup_logging():
-    """Configure logging for entire application"""
+# Listener thread of the queue-based mode (None when not running)
+_listener = None
+_exit_hooks_pid = None  # process that registered stop_logging() to run at exit
+
+
+def setup_logging(use_queue=None):
+    """
+    Configure logging for entire application
+
+    Args:
+        use_queue: Queue-based mode (default: config.LOG_QUEUE). Loggers
+                   only put records on an in-memory queue; a background
+                   listener thread formats them and does all console/file
+                   I/O, so the ingest hot path never waits on a flush.
+
+    Returns:
+        The QueueListener in queue mode, else None
+    """
+    global _listener, _exit_hooks_pid
+
+    if use_queue is None:
+        use_queue = config.LOG_QUEUE
 
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
 
-    # Clear any existing handlers
+    # Clear any existing handlers (and stop a listener from an earlier call)
+    stop_logging()
     logging.getLogger().handlers.clear()
 
     # Create formatter
@@ -31,13 +57,105 @@ def setup_logging():
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(formatter)
 
+    handlers = [console_handler, file_handler, error_handler]
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, config.LOG_LEVEL))
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
+
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+
+        # Drain the queue on exit. multiprocessing's finalizers also run in
+        # pool worker processes, which exit without calling atexit hooks.
+        # Registered once per process: stop_logging() always stops the
+        # current listener. (Keyed by pid - a forked worker inherits the
+        # variable but starts with no finalizers.)
+        if _exit_hooks_pid != os.getpid():
+            atexit.register(stop_logging)
+            multiprocessing.util.Finalize(None, stop_logging, exitpriority=100)
+            _exit_hooks_pid = os.getpid()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
 
     # Suppress noisy loggers
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     logging.getLogger("psycopg2").setLevel(logging.WARNING)
+
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread (safe to repeat)"""
+    global _listener
+
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+
+
+class RowErrorLog:
+    """
+    Sampled logging of per-row rejects.
+
+    The first verbatim rejects are logged in full; after that only a
+    count per error type is logged every summary_every rejects, plus a
+    final summary from flush(). A file with millions of bad rows then
+    costs a handful of log lines instead of three per row.
+    """
+
+    def __init__(self, logger, verbatim=None, summary_every=None):
+        self.logger = logger
+        self.verbatim = config.LOG_ROW_ERRORS_VERBATIM if verbatim is None else verbatim
+        self.summary_every = (
+            config.LOG_ROW_ERRORS_SUMMARY_EVERY if summary_every is None else summary_every
+        )
+        self.total = Counter()  # error type -> rows, whole load
+        self.pending = Counter()  # error type -> rows since the last summary
+        self.rejected = 0
+
+    def reject(self, row_num, error_types, message, data=None):
+        """
+        Record one rejected row.
+
+        Args:
+            row_num: Row number in the input
+            error_types: Error codes / types for the row (counted)
+            message: Text for the verbatim log line
+            data: Optional row data for the verbatim log line
+        """
+        self.rejected += 1
+        for error_type in error_types:
+            self.total[error_type] += 1
+            self.pending[error_type] += 1
+
+        if self.rejected <= self.verbatim:
+            # One call (not three) - one record to queue and format
+            detail = f" | Data: {data}" if data is not None else ""
+            self.logger.error(f"Row {row_num}: {message}{detail}")
+            if self.rejected == self.verbatim:
+                self.logger.error(
+                    f"Logged {self.verbatim} rejected rows verbatim - "
+                    f"counting per error type from here on"
+                )
+                # Summaries count only the rows not already logged in full
+                self.pending.clear()
+        elif self.summary_every and self.rejected % self.summary_every == 0:
+            self._log_counts("Rejected rows since last summary", self.pending)
+
+    def flush(self):
+        """Log the load's totals (if anything was rejected)"""
+        if self.rejected > self.verbatim:
+            self._log_counts(f"{self.rejected} rows rejected", self.total)
+        self.pending.clear()
+
+    def _log_counts(self, prefix, counts):
+        self.logger.error(f"{prefix}: {dict(counts.most_common())}")
+        self.pending.clear()
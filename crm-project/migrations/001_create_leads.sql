@@ -0,0 +1,41 @@
+-- Leads table with its constraints (formerly schema.sql + add_constraints.sql).
+-- Written to be a no-op on databases created by the old setup script.
+
+CREATE TABLE IF NOT EXISTS leads (
+    id SERIAL PRIMARY KEY,
+    company_name VARCHAR(255) NOT NULL,
+    contact_person VARCHAR(255) NOT NULL,
+    email VARCHAR(255),
+    industry VARCHAR(100),
+    status VARCHAR(50) DEFAULT 'New',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS phone VARCHAR(20);
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS website VARCHAR(255);
+
+-- ADD CONSTRAINT has no IF NOT EXISTS - skip the ones already there
+DO $$
+BEGIN
+    -- Unique email (prevent duplicates)
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'unqique_email') THEN
+        ALTER TABLE leads ADD CONSTRAINT unqique_email UNIQUE (email);
+    END IF;
+
+    -- Status must be valid
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_status') THEN
+        ALTER TABLE leads ADD CONSTRAINT check_status
+        CHECK (status IN ('New', 'Contacted', 'Qualified', 'Proposal Sent', 'Converted', 'Lost'));
+    END IF;
+
+    -- Email must contain @
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_email_format') THEN
+        ALTER TABLE leads ADD CONSTRAINT check_email_format CHECK (email LIKE '%@%');
+    END IF;
+
+    -- Company name cannot be empty
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'check_company_not_empty') THEN
+        ALTER TABLE leads ADD CONSTRAINT check_company_not_empty
+        CHECK (LENGTH(TRIM(company_name)) > 0);
+    END IF;
+END $$;
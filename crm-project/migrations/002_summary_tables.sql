@@ -0,0 +1,51 @@
+-- Summary tables kept up to date by CSVLoader in the same transaction as
+-- each batch it commits, so reports read O(groups) rows instead of
+-- re-aggregating all of leads.
+-- NULLS NOT DISTINCT needs PostgreSQL 15+.
+
+CREATE TABLE IF NOT EXISTS lead_counts_by_status_industry (
+    status VARCHAR(50),
+    industry VARCHAR(100),
+    lead_count BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT unique_status_industry UNIQUE NULLS NOT DISTINCT (status, industry)
+);
+
+CREATE TABLE IF NOT EXISTS lead_counts_by_domain (
+    domain VARCHAR(255) PRIMARY KEY,
+    lead_count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS lead_counts_daily (
+    day DATE PRIMARY KEY,
+    lead_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Row counter per table (answers get_row_count without COUNT(*))
+CREATE TABLE IF NOT EXISTS table_row_counts (
+    table_name VARCHAR(100) PRIMARY KEY,
+    row_count BIGINT NOT NULL DEFAULT 0
+);
+
+-- Backfill from the leads already loaded
+TRUNCATE lead_counts_by_status_industry, lead_counts_by_domain, lead_counts_daily;
+
+INSERT INTO lead_counts_by_status_industry (status, industry, lead_count)
+SELECT status, industry, COUNT(*)
+FROM leads
+GROUP BY status, industry;
+
+INSERT INTO lead_counts_by_domain (domain, lead_count)
+SELECT split_part(email, '@', 2), COUNT(*)
+FROM leads
+WHERE email IS NOT NULL
+GROUP BY 1;
+
+INSERT INTO lead_counts_daily (day, lead_count)
+SELECT created_at::date, COUNT(*)
+FROM leads
+WHERE created_at IS NOT NULL
+GROUP BY 1;
+
+INSERT INTO table_row_counts (table_name, row_count)
+SELECT 'leads', COUNT(*) FROM leads
+ON CONFLICT (table_name) DO UPDATE SET row_count = EXCLUDED.row_count;
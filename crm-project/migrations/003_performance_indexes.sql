@@ -0,0 +1,12 @@
+-- migrate: no-transaction
+-- Indexes for the report filters / GROUP BYs. CONCURRENTLY builds them
+-- without blocking writes, so this can run against a live, loaded table
+-- (it cannot run inside a transaction, hence the directive above).
+
+-- B-tree: equality filters and grouping on status / industry
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_status ON leads (status);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_industry ON leads (industry);
+
+-- BRIN: created_at grows with insert order, so a tiny block-range index
+-- serves the date-range queries
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_created_at_brin ON leads USING BRIN (created_at);
@@ -0,0 +1,20 @@
+-- Quarantine for rows the pipeline rejects, filled in bulk with COPY
+-- while ingesting (see src/rejects.py). One row per rejected input row,
+-- with the reasons as error codes, so error reports are SQL aggregates.
+
+CREATE TABLE IF NOT EXISTS lead_rejects (
+    id BIGSERIAL PRIMARY KEY,
+    run_id VARCHAR(32) NOT NULL,
+    source_file VARCHAR(255) NOT NULL,
+    row_num INTEGER,
+    raw_row JSONB NOT NULL,
+    error_codes TEXT[] NOT NULL,
+    rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- "What went wrong in this run / this file?"
+CREATE INDEX IF NOT EXISTS idx_lead_rejects_run ON lead_rejects (run_id);
+CREATE INDEX IF NOT EXISTS idx_lead_rejects_source ON lead_rejects (source_file);
+
+-- "Which rows failed with code X?" (error_codes @> ARRAY['email_invalid_format'])
+CREATE INDEX IF NOT EXISTS idx_lead_rejects_codes ON lead_rejects USING GIN (error_codes);
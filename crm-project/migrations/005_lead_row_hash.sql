@@ -0,0 +1,41 @@
+-- migrate: no-transaction
+-- Row hash for the "upsert" load strategy (see CSVLoader._upsert_staged).
+-- An incoming row is only written when its hash differs from the stored
+-- one, so re-sending an unchanged lead creates no dead tuple.
+-- A plain nullable column: adding it only touches the catalog, so this can
+-- run against a live, loaded table (a GENERATED ... STORED column would
+-- rewrite leads under an ACCESS EXCLUSIVE lock). CSVLoader writes it on
+-- every insert/update; existing rows are backfilled in batches below.
+
+CREATE OR REPLACE FUNCTION lead_row_hash(
+    company_name TEXT,
+    contact_person TEXT,
+    industry TEXT,
+    status TEXT
+) RETURNS UUID
+LANGUAGE SQL IMMUTABLE PARALLEL SAFE
+AS $$
+    -- Row text keeps NULL and '' apart: (a,,b) vs (a,"",b)
+    SELECT md5(ROW(company_name, contact_person, industry, status)::TEXT)::UUID
+$$;
+
+ALTER TABLE leads ADD COLUMN IF NOT EXISTS row_hash UUID;
+
+-- Backfill 10000 ids at a time, committing each batch, so no batch holds
+-- its row locks (or its WAL) for long
+DO $$
+DECLARE
+    next_id INTEGER;
+    max_id INTEGER;
+BEGIN
+    SELECT MIN(id), MAX(id) INTO next_id, max_id FROM leads;
+    WHILE next_id <= max_id LOOP
+        UPDATE leads
+        SET row_hash = lead_row_hash(company_name, contact_person, industry, status)
+        WHERE id >= next_id AND id < next_id + 10000
+          AND row_hash IS NULL;
+        next_id := next_id + 10000;
+        COMMIT;
+    END LOOP;
+END
+$$;
@@ -0,0 +1,37 @@
+-- SCD Type 2 history of leads: one row per version of a lead, valid over
+-- [valid_from, valid_to). The current version has valid_to = 'infinity'
+-- and is_current = TRUE. Maintained by CSVLoader (see src/history.py) in
+-- the same transaction as the rows it loads.
+
+CREATE TABLE IF NOT EXISTS leads_history (
+    history_id BIGSERIAL PRIMARY KEY,
+    lead_id INTEGER NOT NULL,  -- leads.id (no FK: history outlives the lead)
+    email VARCHAR(255),
+    company_name VARCHAR(255),
+    contact_person VARCHAR(255),
+    industry VARCHAR(100),
+    status VARCHAR(50),
+    row_hash UUID NOT NULL,
+    valid_from TIMESTAMP NOT NULL,
+    valid_to TIMESTAMP NOT NULL DEFAULT 'infinity',
+    is_current BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+-- At most one current version per lead; also what the merge joins on
+CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_history_current
+    ON leads_history (lead_id) WHERE is_current;
+
+-- "What did lead X look like at time T"
+CREATE INDEX IF NOT EXISTS idx_leads_history_lead_valid_from
+    ON leads_history (lead_id, valid_from);
+
+-- Backfill: every existing lead starts with one current version
+INSERT INTO leads_history (
+    lead_id, email, company_name, contact_person, industry, status, row_hash, valid_from
+)
+SELECT id, email, company_name, contact_person, industry, status, row_hash,
+       COALESCE(created_at, CURRENT_TIMESTAMP)
+FROM leads
+WHERE NOT EXISTS (
+    SELECT 1 FROM leads_history h WHERE h.lead_id = leads.id AND h.is_current
+);
@@ -0,0 +1,10 @@
+-- Data version per table, bumped by every commit that changes the table
+-- (CSVLoader, RejectSink). QueryRunner's result cache compares these to
+-- tell whether a cached result is still current. A table without a row
+-- here is at version 0.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
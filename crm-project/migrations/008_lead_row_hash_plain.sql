@@ -0,0 +1,6 @@
+-- Databases that applied an earlier 005_lead_row_hash have row_hash as a
+-- GENERATED ... STORED column, which CSVLoader can't write. Make it the
+-- plain column 005 now adds (catalog only - the stored values are kept).
+-- A no-op where row_hash is already plain.
+
+ALTER TABLE leads ALTER COLUMN row_hash DROP EXPRESSION IF EXISTS;
@@ -7,7 +7,7 @@ import sys
 import config
 
 from src.pipeline import ETL
-from logging_config import setup_logging
+from logging_config import setup_logging, stop_logging
 
 
 def main():
@@ -21,7 +21,20 @@ def main():
     try:
         config_params = {
             "db_config": config.DB_CONFIG,  # Use config.DB_CONFIG (dot notation)
+            "pool": config.DB_POOL,
             "paths": config.PATHS,  # Use config.PATHS (dot notation)
+            "load_strategy": config.LOAD_STRATEGY,
+            "page_size": config.LOAD_PAGE_SIZE,
+            "write_processed": config.WRITE_PROCESSED,
+            "write_rejects_file": config.WRITE_REJECTS_FILE,
+            "output_format": config.OUTPUT_FORMAT,
+            "parquet_compression": config.PARQUET_COMPRESSION,
+            "workers": config.WORKERS,
+            "chunk_size": config.CHUNK_SIZE,
+            "aggregates": config.AGGREGATES,
+            "history": config.LEAD_HISTORY,
+            "dedup_emails": config.DEDUP_EMAILS,
+            "metrics": config.METRICS,
             "validations": {
                 "allowed_industries": config.ALLOWED_INDUSTRIES,  # Use dot notation
                 "valid_statuses": config.VALID_STATUSES,  # Use dot notation
@@ -34,11 +47,16 @@ def main():
 
         pipeline = ETL(config_params)
 
-        print("\nProcessing files..")
-        pipeline.process_all_files()
+        try:
+            print("\nProcessing files..")
+            pipeline.process_all_files()
 
-        print("\nGenerating reports..")
-        pipeline.generate_reports()
+            print("\nGenerating reports..")
+            pipeline.generate_reports()
+
+            pipeline.write_metrics()
+        finally:
+            pipeline.close()
 
         summary = pipeline.get_summary()
 
@@ -46,9 +64,20 @@ def main():
         print("\n" + "=" * 80)
         print("PIPELINE SUMMARY")
         print("=" * 80)
+        print(f"Run id: {summary['run_id']}")
         print(f"Files processed: {summary['files_processed']}")
+        print(f"Files skipped (already ingested): {summary['files_skipped']}")
         print(f"Total rows loaded: {summary['total_rows_loaded']}")
+        print(f"Total rows updated: {summary['total_rows_updated']}")
         print(f"Total errors: {summary['total_errors']}")
+        print(f"Duplicates skipped: {summary['total_duplicates']}")
+        print("-" * 80)
+        for stage, values in summary["stages"].items():
+            print(
+                f"{stage:<16} {values['seconds']:>10.3f}s  "
+                f"{values['rows']:>12,} rows  {values['rows_per_sec']:>12,.0f} rows/s  "
+                f"{values['round_trips']:>8,} DB trips"
+            )
         print("=" * 80)
 
         return 0
@@ -60,4 +89,5 @@ def main():
 
 if __name__ == "__main__":
     exit_code = main()
+    stop_logging()  # flush anything still queued for the log files
     sys.exit(exit_code)
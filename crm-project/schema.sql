@@ -1,10 +0,0 @@
-CREATE TABLE leads (
-    id SERIAL PRIMARY KEY,
-    company_name VARCHAR(255) NOT NULL,
-    contact_person VARCHAR(255) NOT NULL,
-    email VARCHAR(255),
-    industry VARCHAR(100),
-    status VARCHAR(50) DEFAULT 'New',
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
-
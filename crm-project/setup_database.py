@@ -1,46 +1,29 @@
-import psycopg2
+"""
+* Brings the database schema up to date.
+* Applies pending migrations from migrations/ - never drops data, so it
+  is safe to run against a live, loaded database.
+"""
 
+import config
 
-db_config = {
-    "host" : "localhost",
-    "database" : "crm_dev",
-    "user" : "postgres",
-    "password" : "dev123"
-}
+from src.migrations import MigrationRunner
 
 
-conn = psycopg2.connect(**db_config)
-cursor = conn.cursor()
+with MigrationRunner(config.DB_CONFIG, "migrations") as runner:
+    applied = runner.migrate()
 
-with open('schema.sql', 'r') as f:
-    schema_sql = f.read()
+    if applied:
+        print(f"Applied {len(applied)} migration(s): {', '.join(applied)}")
+    else:
+        print("Database schema already up to date")
 
-with open('add_constraints.sql', 'r') as d:
-    constraints_sql = d.read()
+    runner.cursor.execute("""
+                   SELECT column_name, data_type
+                   FROM information_schema.columns
+                   WHERE table_name = 'leads'
+                   """)
 
-
-
-cursor.execute("DROP TABLE IF EXISTS leads;")
-conn.commit()
-
-print("Creating leads table...")
-cursor.execute(schema_sql)
-cursor.execute(constraints_sql)
-
-conn.commit()
-
-print("Table created successfuly!")
-
-cursor.execute("""
-               SELECT column_name, data_type
-               FROM information_schema.columns
-               WHERE table_name = 'leads'
-               """)
-
-columns = cursor.fetchall()
-print("\nTable Structure:")
-for col in columns:
-    print(f"  {col[0]}: {col[1]}")
-
-cursor.close()
-conn.close()
+    columns = runner.cursor.fetchall()
+    print("\nTable Structure:")
+    for col in columns:
+        print(f"  {col[0]}: {col[1]}")
@@ -0,0 +1,173 @@
+import logging
+from collections import Counter
+
+from psycopg2.extras import execute_values
+
+
+logger = logging.getLogger(__name__)
+
+# Table the summaries describe (see migrations/002_summary_tables.sql)
+AGGREGATED_TABLE = "leads"
+
+# Tables flush() writes to
+SUMMARY_TABLES = (
+    "lead_counts_by_status_industry",
+    "lead_counts_by_domain",
+    "lead_counts_daily",
+    "table_row_counts",
+)
+
+# Appended to every leads INSERT so the loader sees what was really
+# inserted (conflicting rows return nothing). One row = one lead.
+INSERT_RETURNING = "RETURNING status, industry, split_part(email, '@', 2), created_at::date, 1"
+
+
+def grouped_insert(insert_sql):
+    """
+    Wrap a set-based INSERT so it returns per-group counts instead of rows.
+
+    Same shape as INSERT_RETURNING - (status, industry, domain, day, count) -
+    but a million-row merge sends back O(groups) rows, not a million.
+    """
+    return f"""
+        WITH inserted AS (
+            {insert_sql}
+            RETURNING status, industry, email, created_at
+        )
+        SELECT status, industry, split_part(email, '@', 2), created_at::date, COUNT(*)
+        FROM inserted
+        GROUP BY 1, 2, 3, 4
+    """
+
+
+class AggregateTracker:
+    """
+    Keeps the summary tables in migrations/002_summary_tables.sql in step with leads.
+
+    The loader feeds it the (status, industry, domain, day, count) rows its
+    INSERTs return, and calls flush() right before each commit - so the
+    summaries change in the same transaction as the leads they count.
+    Counts may be negative: an upserted lead that changes status leaves
+    one group (-1) and joins another (+1).
+    """
+
+    def __init__(self):
+        self.pending = Counter()  # (status, industry, domain, day) -> count
+
+    def add(self, returned_rows):
+        """Accumulate rows shaped like INSERT_RETURNING; returns leads added"""
+        added = 0
+        for status, industry, domain, day, count in returned_rows:
+            self.pending[(status, industry, domain, day)] += count
+            added += count
+        return added
+
+    def reset(self):
+        """Forget pending deltas (the transaction was rolled back)"""
+        self.pending.clear()
+
+    def flush(self, cursor):
+        """
+        Apply pending deltas with one upsert per summary table.
+
+        Keys are sorted so concurrent loaders always lock summary rows in
+        the same order (no deadlocks between worker processes). Keys whose
+        deltas cancel out (e.g. the domain of an updated lead) aren't
+        written, and groups emptied by moves are deleted.
+        """
+        if not self.pending:
+            return
+
+        by_status_industry = Counter()
+        by_domain = Counter()
+        by_day = Counter()
+        for (status, industry, domain, day), count in self.pending.items():
+            by_status_industry[(status, industry)] += count
+            by_domain[domain] += count
+            by_day[day] += count
+
+        self._upsert(
+            cursor,
+            "lead_counts_by_status_industry",
+            "status, industry",
+            sorted(by_status_industry.items(), key=lambda item: _sort_key(item[0])),
+            lambda key, count: (*key, count),
+        )
+        self._upsert(
+            cursor,
+            "lead_counts_by_domain",
+            "domain",
+            sorted(by_domain.items(), key=lambda item: _sort_key((item[0],))),
+            lambda key, count: (key, count),
+        )
+        self._upsert(
+            cursor,
+            "lead_counts_daily",
+            "day",
+            sorted(by_day.items(), key=lambda item: _sort_key((item[0],))),
+            lambda key, count: (key, count),
+        )
+
+        if any(count < 0 for count in by_status_industry.values()):
+            cursor.execute(
+                "DELETE FROM lead_counts_by_status_industry WHERE lead_count = 0"
+            )
+
+        added = sum(self.pending.values())
+        if added:
+            cursor.execute(
+                """
+                INSERT INTO table_row_counts (table_name, row_count)
+                VALUES (%s, %s)
+                ON CONFLICT (table_name)
+                DO UPDATE SET row_count = table_row_counts.row_count + EXCLUDED.row_count
+                """,
+                (AGGREGATED_TABLE, added),
+            )
+
+        self.pending.clear()
+
+    def _upsert(self, cursor, table, key_columns, items, to_values):
+        items = [(key, count) for key, count in items if count]
+        if not items:
+            return
+
+        execute_values(
+            cursor,
+            f"""
+            INSERT INTO {table} ({key_columns}, lead_count)
+            VALUES %s
+            ON CONFLICT ({key_columns})
+            DO UPDATE SET lead_count = {table}.lead_count + EXCLUDED.lead_count
+            """,
+            [to_values(key, count) for key, count in items],
+        )
+
+    @staticmethod
+    def row_count(cursor, table_name):
+        """Counter-based row count, or None if the table isn't tracked"""
+        cursor.execute(
+            "SELECT row_count FROM table_row_counts WHERE table_name = %s",
+            (table_name,),
+        )
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    @staticmethod
+    def truncate(cursor):
+        """Empty every summary (call alongside TRUNCATE leads)"""
+        cursor.execute(
+            """
+            TRUNCATE lead_counts_by_status_industry, lead_counts_by_domain,
+                     lead_counts_daily
+            """
+        )
+        cursor.execute(
+            "UPDATE table_row_counts SET row_count = 0 WHERE table_name = %s",
+            (AGGREGATED_TABLE,),
+        )
+
+
+def _sort_key(key):
+    """Sort tuples that may contain None (None first)"""
+    return tuple((value is not None, value) for value in key)
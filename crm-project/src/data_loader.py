@@ -1,24 +1,205 @@
+import io
 import csv
+import time
 import psycopg2
 import logging
+import config
+from psycopg2 import extensions
+from psycopg2.extras import execute_values
 from src.validator import LeadValidator  # Import our validator
+from src.metrics import CountingCursor, PipelineMetrics
+from logging_config import RowErrorLog
+from src.aggregates import (
+    AGGREGATED_TABLE,
+    INSERT_RETURNING,
+    SUMMARY_TABLES,
+    AggregateTracker,
+    grouped_insert,
+)
+from src.history import HISTORIZED_TABLE, HISTORY_TABLE, HistoryTracker
+from src.query_cache import bump_versions
 
 # Configure logging (do this ONCE at module level, not in __init__)
 
 logger = logging.getLogger(__name__)
 
+# Columns written to the leads table, in insert order
+LEAD_COLUMNS = ("company_name", "contact_person", "email", "industry", "status")
+
+# How validated rows reach the database:
+# - "row":  one INSERT per row (one network round-trip per row), each
+#           under a savepoint so a rejected row doesn't abort the rest
+# - "batch": multi-row INSERTs (execute_values) of page_size rows, each
+#            under a savepoint; a failing batch is bisected so only the
+#            offending rows are rejected
+# - "copy": stream rows through COPY into a temp staging table,
+#           then merge into the target table with one INSERT ... SELECT
+# - "upsert": like "copy", but existing leads are updated from the file
+#             (status only ever moves forward, unchanged rows are skipped)
+LOAD_STRATEGIES = ("row", "batch", "copy", "upsert")
+
+# Rows per INSERT for the "batch" strategy
+DEFAULT_PAGE_SIZE = 1000
+
+# Errors that only mean a concurrent loader got in the way (deadlock,
+# serialization conflict): the load is rolled back and run again, up to
+# LOAD_ATTEMPTS times, waiting RETRY_BACKOFF_SECONDS (doubling) in between
+TRANSIENT_ERRORS = (
+    psycopg2.errors.DeadlockDetected,
+    psycopg2.errors.SerializationFailure,
+)
+LOAD_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 0.5
+
+# Marker COPY uses for NULL, so empty strings stay empty strings
+COPY_NULL = "\\N"
+
+# Flush the COPY buffer to the server roughly every 64KB
+COPY_BUFFER_SIZE = 64 * 1024
+
+# Status an upsert leaves on a lead: the incoming one only if it is further
+# along config.VALID_STATUSES than the stored one, so statuses never move
+# backwards (an unknown stored status can always be replaced)
+FORWARD_STATUS = """
+    CASE WHEN array_position(%(statuses)s::text[], EXCLUDED.status)
+              > COALESCE(array_position(%(statuses)s::text[], target.status), 0)
+         THEN EXCLUDED.status
+         ELSE target.status
+    END
+"""
+
+# Columns lead_row_hash() takes, in order (migrations/005_lead_row_hash.sql).
+# Every INSERT/UPDATE of leads writes row_hash from them.
+ROW_HASH_COLUMNS = ("company_name", "contact_person", "industry", "status")
+
+# What an upsert writes over an existing lead: a forward status, and the
+# other columns only where the file has a value - a file that only carries
+# status changes (industry/contact left blank) keeps what is stored
+UPSERT_VALUES = {
+    "company_name": "COALESCE(NULLIF(EXCLUDED.company_name, ''), target.company_name)",
+    "contact_person": "COALESCE(NULLIF(EXCLUDED.contact_person, ''), target.contact_person)",
+    "industry": "COALESCE(NULLIF(EXCLUDED.industry, ''), target.industry)",
+    "status": FORWARD_STATUS,
+}
+
+
+def row_hash_sql(values=None):
+    """
+    SQL computing a lead's row_hash.
+
+    Args:
+        values: {column: SQL expression of its value}; columns left out
+                are read as-is (e.g. from the row being inserted)
+    """
+    values = values or {}
+    return f"lead_row_hash({', '.join(values.get(c, c) for c in ROW_HASH_COLUMNS)})"
+
+
+def _blank_to(value, default):
+    """value, or default if it is missing or only whitespace"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    return value
+
+
+def lead_values(row):
+    """
+    Pull the insert values for one lead out of a row dict (LEAD_COLUMNS order).
+
+    Blank optional fields get what an absent one would: status "New" (the
+    column default - "" would fail check_status) and industry NULL.
+    contact_person is NOT NULL in the schema, so it is passed through.
+    """
+    return (
+        row["company_name"],
+        row.get("contact_person"),
+        row["email"],
+        _blank_to(row.get("industry"), None),
+        _blank_to(row.get("status"), "New"),
+    )
+
+
+def _email_of(item):
+    """Sort key of a (row_num, row) pair"""
+    return item[1]["email"]
+
+
+class IteratorReader(io.TextIOBase):
+    """
+    Read-only file object over an iterator of text chunks.
+
+    cursor.copy_expert() only needs .read(size), so this lets COPY pull
+    rows from a generator instead of a fully built in-memory buffer.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        # Pull chunks until we can satisfy the request (or run dry)
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 
 class CSVLoader:
     """Loads CSV fies into PostgreSQL tables"""
 
-    def __init__(self, db_config):
+    def __init__(
+        self,
+        db_config,
+        strategy="row",
+        pool=None,
+        page_size=DEFAULT_PAGE_SIZE,
+        aggregates=None,
+        history=None,
+        metrics=None,
+    ):
         """
         Initialize loader with database connection
         Args:
             db_config: Dictionary with connection parameters
+            strategy: Default load strategy, one of LOAD_STRATEGIES
+            pool: Optional ConnectionPool to borrow the connection from
+            page_size: Rows per INSERT for the "batch" strategy
+            aggregates: Maintain the summary tables from migrations/002_summary_tables.sql
+                        in the same transaction as each commit (default:
+                        config.AGGREGATES). Reports trust those tables, so
+                        only turn this off where nothing reads them.
+            history: Maintain leads_history (SCD Type 2, see src/history.py)
+                     in the same transaction as each commit (default:
+                     config.LEAD_HISTORY)
+            metrics: Optional PipelineMetrics to record the "db_load" stage in
         """
+        if strategy not in LOAD_STRATEGIES:
+            raise ValueError(f"Unknown load strategy: {strategy}")
+
         # Create connection and store it in instance variable
         self.db_config = db_config
+        self.strategy = strategy
+        self.page_size = page_size
+        self.pool = pool
+        if aggregates is None:
+            aggregates = config.AGGREGATES
+        if history is None:
+            history = config.LEAD_HISTORY
+        self.aggregates = AggregateTracker() if aggregates else None
+        self.history = HistoryTracker() if history else None
+        self.written_tables = set()  # tables changed since the last commit
+        self.metrics = metrics or PipelineMetrics()
+        self.row_errors = RowErrorLog(logger)
         self.conn = None
         self.cursor = None
         self.validator = None
@@ -26,98 +207,704 @@ class CSVLoader:
 
     def __enter__(self):
         print("CSVLoader initialized: Establishing Connection")
-        self.conn = psycopg2.connect(**self.db_config)
-        self.cursor = self.conn.cursor()
+        if self.pool:
+            self.conn = self.pool.getconn()
+        else:
+            self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor(cursor_factory=CountingCursor)
         self.validator = LeadValidator()
         return self
 
-    def load_csv(self, filepath, table_name):
+    def load_csv(self, filepath, table_name, strategy=None):
         """
         Load CSV with validation.
 
+        Args:
+            filepath: Path to CSV file
+            table_name: Target table
+            strategy: Override the loader's default strategy (see LOAD_STRATEGIES)
+
         Returns:
             dict with stats: {
                   'total_rows': int,
                   'loaded': int,
+                  'updated': int,      # "upsert" only
+                  'duplicates': int,   # already stored / unchanged
                   'failed': int,
                   'errors': list of dicts
                   }
         """
+        strategy = self._resolve_strategy(strategy)
+
         if self.validator is None:
             self.validator = LeadValidator()
 
         print(f"Loading {filepath} into {table_name}...")
-        logger.info(f"Starting load: {filepath} -> {table_name}")
-
-        # Track stats
-        stats = {"total_rows": 0, "loaded": 0, "failed": 0, "errors": []}
-
-        with open(filepath, "r") as f:
-            reader = csv.DictReader(f)
-
-            for row_num, row in enumerate(reader, start=1):
-                stats["total_rows"] += 1
-
-                # Validate before inserting
-                if self.validator.validate_lead(row):
-                    # Valid - insert to db
-                    try:
-                        sql = """
-                              INSERT INTO leads (company_name, contact_person, email, industry, status)
-                              VALUES (%s, %s, %s, %s, %s)
-                              ON CONFLICT (email) DO NOTHING
-                          """
-                        self.cursor.execute(
-                            sql,
-                            (
-                                row["company_name"],
-                                row.get("contact_person"),
-                                row["email"],
-                                row.get("industry"),
-                                row.get("status", "New"),
-                            ),
-                        )
-                        stats["loaded"] += 1
-
-                    except Exception as e:
-                        # Database error (e.g, duplicate key) - LOG IT
-                        error_msg = f"Row {row_num}: Database error - {str(e)}"
-                        logger.error(error_msg)
-                        logger.error(f"   Data: {row}")
-
-                        stats["failed"] += 1
-                        stats["errors"].append(
-                            {
-                                "row": row_num,
-                                "data": row,
-                                "error": self.validator.get_errors(),
-                            }
-                        )
-
-                else:
-                    # Invalid - log errors
-                    error_msg = f"Row {row_num}: Validation failed"
-                    logger.error(error_msg)
-                    logger.error(f"   Errors: {self.validator.get_errors()}")
-                    logger.error(f"   Data: {row}")
-
-                    stats["failed"] += 1
-                    stats["errors"].append(
-                        {
-                            "row": row_num,
-                            "data": row,
-                            "error": self.validator.get_errors(),
-                        }
+        logger.info(f"Starting load: {filepath} -> {table_name} ({strategy})")
+
+        def valid_rows(stats):
+            with open(filepath, "r") as f:
+                yield from self._validated_rows(csv.DictReader(f), stats)
+
+        return self._load_retrying(valid_rows, table_name, strategy)
+
+    def load_records(self, records, table_name, strategy=None):
+        """
+        Load already-validated lead dicts straight from memory.
+
+        No validation is done here - use this when the caller has already
+        validated the rows (e.g. with LeadValidator.validate_frame).
+
+        Args:
+            records: Iterable of lead dicts
+            table_name: Target table
+            strategy: Override the loader's default strategy
+
+        Returns:
+            Same stats dict as load_csv()
+        """
+        return self._load_numbered(enumerate(records, start=1), table_name, strategy)
+
+    def load_dataframe(self, df, table_name, strategy=None):
+        """
+        Load an already-validated DataFrame straight from memory.
+
+        Row numbers in stats/errors come from the DataFrame index
+        (index + 1), so a filtered frame keeps its original file rows.
+        """
+        columns = list(df.columns)
+        records = (dict(zip(columns, values)) for values in df.itertuples(index=False))
+        row_nums = (int(idx) + 1 for idx in df.index)
+
+        return self._load_numbered(zip(row_nums, records), table_name, strategy)
+
+    def _load_numbered(self, numbered_rows, table_name, strategy):
+        """Shared body of load_records() / load_dataframe()"""
+        strategy = self._resolve_strategy(strategy)
+        logger.info(f"Starting in-memory load -> {table_name} ({strategy})")
+
+        # Kept in memory so a retried load can send them again
+        numbered_rows = list(numbered_rows)
+
+        # One transaction inserts every row, so sort all of them by email,
+        # not just each batch: concurrent loaders then always wait on each
+        # other in the same direction. Stable - the first row per email
+        # still wins. (The COPY merges sort server-side.)
+        if strategy in ("row", "batch"):
+            numbered_rows.sort(key=_email_of)
+
+        return self._load_retrying(
+            lambda stats: self._counted(numbered_rows, stats), table_name, strategy
+        )
+
+    def _resolve_strategy(self, strategy):
+        strategy = strategy or self.strategy
+        if strategy not in LOAD_STRATEGIES:
+            raise ValueError(f"Unknown load strategy: {strategy}")
+        return strategy
+
+    def _new_stats(self):
+        # Every load samples its own rejects
+        self.row_errors = RowErrorLog(logger)
+        return {
+            "total_rows": 0,
+            "loaded": 0,
+            "updated": 0,
+            "duplicates": 0,
+            "failed": 0,
+            "errors": [],
+        }
+
+    def _counted(self, numbered_rows, stats):
+        """Pass (row_num, row) pairs through, counting them in stats"""
+        for row_num, row in numbered_rows:
+            stats["total_rows"] += 1
+            yield row_num, row
+
+    def _load_retrying(self, make_rows, table_name, strategy):
+        """
+        Run one load, starting over if it hits one of TRANSIENT_ERRORS.
+
+        Concurrent loaders (pipeline workers) can deadlock on the same
+        emails or summary rows; PostgreSQL then aborts one of them. That
+        load is rolled back and run again from scratch, so rows the other
+        loader stored come back as duplicates - not as errors.
+
+        Args:
+            make_rows: make_rows(stats) -> fresh (row_num, row) iterator of
+                       valid rows (counting total/invalid rows in stats)
+
+        Returns:
+            Stats of the attempt that finished. If every attempt hit a
+            transient error, all valid rows are failed with one
+            {"row": None} error - nothing of the load was committed.
+        """
+        for attempt in range(1, LOAD_ATTEMPTS + 1):
+            stats = self._new_stats()
+            try:
+                self._load_rows(make_rows(stats), table_name, strategy, stats)
+                return stats
+            except TRANSIENT_ERRORS as e:
+                self._rollback()
+                error = e
+                if attempt < LOAD_ATTEMPTS:
+                    delay = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                    logger.warning(
+                        f"Load hit {e.pgcode} ({str(e).strip()}), retrying in "
+                        f"{delay}s (attempt {attempt}/{LOAD_ATTEMPTS})"
                     )
+                    time.sleep(delay)
+
+        logger.error(f"Load failed after {LOAD_ATTEMPTS} attempts: {error}")
+        stats = self._new_stats()
+        for _ in make_rows(stats):
+            stats["failed"] += 1
+        stats["errors"].append({"row": None, "data": None, "error": [str(error)]})
+        return stats
+
+    def _load_rows(self, valid_rows, table_name, strategy, stats):
+        """Send valid (row_num, row) pairs to the database and commit"""
+        # The COPY strategies leave their rows in leads_staging instead
+        if self.history and table_name == HISTORIZED_TABLE and strategy in ("row", "batch"):
+            valid_rows = self._touched(valid_rows)
+
+        with self.metrics.stage("db_load", cursor=self.cursor) as record:
+            if strategy in ("copy", "upsert"):
+                self._copy_rows(
+                    valid_rows, table_name, stats, upsert=strategy == "upsert"
+                )
+            elif strategy == "batch":
+                self._batch_rows(valid_rows, table_name, stats)
+            else:
+                for row_num, row in valid_rows:
+                    self._insert_row(row_num, row, table_name, stats)
+
+            if stats["loaded"] or stats["updated"]:
+                self.written_tables.add(table_name)
 
             # Commit all successful inserts
-            self.conn.commit()
+            if not self._commit():
+                self._lost_transaction(stats)
+            record.rows = stats["loaded"] + stats["updated"]
+
+        self.row_errors.flush()
 
         logger.info(
-            f"Load complete: {stats['loaded']} loaded, {stats['failed']} failed"
+            f"Load complete: {stats['loaded']} loaded, {stats['updated']} updated, "
+            f"{stats['duplicates']} duplicates, {stats['failed']} failed"
         )
 
-        return stats
+    def _touched(self, numbered_rows):
+        """Pass (row_num, row) pairs through, telling the history tracker"""
+        for row_num, row in numbered_rows:
+            self.history.touch(row["email"])
+            yield row_num, row
+
+    def _commit(self):
+        """
+        Flush summary deltas and lead history into this transaction, bump
+        the data version of every table it changed (invalidates cached
+        query results, see QueryCache), then commit.
+
+        A transaction aborted by an error outside any savepoint can't
+        commit - it is rolled back instead, without flushing anything.
+
+        Returns:
+            True if committed, False if rolled back
+        """
+        if self.conn.get_transaction_status() == extensions.TRANSACTION_STATUS_INERROR:
+            logger.error("Transaction aborted by an earlier error, rolling back")
+            self._rollback()
+            return False
+
+        if self.aggregates and self.aggregates.pending:
+            self.aggregates.flush(self.cursor)
+            self.written_tables.update(SUMMARY_TABLES)
+        if self.history and any(self.history.flush(self.cursor)):
+            self.written_tables.add(HISTORY_TABLE)
+
+        bump_versions(self.cursor, self.written_tables)
+        self.conn.commit()
+        self.written_tables = set()
+        return True
+
+    def _rollback(self):
+        self.conn.rollback()
+        self.written_tables = set()
+        if self.aggregates:
+            self.aggregates.reset()
+        if self.history:
+            self.history.reset()
+
+    def _lost_transaction(self, stats):
+        """The commit was rolled back: rows counted as written weren't"""
+        lost = stats["loaded"] + stats["updated"]
+        stats["failed"] += lost
+        stats["loaded"] = stats["updated"] = 0
+        stats["errors"].append(
+            {"row": None, "data": None, "error": ["transaction aborted, rolled back"]}
+        )
+
+    def _track_inserted(self, returned_rows, table_name):
+        """
+        Count rows returned by an INSERT (shaped like INSERT_RETURNING)
+        and feed them to the summary tables. Returns rows inserted.
+        """
+        if self.aggregates and table_name == AGGREGATED_TABLE:
+            return self.aggregates.add(returned_rows)
+        return sum(row[-1] for row in returned_rows)
+
+    def _track_upserted(self, returned_rows, table_name):
+        """
+        Feed the summary tables from _upsert_staged() rows and count them.
+
+        Rows are (status, industry, domain, day, delta, inserted, updated):
+        an updated lead is -1 in the group it left and +1 in the one it
+        joined, so its counts move between groups.
+
+        Returns:
+            (rows inserted, rows updated)
+        """
+        if self.aggregates and table_name == AGGREGATED_TABLE:
+            self.aggregates.add(row[:5] for row in returned_rows)
+        return (
+            sum(row[5] for row in returned_rows),
+            sum(row[6] for row in returned_rows),
+        )
+
+    def _validated_rows(self, reader, stats):
+        """
+        Yield (row_num, row) for every valid row in reader.
+
+        Invalid rows are logged and recorded in stats as a side effect,
+        so this can feed either strategy without building a list first.
+        """
+        for row_num, row in enumerate(reader, start=1):
+            stats["total_rows"] += 1
+
+            # Validate before inserting
+            if self.validator.validate_lead(row):
+                yield row_num, row
+            else:
+                # Invalid - log errors (sampled, see RowErrorLog)
+                errors = self.validator.get_errors()
+                self.row_errors.reject(
+                    row_num,
+                    self.validator.error_codes,
+                    f"Validation failed - {errors}",
+                    row,
+                )
+
+                stats["failed"] += 1
+                stats["errors"].append(
+                    {
+                        "row": row_num,
+                        "data": row,
+                        "error": errors,
+                    }
+                )
+
+    def _insert_row(self, row_num, row, table_name, stats):
+        """
+        Insert one valid row (one round-trip) under a savepoint, so a
+        rejected row leaves the transaction usable for the rows after it
+        """
+        columns = ", ".join(LEAD_COLUMNS)
+        sql = f"""
+              INSERT INTO {table_name} ({columns}, row_hash)
+              SELECT {columns}, {row_hash_sql()}
+              FROM (VALUES (%s, %s, %s, %s, %s)) AS incoming ({columns})
+              ON CONFLICT (email) DO NOTHING
+              {INSERT_RETURNING}
+          """
+
+        self.cursor.execute("SAVEPOINT load_row")
+        try:
+            self.cursor.execute(sql, lead_values(row))
+            returned = self.cursor.fetchall()
+        except Exception as e:
+            if isinstance(e, TRANSIENT_ERRORS):
+                raise
+            self.cursor.execute("ROLLBACK TO SAVEPOINT load_row")
+            self.cursor.execute("RELEASE SAVEPOINT load_row")
+            self._record_db_error(row_num, row, e, stats)
+            return
+
+        self.cursor.execute("RELEASE SAVEPOINT load_row")
+
+        # Nothing is returned when the email already exists
+        if self._track_inserted(returned, table_name):
+            stats["loaded"] += 1
+        else:
+            stats["duplicates"] += 1
+
+    def _record_db_error(self, row_num, row, error, stats):
+        """Database error (e.g, constraint violation) - LOG IT (sampled)"""
+        self.row_errors.reject(
+            row_num,
+            [getattr(error, "pgcode", None) or type(error).__name__],
+            f"Database error - {str(error).strip()}",
+            row,
+        )
+
+        stats["failed"] += 1
+        stats["errors"].append(
+            {
+                "row": row_num,
+                "data": row,
+                "error": [str(error)],
+            }
+        )
+
+    def _batch_rows(self, rows, table_name, stats):
+        """
+        Group (row_num, row) pairs into page_size batches and insert each.
+
+        Each batch is sorted by email (stable, so the first row per email
+        still wins), so concurrent loaders take the email index locks in the
+        same order within a batch. In-memory loads arrive sorted as a whole
+        (see _load_numbered); a streamed file can still deadlock across
+        batches, which _load_retrying absorbs.
+        """
+        batch = []
+        for item in rows:
+            batch.append(item)
+            if len(batch) >= self.page_size:
+                batch.sort(key=_email_of)
+                self._insert_batch(batch, table_name, stats)
+                batch = []
+
+        if batch:
+            batch.sort(key=_email_of)
+            self._insert_batch(batch, table_name, stats)
+
+    def _insert_batch(self, batch, table_name, stats):
+        """
+        Insert one batch as a single multi-row INSERT under a savepoint.
+
+        If the batch fails, roll back to the savepoint (so the transaction
+        stays usable) and bisect: retry each half on its own until the
+        failing rows are isolated. Clean rows still load in batches, and
+        only the offending rows are rejected - log2(page_size) extra
+        round-trips per bad row.
+        """
+        columns = ", ".join(LEAD_COLUMNS)
+        sql = f"""
+            INSERT INTO {table_name} ({columns}, row_hash)
+            SELECT {columns}, {row_hash_sql()}
+            FROM (VALUES %s) AS incoming ({columns})
+            ON CONFLICT (email) DO NOTHING
+            {INSERT_RETURNING}
+        """
+
+        self.cursor.execute("SAVEPOINT load_batch")
+        try:
+            inserted = execute_values(
+                self.cursor,
+                sql,
+                [lead_values(row) for _, row in batch],
+                page_size=len(batch),
+                fetch=True,
+            )
+        except TRANSIENT_ERRORS:
+            raise
+        except psycopg2.Error as e:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT load_batch")
+            self.cursor.execute("RELEASE SAVEPOINT load_batch")
+
+            if len(batch) == 1:
+                row_num, row = batch[0]
+                self._record_db_error(row_num, row, e, stats)
+                return
+
+            middle = len(batch) // 2
+            self._insert_batch(batch[:middle], table_name, stats)
+            self._insert_batch(batch[middle:], table_name, stats)
+            return
+
+        self.cursor.execute("RELEASE SAVEPOINT load_batch")
+
+        # RETURNING only yields rows that were actually inserted
+        loaded = self._track_inserted(inserted, table_name)
+        stats["loaded"] += loaded
+        stats["duplicates"] += len(batch) - loaded
+
+    def _copy_lines(self, rows, counter):
+        """
+        Encode (row_num, row) pairs as CSV text for COPY, in ~64KB chunks.
+
+        counter["staged"] tracks how many rows were handed to COPY.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        for row_num, row in rows:
+            values = [COPY_NULL if v is None else v for v in lead_values(row)]
+            writer.writerow([row_num, *values])
+            counter["staged"] += 1
+
+            if buffer.tell() >= COPY_BUFFER_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    def _copy_rows(self, rows, table_name, stats, upsert=False):
+        """
+        Bulk load valid rows: COPY into a temp staging table, then merge.
+
+        The merge is one set-based INSERT ... SELECT ... ON CONFLICT, so the
+        whole file costs a handful of round-trips instead of one per row.
+        Within the file, the first occurrence of an email wins (same as
+        inserting row by row). Rows that already exist, or repeat an email
+        earlier in the file, are counted as duplicates.
+
+        With upsert=True existing leads are updated instead (see
+        _upsert_staged); rows that change nothing count as duplicates.
+
+        A merge the database refuses is bisected (see _merge_staged), so
+        one bad row costs only itself, like the "batch" strategy.
+        """
+        columns = ", ".join(LEAD_COLUMNS)
+        counter = {"staged": 0}
+
+        try:
+            self.cursor.execute(
+                """
+                CREATE TEMP TABLE leads_staging (
+                    row_num INTEGER,
+                    company_name TEXT,
+                    contact_person TEXT,
+                    email TEXT,
+                    industry TEXT,
+                    status TEXT
+                ) ON COMMIT DROP
+                """
+            )
+
+            self.cursor.copy_expert(
+                f"COPY leads_staging (row_num, {columns}) "
+                f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                IteratorReader(self._copy_lines(rows, counter)),
+            )
+
+        except TRANSIENT_ERRORS:
+            raise
+        except Exception as e:
+            # COPY itself failed - nothing was staged, so there is nothing
+            # to bisect. Drain the rest of the file so validation stats
+            # stay complete.
+            self._rollback()
+            for _ in rows:
+                counter["staged"] += 1
+
+            logger.error(
+                f"Bulk load failed, {counter['staged']} rows rolled back: {e}"
+            )
+
+            stats["failed"] += counter["staged"]
+            stats["errors"].append(
+                {"row": None, "data": None, "error": [str(e)]}
+            )
+            return
+
+        if self.history and table_name == HISTORIZED_TABLE:
+            self.history.stage()
+
+        inserted, updated, failed = self._merge_staged(table_name, stats, upsert)
+
+        stats["loaded"] += inserted
+        stats["updated"] += updated
+        stats["duplicates"] += counter["staged"] - inserted - updated - failed
+
+    def _merge_staged(self, table_name, stats, upsert, row_nums=None):
+        """
+        Merge the staged rows into table_name under a savepoint.
+
+        If the merge fails, roll back to the savepoint (leads_staging
+        survives it) and bisect by row_num, like _insert_batch: each half
+        is merged on its own until the failing rows are isolated, and
+        those are recorded as database errors. Halves are merged in file
+        order, so "first email wins" / "last update wins" still hold.
+
+        Args:
+            row_nums: Sorted row numbers to merge (None = all staged rows)
+
+        Returns:
+            (rows inserted, rows updated, rows failed)
+        """
+        if row_nums is None:
+            staged, params = "leads_staging", {}
+        else:
+            staged = (
+                "(SELECT * FROM leads_staging "
+                "WHERE row_num BETWEEN %(low)s AND %(high)s) staged"
+            )
+            params = {"low": row_nums[0], "high": row_nums[-1]}
+
+        self.cursor.execute("SAVEPOINT merge_staged")
+        try:
+            if upsert:
+                inserted, updated = self._upsert_staged(table_name, staged, params)
+            else:
+                inserted, updated = self._insert_staged(table_name, staged, params), 0
+        except TRANSIENT_ERRORS:
+            raise
+        except psycopg2.Error as e:
+            self.cursor.execute("ROLLBACK TO SAVEPOINT merge_staged")
+            self.cursor.execute("RELEASE SAVEPOINT merge_staged")
+
+            if row_nums is None:
+                self.cursor.execute("SELECT row_num FROM leads_staging ORDER BY row_num")
+                row_nums = [row_num for (row_num,) in self.cursor.fetchall()]
+                logger.warning(
+                    f"Bulk merge failed, bisecting {len(row_nums)} staged rows: "
+                    f"{str(e).strip()}"
+                )
+
+            if len(row_nums) == 1:
+                self._record_db_error(row_nums[0], self._staged_row(row_nums[0]), e, stats)
+                return 0, 0, 1
+
+            middle = len(row_nums) // 2
+            totals = [0, 0, 0]
+            for half in (row_nums[:middle], row_nums[middle:]):
+                if half:
+                    for i, count in enumerate(
+                        self._merge_staged(table_name, stats, upsert, half)
+                    ):
+                        totals[i] += count
+            return tuple(totals)
+
+        self.cursor.execute("RELEASE SAVEPOINT merge_staged")
+        return inserted, updated, 0
+
+    def _staged_row(self, row_num):
+        """One staged row as a lead dict (for error records)"""
+        self.cursor.execute(
+            f"SELECT {', '.join(LEAD_COLUMNS)} FROM leads_staging WHERE row_num = %s",
+            (row_num,),
+        )
+        return dict(zip(LEAD_COLUMNS, self.cursor.fetchone()))
+
+    def _insert_staged(self, table_name, staged, params):
+        """
+        Insert the staged rows that are new to table_name.
+
+        DISTINCT ON keeps the first row per email. Rows are inserted in
+        email order, so concurrent loaders take the email index locks in
+        the same order (no deadlocks). The merge returns per-group counts
+        for the summary tables, not the inserted rows themselves.
+
+        Returns:
+            Rows inserted
+        """
+        columns = ", ".join(LEAD_COLUMNS)
+        self.cursor.execute(
+            grouped_insert(
+                f"""
+                INSERT INTO {table_name} ({columns}, row_hash)
+                SELECT {columns}, {row_hash_sql()}
+                FROM (
+                    SELECT DISTINCT ON (email) row_num, {columns}
+                    FROM {staged}
+                    ORDER BY email, row_num
+                ) first_rows
+                ORDER BY email
+                ON CONFLICT (email) DO NOTHING
+                """
+            ),
+            params or None,
+        )
+        return self._track_inserted(self.cursor.fetchall(), table_name)
+
+    def _upsert_staged(self, table_name, staged, params):
+        """
+        Merge staged rows into table_name, updating leads that exist.
+
+        One INSERT ... ON CONFLICT DO UPDATE ... WHERE for the whole batch:
+        - the LAST row per email wins (later rows are later updates)
+        - status only moves forward, and blank company/contact/industry
+          keep the stored value (UPSERT_VALUES)
+        - the WHERE compares row hashes (migrations/005_lead_row_hash.sql)
+          of the stored and the merged values, so a row that would change
+          nothing is not written at all
+
+        The existing rows are locked first, in email order, so their old
+        status/industry read by the merge can't change underneath it; new
+        rows are inserted in email order too, so concurrent workers always
+        lock in the same order. The merge returns
+        per-group deltas, not rows - see _track_upserted().
+
+        Args:
+            staged: leads_staging, or a row_num range of it (_merge_staged)
+            params: Query params for staged
+
+        Returns:
+            (rows inserted, rows updated)
+        """
+        columns = ", ".join(LEAD_COLUMNS)
+        updates = ", ".join(f"{column} = {value}" for column, value in UPSERT_VALUES.items())
+        new_hash = row_hash_sql(UPSERT_VALUES)
+        params = {**params, "statuses": list(config.VALID_STATUSES)}
+
+        self.cursor.execute(
+            f"""
+            SELECT COUNT(*) FROM (
+                SELECT 1
+                FROM {table_name}
+                WHERE email IN (SELECT email FROM {staged})
+                ORDER BY email
+                FOR UPDATE
+            ) locked
+            """,
+            params,
+        )
+
+        self.cursor.execute(
+            f"""
+            WITH previous AS (
+                SELECT email, status, industry
+                FROM {table_name}
+                WHERE email IN (SELECT email FROM {staged})
+            ),
+            upserted AS (
+                INSERT INTO {table_name} AS target ({columns}, row_hash)
+                SELECT {columns}, {row_hash_sql()}
+                FROM (
+                    SELECT DISTINCT ON (email) row_num, {columns}
+                    FROM {staged}
+                    ORDER BY email, row_num DESC
+                ) last_rows
+                ORDER BY email
+                ON CONFLICT (email) DO UPDATE SET
+                    {updates},
+                    row_hash = {new_hash}
+                WHERE target.row_hash IS DISTINCT FROM {new_hash}
+                RETURNING target.status, target.industry, target.email,
+                          target.created_at, (target.xmax = 0) AS inserted
+            ),
+            deltas AS (
+                SELECT status, industry, email, created_at, 1 AS delta, inserted
+                FROM upserted
+                UNION ALL
+                SELECT previous.status, previous.industry, previous.email,
+                       upserted.created_at, -1, FALSE
+                FROM upserted
+                JOIN previous USING (email)
+                WHERE NOT upserted.inserted
+            )
+            SELECT status, industry, split_part(email, '@', 2), created_at::date,
+                   SUM(delta),
+                   COUNT(*) FILTER (WHERE inserted),
+                   COUNT(*) FILTER (WHERE NOT inserted AND delta > 0)
+            FROM deltas
+            GROUP BY 1, 2, 3, 4
+            """,
+            params,
+        )
+        return self._track_upserted(self.cursor.fetchall(), table_name)
 
     def get_row_count(self, table_name):
         """
@@ -126,26 +913,51 @@ class CSVLoader:
             table_name: Name of table to count
         Returns:
             Number of rows as integer
+
+        With summary tables enabled, leads is answered from its row
+        counter instead of a full COUNT(*) scan.
         """
+        if self.aggregates and table_name == AGGREGATED_TABLE:
+            count = AggregateTracker.row_count(self.cursor, table_name)
+            if count is not None:
+                return count
+
         self.cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
         count = self.cursor.fetchone()[0]
         return count
 
     def clear_table(self, table_name):
-        """Delete all rows from table"""
+        """
+        Delete all rows from table.
+
+        Clearing leads also empties its summary tables and history, even
+        if this loader doesn't maintain them - they would only describe
+        rows that are gone.
+        """
 
         self.cursor.execute(f"TRUNCATE TABLE {table_name} RESTART IDENTITY")
+        tables = [table_name]
+        if table_name == AGGREGATED_TABLE:
+            AggregateTracker.truncate(self.cursor)
+            tables.extend(SUMMARY_TABLES)
+        if table_name == HISTORIZED_TABLE:
+            HistoryTracker.truncate(self.cursor)
+            tables.append(HISTORY_TABLE)
+        bump_versions(self.cursor, tables)
         self.conn.commit()
         print(f"Cleared {table_name} table")
 
     def close(self):
-        """Close database connection"""
+        """Close database connection (or return it to the pool)"""
         if self.cursor:
             self.cursor.close()
             self.cursor = None
 
         if self.conn:
-            self.conn.close()
+            if self.pool:
+                self.pool.putconn(self.conn)
+            else:
+                self.conn.close()
             self.conn = None
 
     def __exit__(self, exc_type, exc_val, exc_tb):
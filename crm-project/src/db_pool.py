@@ -0,0 +1,245 @@
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the pool timeout"""
+
+    pass
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of psycopg2 connections.
+
+    CSVLoader and QueryRunner borrow a connection with getconn() and hand
+    it back with putconn(), so a run with thousands of small files pays
+    for TCP + auth setup once per pooled connection, not once per file.
+
+    Design pattern: Object pool.
+    Connections are expensive to create, cheap to reuse.
+    """
+
+    def __init__(
+        self, db_config, min_size=1, max_size=5, timeout=30.0, health_check_interval=30.0
+    ):
+        """
+        Args:
+            db_config: Dictionary with connection parameters
+            min_size: Connections opened up front and kept open
+            max_size: Hard cap on open connections
+            timeout: Seconds getconn() waits for a free connection
+            health_check_interval: Connections idle longer than this are
+                pinged (SELECT 1) before being handed out
+        """
+        if min_size > max_size:
+            raise ValueError("min_size cannot exceed max_size")
+
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = deque()  # (connection, returned_at) pairs
+        self._size = 0  # open connections, idle + in use
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._metrics = {
+            "checkouts": 0,
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "health_check_failures": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.db_config)
+        with self._cond:
+            self._metrics["connections_created"] += 1
+        return conn
+
+    def getconn(self):
+        """
+        Borrow a connection, waiting up to self.timeout for one to free up.
+
+        Raises:
+            PoolTimeout: if the pool stays exhausted for the whole timeout
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            conn, returned_at = self._reserve(deadline)
+
+            if conn is None:
+                # Reserved a slot for a brand new connection
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self._is_healthy(conn, returned_at):
+                with self._cond:
+                    self._metrics["health_check_failures"] += 1
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - start
+            with self._cond:
+                self._metrics["checkouts"] += 1
+                self._metrics["wait_time_total"] += waited
+                self._metrics["wait_time_max"] = max(
+                    self._metrics["wait_time_max"], waited
+                )
+            return conn
+
+    def _reserve(self, deadline):
+        """
+        Take an idle connection, or a slot to open a new one.
+
+        Returns (conn, returned_at), with conn None when the caller
+        should open a new connection itself (outside the lock).
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise psycopg2.InterfaceError("connection pool is closed")
+
+                if self._idle:
+                    self._in_use += 1
+                    return self._idle.pop()
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._in_use += 1
+                    return None, None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+    def _is_healthy(self, conn, returned_at):
+        """Cheap check always, a real round-trip only for long-idle connections"""
+        if conn.closed:
+            return False
+
+        if time.monotonic() - returned_at < self.health_check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def putconn(self, conn, discard=False):
+        """
+        Return a borrowed connection to the pool.
+
+        Any open transaction is rolled back so the next borrower starts
+        clean. Broken connections are closed instead of reused.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+        with self._cond:
+            self._metrics["connections_discarded"] += 1
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._in_use -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def get_metrics(self):
+        """
+        Snapshot of pool usage.
+
+        Returns:
+            dict with size/in_use/idle counts plus cumulative counters
+            (checkouts, wait times in seconds, created/discarded, ...)
+        """
+        with self._cond:
+            metrics = dict(self._metrics)
+            metrics.update(
+                {
+                    "size": self._size,
+                    "in_use": self._in_use,
+                    "idle": len(self._idle),
+                    "max_size": self.max_size,
+                }
+            )
+
+        checkouts = metrics["checkouts"]
+        metrics["wait_time_avg"] = (
+            metrics["wait_time_total"] / checkouts if checkouts else 0.0
+        )
+        return metrics
+
+    def close(self):
+        """Close all idle connections; borrowed ones close when returned"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for conn, _ in idle:
+            conn.close()
+
+        logger.info(f"Connection pool closed: {self.get_metrics()}")
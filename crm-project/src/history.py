@@ -0,0 +1,108 @@
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# SCD Type 2 table (see migrations/006_leads_history.sql)
+HISTORY_TABLE = "leads_history"
+
+# Table whose versions it keeps
+HISTORIZED_TABLE = "leads"
+
+# Versioned columns, copied from leads into each version
+HISTORY_COLUMNS = (
+    "email", "company_name", "contact_person", "industry", "status", "row_hash"
+)
+
+
+class HistoryTracker:
+    """
+    Keeps leads_history in step with leads, like AggregateTracker does for
+    the summary tables: the loader tells it which emails it wrote, and calls
+    flush() right before each commit.
+
+    flush() is two set-based statements over just those leads, whatever the
+    batch size - no per-lead Python:
+    1. close the current version of every lead whose row_hash changed
+    2. insert a current version for every lead that has none (new leads,
+       and the ones just closed)
+    Both use now() - the transaction's start time - so a closed version's
+    valid_to is exactly its successor's valid_from.
+    """
+
+    def __init__(self):
+        self.staged = False  # emails to merge are in leads_staging
+        self.emails = []  # ... or were sent row by row / batch by batch
+
+    def stage(self):
+        """The written rows are in the temp table leads_staging (COPY paths)"""
+        self.staged = True
+
+    def touch(self, email):
+        """Remember an email written by the row/batch strategies"""
+        self.emails.append(email)
+
+    def reset(self):
+        """Forget written rows (the transaction was rolled back)"""
+        self.staged = False
+        self.emails = []
+
+    def flush(self, cursor):
+        """
+        Merge the written leads into leads_history.
+
+        Returns:
+            (versions closed, versions inserted)
+        """
+        if self.staged:
+            scope = "email IN (SELECT email FROM leads_staging)"
+            params = None
+        elif self.emails:
+            scope = "email = ANY(%(emails)s)"
+            params = {"emails": self.emails}
+        else:
+            return 0, 0
+
+        cursor.execute(
+            f"""
+            UPDATE {HISTORY_TABLE} AS h
+            SET valid_to = now(), is_current = FALSE
+            FROM {HISTORIZED_TABLE} AS l
+            WHERE h.is_current
+              AND h.lead_id = l.id
+              AND h.row_hash IS DISTINCT FROM l.row_hash
+              AND l.{scope}
+            """,
+            params,
+        )
+        closed = cursor.rowcount
+
+        # The UPDATE above is visible here, so closed leads have no
+        # current version any more and get a new one
+        columns = ", ".join(HISTORY_COLUMNS)
+        cursor.execute(
+            f"""
+            INSERT INTO {HISTORY_TABLE} (lead_id, {columns}, valid_from)
+            SELECT l.id, {", ".join(f"l.{c}" for c in HISTORY_COLUMNS)}, now()
+            FROM {HISTORIZED_TABLE} AS l
+            WHERE l.{scope}
+              AND NOT EXISTS (
+                  SELECT 1 FROM {HISTORY_TABLE} AS h
+                  WHERE h.lead_id = l.id AND h.is_current
+              )
+            """,
+            params,
+        )
+        inserted = cursor.rowcount
+
+        self.reset()
+        logger.debug(f"History merge: {closed} versions closed, {inserted} inserted")
+        return closed, inserted
+
+    @staticmethod
+    def truncate(cursor):
+        """
+        Empty the history (call alongside TRUNCATE leads RESTART IDENTITY,
+        which hands out old lead ids again)
+        """
+        cursor.execute(f"TRUNCATE {HISTORY_TABLE} RESTART IDENTITY")
@@ -0,0 +1,249 @@
+import os
+import re
+import json
+import mmap
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+
+logger = logging.getLogger(__name__)
+
+# One rejected-row record. Matches both the single-line format written by
+# RowErrorLog ("Row 5: Validation failed - [...] | Data: {...}") and the
+# older three-line format (header, "   Errors: [...]", "   Data: {...}").
+RECORD_PATTERN = re.compile(
+    rb"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d+) - ERROR - Row (?P<row>\d+): "
+    rb"(?P<kind>Validation failed|Database error)(?P<rest>[^\n]*)"
+    rb"(?:\n[^\n]* - ERROR -\s+Errors: (?P<errors>[^\n]*))?",
+    re.MULTILINE,
+)
+
+# Quoted items of a printed Python list: ['a', "b's"] -> a, b's
+LIST_ITEM_PATTERN = re.compile(rb"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"")
+
+# Final per-load totals written by RowErrorLog.flush()
+TOTALS_PATTERN = re.compile(
+    rb"^[^\n]* - ERROR - (?P<rows>\d+) rows rejected: \{(?P<counts>[^\n]*)\}$",
+    re.MULTILINE,
+)
+COUNT_ITEM_PATTERN = re.compile(rb"'((?:[^'\\]|\\.)*)': (\d+)")
+
+ERROR_TYPES = {b"Validation failed": "validation", b"Database error": "database"}
+
+# Don't bother splitting files smaller than this across processes
+MIN_SHARD_SIZE = 8 * 1024 * 1024
+
+
+def empty_summary():
+    return {
+        "records": 0,
+        "by_type": Counter(),
+        "messages": Counter(),
+        "rejects_by_code": Counter(),
+        "summarised_rows": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+        "bytes": 0,
+    }
+
+
+def merge_summaries(total, other):
+    """Add summary other into total (in place) and return total"""
+    total["records"] += other["records"]
+    total["by_type"].update(other["by_type"])
+    total["messages"].update(other["messages"])
+    total["rejects_by_code"].update(other["rejects_by_code"])
+    total["summarised_rows"] += other["summarised_rows"]
+    total["bytes"] += other["bytes"]
+
+    for key, pick in (("first_timestamp", min), ("last_timestamp", max)):
+        values = [v for v in (total[key], other[key]) if v is not None]
+        total[key] = pick(values) if values else None
+
+    return total
+
+
+def _decode(item):
+    """One quoted list item -> text (undoes the repr() escaping of quotes)"""
+    text = item.decode("utf-8", "replace")
+    return text.replace("\\'", "'").replace('\\"', '"').replace("\\\\", "\\")
+
+
+def _list_items(raw):
+    return [_decode(single or double) for single, double in LIST_ITEM_PATTERN.findall(raw)]
+
+
+def analyze_shard(log_file, start, end):
+    """
+    Summarise the records that START in [start, end) of log_file.
+
+    start must be at a line start. A record starting before end may run
+    past it (the old three-line format); it is still read whole here, and
+    skipped by the next shard, whose first lines are not record starts.
+    """
+    summary = empty_summary()
+    summary["bytes"] = end - start
+
+    if end <= start:
+        return summary
+
+    with open(log_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        first = last = None
+
+        for match in RECORD_PATTERN.finditer(mm, start):
+            if match.start() >= end:
+                break
+
+            summary["records"] += 1
+            error_type = ERROR_TYPES[match.group("kind")]
+            summary["by_type"][error_type] += 1
+
+            timestamp = match.group("ts")
+            first = first or timestamp
+            last = timestamp
+
+            if match.group("errors") is not None:
+                # Old format: messages on the "Errors:" line
+                messages = _list_items(match.group("errors"))
+            elif error_type == "validation":
+                # New format: " - ['msg', ...] | Data: {...}"
+                messages = _list_items(match.group("rest").split(b" | Data: ", 1)[0])
+            else:
+                # Database error text: " - <message> | Data: {...}"
+                rest = match.group("rest").split(b" | Data: ", 1)[0]
+                messages = [rest.removeprefix(b" - ").decode("utf-8", "replace")]
+
+            summary["messages"].update(messages)
+
+        for match in TOTALS_PATTERN.finditer(mm, start, end):
+            summary["summarised_rows"] += int(match.group("rows"))
+            for code, count in COUNT_ITEM_PATTERN.findall(match.group("counts")):
+                summary["rejects_by_code"][_decode(code)] += int(count)
+
+        summary["first_timestamp"] = first.decode() if first else None
+        summary["last_timestamp"] = last.decode() if last else None
+
+    return summary
+
+
+def _analyze_shard_task(task):
+    """ProcessPoolExecutor entry point"""
+    return analyze_shard(*task)
+
+
+def shard_bounds(log_file, start, end, shards):
+    """
+    Split [start, end) into up to shards ranges, each starting at a line start.
+    """
+    if end - start < MIN_SHARD_SIZE * 2 or shards <= 1:
+        return [(start, end)]
+
+    bounds = [start]
+    with open(log_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        step = (end - start) // shards
+        for i in range(1, shards):
+            newline = mm.find(b"\n", start + i * step, end)
+            if newline == -1:
+                break
+            if newline + 1 > bounds[-1]:
+                bounds.append(newline + 1)
+    bounds.append(end)
+
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def complete_lines_end(log_file):
+    """Offset just past the last newline (a line still being written is left)"""
+    size = os.path.getsize(log_file)
+    if size == 0:
+        return 0
+
+    with open(log_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.rfind(b"\n") + 1
+
+
+class LogAnalyzer:
+    """
+    Streaming analyzer for etl_errors.log.
+
+    - mmap + precompiled byte patterns: the file is never read into a
+      Python list of lines, and nothing in it is eval()'d
+    - large files are split into line-aligned shards, parsed in worker
+      processes, and their Counter summaries merged
+    - with a state file, each run continues from the byte offset the last
+      run stopped at and adds to its totals (a rotated or truncated log is
+      detected and read from the start)
+    """
+
+    def __init__(self, log_file, state_file=None, workers=None):
+        self.log_file = log_file
+        self.state_file = state_file
+        self.workers = workers or os.cpu_count() or 1
+
+    def load_state(self):
+        """Previous (offset, summary) for this log, or (0, empty summary)"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return 0, empty_summary()
+
+        with open(self.state_file, "r") as f:
+            state = json.load(f)
+
+        stat = os.stat(self.log_file)
+        if state["inode"] != stat.st_ino or state["offset"] > stat.st_size:
+            logger.info(f"{self.log_file} was rotated or truncated - starting over")
+            return 0, empty_summary()
+
+        summary = empty_summary()
+        merge_summaries(summary, _counters(state["summary"]))
+        return state["offset"], summary
+
+    def save_state(self, offset, summary):
+        state = {
+            "log_file": self.log_file,
+            "inode": os.stat(self.log_file).st_ino,
+            "offset": offset,
+            "summary": summary,
+        }
+        tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def analyze(self):
+        """
+        Parse everything new in the log.
+
+        Returns:
+            Summary dict (totals including earlier incremental runs)
+        """
+        offset, summary = self.load_state()
+        end = complete_lines_end(self.log_file)
+
+        shards = shard_bounds(self.log_file, offset, end, self.workers)
+        tasks = [(self.log_file, start, stop) for start, stop in shards]
+        logger.info(f"Analyzing {self.log_file} bytes {offset}-{end} in {len(tasks)} shard(s)")
+
+        if len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                for shard_summary in executor.map(_analyze_shard_task, tasks):
+                    merge_summaries(summary, shard_summary)
+        else:
+            for task in tasks:
+                merge_summaries(summary, analyze_shard(*task))
+
+        if self.state_file:
+            self.save_state(end, summary)
+
+        return summary
+
+
+def _counters(summary):
+    """A summary loaded from JSON, with its dicts turned back into Counters"""
+    return {
+        **summary,
+        "by_type": Counter(summary["by_type"]),
+        "messages": Counter(summary["messages"]),
+        "rejects_by_code": Counter(summary["rejects_by_code"]),
+    }
@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+# Manifest entry statuses
+IN_PROGRESS = "in_progress"
+COMPLETE = "complete"
+FAILED = "failed"
+
+
+class IngestionManifest:
+    """
+    Persistent record of every file the pipeline has ingested.
+
+    Files are identified by the SHA-256 of their content, not their name,
+    so a file that was archived and then dropped into data/input again is
+    recognised and skipped without being parsed.
+
+    Each entry is its own JSON file (<manifest_dir>/<hash>.json), written
+    atomically (temp file + os.replace). Worker processes handling
+    different files never touch the same entry, so no locking is needed.
+
+    Entry format:
+        {
+            "file_hash": str,
+            "filename": str,
+            "size": int,
+            "status": "in_progress" | "complete" | "failed",
+            "rows_committed": int,   # data rows committed so far
+            "error": str or None,
+            "started_at": str,
+            "updated_at": str,
+        }
+    """
+
+    def __init__(self, manifest_dir):
+        self.manifest_dir = manifest_dir
+        os.makedirs(manifest_dir, exist_ok=True)
+
+    @staticmethod
+    def file_hash(filepath, block_size=1024 * 1024):
+        """SHA-256 of the file's bytes, read in 1MB blocks"""
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, file_hash):
+        return os.path.join(self.manifest_dir, f"{file_hash}.json")
+
+    def get(self, file_hash):
+        """Return the entry for file_hash, or None if never seen"""
+        try:
+            with open(self._entry_path(file_hash), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def is_complete(self, file_hash):
+        entry = self.get(file_hash)
+        return entry is not None and entry["status"] == COMPLETE
+
+    def resume_offset(self, file_hash):
+        """Data rows already committed for an unfinished file (0 if none)"""
+        entry = self.get(file_hash)
+        if entry is None or entry["status"] == COMPLETE:
+            return 0
+        return entry["rows_committed"]
+
+    def start(self, file_hash, filepath):
+        """Mark a file as in progress, keeping any earlier checkpoint"""
+        entry = self.get(file_hash) or {
+            "file_hash": file_hash,
+            "rows_committed": 0,
+            "started_at": datetime.now().isoformat(),
+        }
+        entry.update(
+            {
+                "filename": os.path.basename(filepath),
+                "size": os.path.getsize(filepath),
+                "status": IN_PROGRESS,
+                "error": None,
+            }
+        )
+        self._write(entry)
+        return entry
+
+    def checkpoint(self, file_hash, rows_committed):
+        """Record that the first rows_committed data rows are in the database"""
+        self._update(file_hash, rows_committed=rows_committed)
+
+    def complete(self, file_hash):
+        self._update(file_hash, status=COMPLETE)
+
+    def fail(self, file_hash, error):
+        self._update(file_hash, status=FAILED, error=str(error))
+
+    def _update(self, file_hash, **changes):
+        entry = self.get(file_hash)
+        if entry is None:
+            raise KeyError(f"No manifest entry for {file_hash}")
+        entry.update(changes)
+        self._write(entry)
+
+    def _write(self, entry):
+        entry["updated_at"] = datetime.now().isoformat()
+
+        path = self._entry_path(entry["file_hash"])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,281 @@
+import os
+import json
+import time
+import logging
+from datetime import datetime
+from contextlib import contextmanager
+
+from psycopg2.extensions import cursor as _BaseCursor
+
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every metric in the Prometheus textfile
+METRIC_PREFIX = "crm_etl"
+
+# Per-stage values exported to Prometheus: (key, metric suffix, help text)
+STAGE_FIELDS = [
+    ("seconds", "stage_seconds", "Wall time spent in the stage during the last run"),
+    ("rows", "stage_rows", "Rows handled by the stage during the last run"),
+    ("rows_per_sec", "stage_rows_per_second", "Stage throughput during the last run"),
+    ("bytes", "stage_bytes", "Bytes read or written by the stage during the last run"),
+    ("round_trips", "stage_db_round_trips", "Database round-trips made by the stage"),
+    ("calls", "stage_calls", "Times the stage ran during the last run"),
+]
+
+
+class CountingCursor(_BaseCursor):
+    """
+    psycopg2 cursor that counts database round-trips.
+
+    Use as conn.cursor(cursor_factory=CountingCursor). Every execute(),
+    executemany() and copy_expert() is one trip (execute_values pages
+    call execute() once per page); on a named (server-side) cursor each
+    fetch is a trip too.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.round_trips = 0
+
+    def execute(self, query, vars=None):
+        self.round_trips += 1
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        self.round_trips += 1
+        return super().executemany(query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        self.round_trips += 1
+        return super().copy_expert(sql, file, size)
+
+    def fetchmany(self, size=None):
+        if self.name:
+            self.round_trips += 1
+        return super().fetchmany() if size is None else super().fetchmany(size)
+
+
+def _round_trips(cursor):
+    return getattr(cursor, "round_trips", 0) if cursor is not None else 0
+
+
+class StageRecord:
+    """What one run of a stage did - filled in inside metrics.stage()"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.round_trips = 0  # extra trips on cursors the stage didn't get
+
+
+class PipelineMetrics:
+    """
+    Per-stage timings and counters for one pipeline run.
+
+    Stages accumulate across calls (every chunk's "validate" adds to the
+    same total). Stages may nest - "reports" includes the "query" it
+    runs - so stage times don't add up to the run time. Worker processes
+    keep their own PipelineMetrics and the parent merges their to_dict()
+    output, like ETL.merge_counters().
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.stages = {}  # name -> {calls, seconds, rows, bytes, round_trips}
+        self.files = []
+
+    @contextmanager
+    def stage(self, name, cursor=None):
+        """
+        Time a block as one call of stage name.
+
+        Args:
+            name: Stage name, e.g. "parse", "db_load", "file_move"
+            cursor: Optional CountingCursor - round-trips it makes inside
+                    the block are charged to the stage
+
+        Yields:
+            StageRecord - set .rows / .bytes on it inside the block
+        """
+        record = StageRecord()
+        trips_before = _round_trips(cursor)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(
+                name,
+                seconds=time.perf_counter() - start,
+                rows=record.rows,
+                bytes=record.bytes,
+                round_trips=record.round_trips + _round_trips(cursor) - trips_before,
+            )
+
+    def timed_iter(self, name, iterable, rows=len, bytes=None):
+        """
+        Yield from iterable, charging the time spent producing each item
+        to stage name (e.g. reading the next chunk of a file).
+
+        Args:
+            rows: Function giving an item's row count
+            bytes: Optional function giving an item's bytes read
+        """
+        iterator = iter(iterable)
+        try:
+            while True:
+                with self.stage(name) as record:
+                    item = next(iterator, _DONE)
+                    if item is not _DONE:
+                        record.rows = rows(item)
+                        record.bytes = bytes(item) if bytes else 0
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            # Close a wrapped generator now, not whenever it's collected
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    def add(self, name, seconds=0.0, rows=0, bytes=0, round_trips=0, calls=1):
+        stage = self.stages.setdefault(
+            name, {"calls": 0, "seconds": 0.0, "rows": 0, "bytes": 0, "round_trips": 0}
+        )
+        stage["calls"] += calls
+        stage["seconds"] += seconds
+        stage["rows"] += rows
+        stage["bytes"] += bytes
+        stage["round_trips"] += round_trips
+
+    def record_file(self, filename, **values):
+        """Per-file totals (rows read / loaded / rejected, bytes, seconds...)"""
+        self.files.append({"file": filename, **values})
+
+    def to_dict(self):
+        stages = {}
+        for name, stage in self.stages.items():
+            seconds = stage["seconds"]
+            stages[name] = {
+                **stage,
+                "seconds": round(seconds, 4),
+                "rows_per_sec": round(stage["rows"] / seconds, 1) if seconds else 0.0,
+            }
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(
+                (datetime.now() - self.started_at).total_seconds(), 3
+            ),
+            "stages": stages,
+            "files": self.files,
+        }
+
+    def merge(self, other):
+        """Add another run's to_dict() (e.g. from a worker process)"""
+        for name, stage in other["stages"].items():
+            self.add(
+                name,
+                seconds=stage["seconds"],
+                rows=stage["rows"],
+                bytes=stage["bytes"],
+                round_trips=stage["round_trips"],
+                calls=stage["calls"],
+            )
+        self.files.extend(other["files"])
+
+    def write_json(self, output_dir, summary=None):
+        """
+        Write this run to <output_dir>/run_<timestamp>.json (one file per
+        run, so throughput can be compared across nights).
+
+        Returns:
+            Path written
+        """
+        data = self.to_dict()
+        data["summary"] = summary or {}
+
+        filepath = os.path.join(
+            output_dir, f"run_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        _write_atomic(filepath, json.dumps(data, indent=2, default=str))
+        return filepath
+
+    def write_prometheus(self, filepath, summary=None):
+        """
+        Write a Prometheus textfile-collector file.
+
+        node_exporter reads every *.prom file in its
+        --collector.textfile.directory; the file is replaced atomically so
+        it never sees a half-written one.
+        """
+        data = self.to_dict()
+        lines = []
+
+        for key, suffix, help_text in STAGE_FIELDS:
+            metric = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for name, stage in sorted(data["stages"].items()):
+                lines.append(f'{metric}{{stage="{_escape_label(name)}"}} {stage[key]}')
+
+        run_values = [
+            ("last_run_timestamp_seconds", "Unix time the last run finished", time.time()),
+            ("last_run_duration_seconds", "Wall time of the last run", data["duration_seconds"]),
+        ]
+        for key, value in (summary or {}).items():
+            if isinstance(value, (int, float)):
+                run_values.append((f"last_run_{key}", f"{key} in the last run", value))
+
+        for suffix, help_text, value in run_values:
+            metric = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        _write_atomic(filepath, "\n".join(lines) + "\n")
+        return filepath
+
+
+class ProgressReporter:
+    """
+    Logs progress through a large file at most every interval seconds:
+    percent done (by bytes), rows, throughput and an ETA.
+    """
+
+    def __init__(self, label, total_bytes, interval=10):
+        self.label = label
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.start = time.perf_counter()
+        self.last_report = self.start
+
+    def update(self, bytes_done, rows_done):
+        now = time.perf_counter()
+        if now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = now - self.start
+        fraction = bytes_done / self.total_bytes if self.total_bytes else 1.0
+        rate = rows_done / elapsed if elapsed else 0.0
+        eta = elapsed * (1 - fraction) / fraction if fraction else float("inf")
+
+        logger.info(
+            f"{self.label}: {fraction:.1%} ({rows_done:,} rows, "
+            f"{rate:,.0f} rows/s, ETA {eta:,.0f}s)"
+        )
+
+
+_DONE = object()
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _write_atomic(filepath, text):
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, filepath)
@@ -0,0 +1,280 @@
+import os
+import re
+import hashlib
+import logging
+
+import psycopg2
+
+
+logger = logging.getLogger(__name__)
+
+# Migration files: <version>_<name>.sql, applied in version order
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# First-lines directive for statements that can't run in a transaction
+# (e.g. CREATE INDEX CONCURRENTLY)
+NO_TRANSACTION_DIRECTIVE = "-- migrate: no-transaction"
+
+# Index a CREATE INDEX statement builds (name group)
+CREATE_INDEX_PATTERN = re.compile(
+    r"\bCREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"(?P<name>\"[^\"]+\"|[\w.]+)\s+ON\b",
+    re.IGNORECASE,
+)
+
+# Where split_statements() looks: statement-ending semicolons, and the
+# dollar quotes ($$, $body$) around function bodies that contain them
+STATEMENT_BREAK_PATTERN = re.compile(r"\$(?:[A-Za-z_]\w*)?\$|;")
+
+# Arbitrary key for pg_advisory_lock - one migration runner at a time
+MIGRATION_LOCK_ID = 720_310_001
+
+
+class MigrationError(Exception):
+    """Raised when a migration cannot be applied cleanly"""
+
+    pass
+
+
+class MigrationRunner:
+    """
+    Applies versioned SQL migrations and records them in schema_migrations.
+
+    Migrations only ever move the schema forward - nothing is dropped and
+    re-created, so running this against a loaded database keeps its data.
+    Each migration runs once; re-running the runner is a no-op.
+    """
+
+    def __init__(self, db_config, migrations_dir="migrations"):
+        self.db_config = db_config
+        self.migrations_dir = migrations_dir
+        self.conn = None
+        self.cursor = None
+
+    def __enter__(self):
+        self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def discover(self):
+        """
+        Return all migration files as a sorted list of dicts:
+        [{'version': int, 'name': str, 'path': str, 'checksum': str}, ...]
+        """
+        migrations = []
+        for filename in os.listdir(self.migrations_dir):
+            match = MIGRATION_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+
+            path = os.path.join(self.migrations_dir, filename)
+            with open(path, "rb") as f:
+                checksum = hashlib.sha256(f.read()).hexdigest()
+
+            migrations.append(
+                {
+                    "version": int(match.group(1)),
+                    "name": match.group(2),
+                    "path": path,
+                    "checksum": checksum,
+                }
+            )
+
+        migrations.sort(key=lambda m: m["version"])
+
+        versions = [m["version"] for m in migrations]
+        if len(versions) != len(set(versions)):
+            raise MigrationError(f"Duplicate migration versions in {self.migrations_dir}")
+
+        return migrations
+
+    def _ensure_history_table(self):
+        self.cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        self.conn.commit()
+
+    def applied(self):
+        """Return {version: checksum} of migrations already applied"""
+        self._ensure_history_table()
+        self.cursor.execute("SELECT version, checksum FROM schema_migrations")
+        applied = dict(self.cursor.fetchall())
+        self.conn.commit()
+        return applied
+
+    def pending(self):
+        """Migrations not applied yet (warns about edited, applied ones)"""
+        applied = self.applied()
+        pending = []
+
+        for migration in self.discover():
+            checksum = applied.get(migration["version"])
+            if checksum is None:
+                pending.append(migration)
+            elif checksum != migration["checksum"]:
+                logger.warning(
+                    f"Migration {migration['version']}_{migration['name']} was "
+                    f"edited after being applied - add a new migration instead"
+                )
+
+        return pending
+
+    def migrate(self):
+        """
+        Apply every pending migration, in order.
+
+        Returns:
+            List of applied migration names
+        """
+        self.conn.autocommit = True
+        self.cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        self.conn.autocommit = False
+
+        try:
+            applied = []
+            for migration in self.pending():
+                self._apply(migration)
+                applied.append(f"{migration['version']}_{migration['name']}")
+            return applied
+        finally:
+            self.conn.rollback()
+            self.conn.autocommit = True
+            self.cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            self.conn.autocommit = False
+
+    def _apply(self, migration):
+        label = f"{migration['version']}_{migration['name']}"
+        with open(migration["path"], "r") as f:
+            sql = f.read()
+
+        print(f"Applying migration {label}...")
+        logger.info(f"Applying migration {label}")
+
+        try:
+            if self._is_no_transaction(sql):
+                self._apply_without_transaction(sql, migration)
+            else:
+                # Schema change and its history row commit together
+                self.cursor.execute(sql)
+                self._record(migration)
+                self.conn.commit()
+        except psycopg2.Error as e:
+            self.conn.rollback()
+            raise MigrationError(f"Migration {label} failed: {e}") from e
+
+    def _is_no_transaction(self, sql):
+        head = sql.lstrip().splitlines()[:3]
+        return any(line.strip() == NO_TRANSACTION_DIRECTIVE for line in head)
+
+    def _apply_without_transaction(self, sql, migration):
+        """
+        Run statements one by one in autocommit mode.
+
+        CREATE INDEX CONCURRENTLY refuses to run in a transaction block,
+        and psycopg2 wraps a multi-statement string in one - so split it.
+        A failed concurrent build leaves an INVALID index behind (which
+        IF NOT EXISTS would then skip), so check the indexes this
+        migration creates afterwards - only those: an invalid index
+        somewhere else (e.g. a REINDEX CONCURRENTLY in progress) is not
+        this migration's business.
+        """
+        label = f"{migration['version']}_{migration['name']}"
+        statements = split_statements(sql)
+        index_names = created_indexes(statements)
+
+        self.conn.autocommit = True
+        try:
+            for statement in statements:
+                self.cursor.execute(statement)
+
+            invalid = []
+            if index_names:
+                self.cursor.execute(
+                    """
+                    SELECT indexrelid::regclass::text
+                    FROM pg_index
+                    WHERE NOT indisvalid
+                      AND indexrelid IN (
+                          SELECT to_regclass(name) FROM unnest(%s::text[]) AS name
+                      )
+                    """,
+                    (index_names,),
+                )
+                invalid = [row[0] for row in self.cursor.fetchall()]
+            if invalid:
+                raise MigrationError(
+                    f"Migration {label} left invalid indexes {invalid} - "
+                    f"DROP INDEX CONCURRENTLY them and re-run"
+                )
+        finally:
+            self.conn.autocommit = False
+
+        self._record(migration)
+        self.conn.commit()
+
+    def _record(self, migration):
+        self.cursor.execute(
+            """
+            INSERT INTO schema_migrations (version, name, checksum)
+            VALUES (%s, %s, %s)
+            """,
+            (migration["version"], migration["name"], migration["checksum"]),
+        )
+
+    def close(self):
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+def split_statements(sql):
+    """
+    Split a simple SQL script on statement-ending semicolons.
+
+    Only meant for no-transaction migrations: plain DDL, and function / DO
+    bodies in dollar quotes ($$ ... $$), whose semicolons are kept. No
+    semicolons inside ordinary strings. Comment lines are dropped first.
+    """
+    sql = "\n".join(
+        line for line in sql.splitlines() if not line.strip().startswith("--")
+    )
+
+    statements = []
+    start = 0
+    quote = None  # open dollar quote, e.g. "$$"
+    for match in STATEMENT_BREAK_PATTERN.finditer(sql):
+        token = match.group()
+        if quote:
+            if token == quote:
+                quote = None
+        elif token != ";":
+            quote = token
+        else:
+            statements.append(sql[start:match.start()].strip())
+            start = match.end()
+
+    statements.append(sql[start:].strip())
+    return [statement for statement in statements if statement]
+
+
+def created_indexes(statements):
+    """Names of the indexes CREATE INDEX statements build (as written)"""
+    return [
+        match.group("name")
+        for statement in statements
+        for match in CREATE_INDEX_PATTERN.finditer(statement)
+    ]
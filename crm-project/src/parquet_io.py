@@ -0,0 +1,188 @@
+import os
+import json
+import logging
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # optional - only needed for .parquet input/output
+    pa = pc = pq = None
+
+
+logger = logging.getLogger(__name__)
+
+PARQUET_SUFFIX = ".parquet"
+
+# Default codec for everything written as Parquet
+DEFAULT_COMPRESSION = "zstd"
+
+
+def require_pyarrow():
+    if pq is None:
+        raise ImportError(
+            "Parquet support needs pyarrow: pip install 'crm-project[parquet]'"
+        )
+
+
+def is_parquet(filepath):
+    return filepath.lower().endswith(PARQUET_SUFFIX)
+
+
+def read_parquet_chunks(source, columns, chunk_size=None, start_row=0):
+    """
+    Yield a Parquet file as DataFrames of string columns.
+
+    Only the wanted columns that exist in the file are read (the rest
+    aren't even decompressed). Values are cast to strings so the frames
+    look exactly like the CSV path's dtype=str frames.
+
+    Args:
+        source: File path or binary file object
+        columns: Columns the pipeline needs
+        chunk_size: Rows per DataFrame (None = one per row group)
+        start_row: Data rows to skip (already committed); the index still
+                   counts rows from the top of the file
+    """
+    require_pyarrow()
+
+    parquet_file = pq.ParquetFile(source)
+    available = set(parquet_file.schema_arrow.names)
+    wanted = [column for column in columns if column in available]
+
+    batches = parquet_file.iter_batches(
+        batch_size=chunk_size or parquet_file.metadata.num_rows or 1,
+        columns=wanted,
+    )
+
+    position = 0
+    for batch in batches:
+        if position + batch.num_rows <= start_row:
+            position += batch.num_rows
+            continue
+
+        skip = max(start_row - position, 0)
+        batch = batch.slice(skip)
+        position += skip
+
+        df = pd.DataFrame(
+            {
+                name: pc.cast(batch.column(name), pa.string()).to_pylist()
+                for name in wanted
+            },
+            dtype=object,
+        )
+        df.index += position
+        position += batch.num_rows
+        yield df
+
+
+def write_parquet_part(df, directory, compression=DEFAULT_COMPRESSION):
+    """
+    Write one chunk as <directory>/part-<first row>.parquet.
+
+    A directory of parts is a Parquet dataset (pyarrow.dataset, Spark,
+    DuckDB... read it as one table). Naming parts by their first row makes
+    a resumed run overwrite, not duplicate, a chunk it writes again.
+    """
+    require_pyarrow()
+
+    os.makedirs(directory, exist_ok=True)
+    first_row = int(df.index[0]) + 1 if len(df) else 0
+    path = os.path.join(directory, f"part-{first_row:012d}{PARQUET_SUFFIX}")
+
+    df.to_parquet(path, engine="pyarrow", compression=compression, index=False)
+    return path
+
+
+def _arrow_type(column):
+    """
+    Arrow type for one cursor.description column, by PostgreSQL type OID
+    (what psycopg2 reports as type_code). Types without a mapping
+    (text, uuid, json, arrays...) are written as strings.
+    """
+    if column.type_code == 1700:  # numeric
+        if column.precision is None:
+            # Unconstrained (e.g. AVG()): no fixed scale to store it exactly
+            return pa.float64()
+        if column.precision > 38:
+            return pa.string()
+        return pa.decimal128(column.precision, column.scale or 0)
+
+    return {
+        16: pa.bool_(),  # boolean
+        20: pa.int64(),  # bigint
+        21: pa.int16(),  # smallint
+        23: pa.int32(),  # integer
+        700: pa.float32(),  # real
+        701: pa.float64(),  # double precision
+        1082: pa.date32(),  # date
+        1083: pa.time64("us"),  # time
+        1114: pa.timestamp("us"),  # timestamp
+        1184: pa.timestamp("us", tz="UTC"),  # timestamptz
+        1186: pa.duration("us"),  # interval
+        17: pa.binary(),  # bytea
+    }.get(column.type_code, pa.string())
+
+
+def _to_string(value):
+    """A value of an unmapped type as text (json/arrays as JSON)"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def _to_float(value):
+    return None if value is None else float(value)
+
+
+class ParquetStreamWriter:
+    """
+    Appends batches of rows to one Parquet file.
+
+    The schema comes from the query's cursor.description (see
+    _arrow_type), not from the first batch: a column that is all NULL in
+    the first batch would otherwise be typed null and every later batch
+    would fail. Used for exports that are too big to build as one
+    DataFrame.
+    """
+
+    def __init__(self, output_file, description, compression=DEFAULT_COMPRESSION):
+        """
+        Args:
+            output_file: Path of the Parquet file to write
+            description: cursor.description of the query being exported
+            compression: Parquet codec
+        """
+        require_pyarrow()
+        self.output_file = output_file
+        self.schema = pa.schema([(column[0], _arrow_type(column)) for column in description])
+        # Python values psycopg2 returns that Arrow won't take as the type
+        self.converters = [
+            _to_string if field.type == pa.string()
+            else _to_float if field.type == pa.float64()
+            else None
+            for field in self.schema
+        ]
+        self.writer = pq.ParquetWriter(output_file, self.schema, compression=compression)
+
+    def write(self, rows):
+        """Write rows (tuples in description order)"""
+        arrays = []
+        for i, (field, convert) in enumerate(zip(self.schema, self.converters)):
+            values = [row[i] for row in rows]
+            if convert is not None:
+                values = [convert(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        """Finish the file (a valid, typed file even with no rows written)"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -1,16 +1,93 @@
 import os
+import time
+import uuid
 import shutil
 import logging
+import multiprocessing.util
 import pandas as pd
 from datetime import datetime
-
-from src.data_loader import CSVLoader
-from src.validator import LeadValidator
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import config
+from logging_config import setup_logging
+from src.data_loader import CSVLoader, DEFAULT_PAGE_SIZE, LEAD_COLUMNS
+from src.db_pool import ConnectionPool
+from src.dedup import DUPLICATE_CODE, EmailIndex
+from src.manifest import IngestionManifest
+from src.metrics import PipelineMetrics, ProgressReporter
+from src.parquet_io import (
+    DEFAULT_COMPRESSION,
+    PARQUET_SUFFIX,
+    is_parquet,
+    read_parquet_chunks,
+    write_parquet_part,
+)
+from src.rejects import RejectSink
+from src.validator import LEAD_RULES, LeadValidator
 from src.query_runner import QueryRunner
+from src.reports import ReportEngine
 
 
 logger = logging.getLogger(__name__)
 
+# Input files the pipeline picks up
+INPUT_SUFFIXES = (".csv", PARQUET_SUFFIX)
+
+# Columns read from columnar (Parquet) input: what is loaded plus what the
+# validation rules look at - anything else in the file is never decoded
+INPUT_COLUMNS = list(
+    dict.fromkeys(
+        [*LEAD_COLUMNS]
+        + [rule["field"] for rule in LEAD_RULES]
+        + [rule["when_field"] for rule in LEAD_RULES if "when_field" in rule]
+    )
+)
+
+
+class ChunkLoadError(Exception):
+    """A chunk's load was rolled back - none of its rows are in the database"""
+
+
+# This worker process's ETL, built once by _init_worker()
+_worker_etl = None
+
+
+def _init_worker(config_params):
+    """
+    ProcessPoolExecutor initializer: set up logging and build the ETL
+    every file this worker processes shares - so the connection pool is
+    opened, and the email index loaded, once per worker rather than once
+    per file. The pool is closed when the worker exits.
+    """
+    global _worker_etl
+    setup_logging()
+    _worker_etl = ETL(config_params)
+    # Pool workers exit without running atexit hooks. Higher priorities
+    # run first: close before stop_logging() (100) so the pool metrics
+    # still reach the log.
+    multiprocessing.util.Finalize(None, _close_worker, exitpriority=200)
+
+
+def _close_worker():
+    """Close the worker's ETL (runs as the worker process exits)"""
+    global _worker_etl
+    if _worker_etl is not None:
+        _worker_etl.close()
+        _worker_etl = None
+
+
+def _process_file_worker(filepath):
+    """
+    Process one whole file in a worker process, with the worker's ETL
+    (see _init_worker). Returns that file's counters (and stage metrics)
+    for the parent to merge.
+    """
+    _worker_etl.process_file(filepath)
+    counters = _worker_etl.get_counters()
+    _worker_etl.reset_counters()
+    return counters
+
 
 class ETL:
     def __init__(self, config_params):
@@ -27,77 +104,390 @@ class ETL:
         """
         self.config = config_params
         self.validator = LeadValidator()
+        self.pool = None  # Created on first use, see get_pool()
+        self.email_index = None  # Loaded on first use, see get_email_index()
+        self.manifest = IngestionManifest(self.config["paths"]["manifest"])
+        self.metrics = PipelineMetrics()
+        # Tags this run's rejects; workers inherit the parent's
+        self.run_id = self.config.get("run_id") or uuid.uuid4().hex
 
-        logger.info("Initialized Dependencies")
+        logger.info(f"Initialized Dependencies (run {self.run_id})")
 
         self.total_files = 0
+        self.total_skipped = 0
         self.total_rows = 0
         self.total_errors = 0
+        self.total_updated = 0
+        self.total_duplicates = 0
+
+    def get_pool(self):
+        """
+        Shared connection pool for every CSVLoader / QueryRunner this ETL
+        opens. Created lazily, so a parent that only farms files out to
+        workers doesn't hold idle connections.
+        """
+        if self.pool is None:
+            self.pool = ConnectionPool(
+                self.config["db_config"], **self.config.get("pool", {})
+            )
+        return self.pool
+
+    def get_email_index(self):
+        """
+        Index of every email already stored, plus those loaded since (see
+        EmailIndex). Loaded once, on the first chunk that needs it; None
+        when config "dedup_emails" is off, or when loading with "upsert"
+        (rows for stored emails are updates then, not duplicates).
+
+        Each worker process loads its own index, once for all the files it
+        processes (see _init_worker), so files loaded at the same time by
+        two workers only see each other's rows committed before the index
+        was loaded - ON CONFLICT (email) still catches anything it misses.
+        """
+        if not self.config.get("dedup_emails", False):
+            return None
+        if self.config.get("load_strategy") == "upsert":
+            return None
+
+        if self.email_index is None:
+            with self.metrics.stage("dedup_index") as record, \
+                    self.get_pool().connection() as conn:
+                self.email_index = EmailIndex()
+                record.rows = self.email_index.load(conn)
+        return self.email_index
+
+    def close(self):
+        """Close the connection pool (if one was opened)"""
+        if self.pool is not None:
+            logger.info(f"Pool metrics: {self.pool.get_metrics()}")
+            self.pool.close()
+            self.pool = None
 
     def move_file(self, filepath, destination):
-        filename = os.path.basename(filepath)
         dest_dir = self.config["paths"][destination]  # Use dictionary key access
-        dest_path = os.path.join(dest_dir, filename)
+        self._move_into(filepath, dest_dir)
+        logger.info(f"Moved {os.path.basename(filepath)} to {destination}")
 
-        shutil.move(filepath, dest_path)
-        logger.info(f"Moved {filename} to {destination}")
+    def _move_into(self, filepath, dest_dir):
+        """
+        Move filepath into dest_dir without overwriting anything there.
+
+        Safe with several workers running at once: each worker moves only
+        its own input file, makedirs tolerates a concurrent create, and a
+        name already taken (e.g. the same file archived earlier today)
+        gets a time/pid suffix instead of being replaced.
+        """
+        with self.metrics.stage("file_move"):
+            os.makedirs(dest_dir, exist_ok=True)
+
+            filename = os.path.basename(filepath)
+            dest_path = os.path.join(dest_dir, filename)
+
+            if os.path.exists(dest_path):
+                stem, ext = os.path.splitext(filename)
+                suffix = f"{datetime.now().strftime('%H%M%S%f')}_{os.getpid()}"
+                dest_path = os.path.join(dest_dir, f"{stem}_{suffix}{ext}")
+
+            shutil.move(filepath, dest_path)
+        return dest_path
 
     def process_file(self, filepath):
-        """Split CSV into valid and invalid rows, process separately"""
-        logger.info(f"Splitting and processing {filepath}")
+        """
+        Split CSV into valid and invalid rows, process separately.
 
-        try:
-            # Read the CSV
-            df = pd.read_csv(filepath, dtype=str)
+        The file is streamed in chunks of config "chunk_size" rows; each
+        chunk is validated, loaded and committed before the next one is
+        read, so peak memory depends on the chunk size, not the file size.
 
-            df = df.fillna("")
+        The ingestion manifest makes this resumable and idempotent:
+        - a file whose content was already ingested is skipped unparsed
+        - a file that stopped partway resumes after its last committed chunk
+        - a chunk whose load was rolled back (ChunkLoadError) is never
+          checkpointed: the file is marked failed and moved to failed/,
+          and dropping it in again resumes at that chunk
+
+        Stage timings go to self.metrics; progress (with an ETA) is logged
+        every config "metrics" progress_interval seconds.
+        """
+        logger.info(f"Splitting and processing {filepath}")
 
-            valid_rows = []
-            invalid_rows = []
-
-            # Validate each row
-            for idx, row in df.iterrows():
-                row_dict = row.to_dict()
-                if self.validator.validate_lead(row_dict):
-                    valid_rows.append(row_dict)
-                else:
-                    invalid_rows.append(row_dict)
-
-            # Process valid rows if any exist
-            if valid_rows:
-                valid_filename = f"valid_{os.path.basename(filepath)}"
-                valid_filepath = os.path.join("data/processed", valid_filename)
-
-                # Write valid rows to new CSV
-                pd.DataFrame(valid_rows).to_csv(valid_filepath, index=False)
-
-                # Load valid rows to database
-                with CSVLoader(self.config["db_config"]) as loader:
-                    stats = loader.load_csv(valid_filepath, "leads")
-                    self.total_rows += stats["loaded"]
-                    self.total_errors += stats["failed"]
-
-            # Save invalid rows if any exist
-            if invalid_rows:
-                invalid_filename = f"invalid_{os.path.basename(filepath)}"
-                invalid_filepath = os.path.join("data/failed", invalid_filename)
-                pd.DataFrame(invalid_rows).to_csv(invalid_filepath, index=False)
-
-            # Move original file to archive
-            archive_dir = os.path.join(
-                "data/archive", datetime.now().strftime("%Y%m%d")
+        filename = os.path.basename(filepath)
+        valid_filepath = self._output_path("processed", "valid", filename)
+        invalid_filepath = self._output_path("failed", "invalid", filename)
+        written = set()  # Output files started by this call
+        file_hash = None
+        file_start = time.perf_counter()
+        file_size = os.path.getsize(filepath)
+
+        try:
+            with self.metrics.stage("hash") as record:
+                file_hash = self.manifest.file_hash(filepath)
+                record.bytes = file_size
+
+            if self.manifest.is_complete(file_hash):
+                logger.info(f"Skipping {filename}: already ingested ({file_hash[:12]})")
+                self._archive(filepath)
+                self.total_skipped += 1
+                return
+
+            start_row = self.manifest.resume_offset(file_hash)
+            # An earlier attempt may have committed the chunk after its
+            # last checkpoint (see _process_chunk, replayed)
+            replayed = self.manifest.get(file_hash) is not None
+            self.manifest.start(file_hash, filepath)
+
+            if start_row:
+                logger.info(f"Resuming {filename} after row {start_row}")
+                # Keep the CSV outputs from the earlier, interrupted run
+                written.update(
+                    path
+                    for path in (valid_filepath, invalid_filepath)
+                    if os.path.exists(path)
+                )
+
+            rows_committed = start_row
+            rows_loaded = self.total_rows
+            rows_updated = self.total_updated
+            rows_rejected = 0
+            rows_duplicate = self.total_duplicates
+            progress = ProgressReporter(
+                filename,
+                file_size,
+                interval=self.config.get("metrics", {}).get("progress_interval", 10),
             )
-            os.makedirs(archive_dir, exist_ok=True)
-            shutil.move(filepath, os.path.join(archive_dir, os.path.basename(filepath)))
+
+            with open(filepath, "rb") as f, CSVLoader(
+                self.config["db_config"],
+                strategy=self.config.get("load_strategy", "copy"),
+                page_size=self.config.get("page_size", DEFAULT_PAGE_SIZE),
+                aggregates=self.config.get("aggregates"),
+                history=self.config.get("history"),
+                pool=self.get_pool(),
+                metrics=self.metrics,
+            ) as loader, RejectSink(self.get_pool(), self.run_id, filename) as sink:
+                # closing(): stop the reader before f is closed, even on errors
+                with closing(
+                    self.metrics.timed_iter(
+                        "parse", self._read_chunks(f, start_row, is_parquet(filepath))
+                    )
+                ) as chunks:
+                    for df in chunks:
+                        rows_rejected += self._process_chunk(
+                            df, loader, sink, valid_filepath, invalid_filepath, written,
+                            replayed=replayed,
+                        )
+                        replayed = False
+
+                        # Chunk (and its rejects) committed - checkpoint past it
+                        rows_committed += len(df)
+                        self.manifest.checkpoint(file_hash, rows_committed)
+                        progress.update(f.tell(), rows_committed - start_row)
+
+                # Charge the bytes parsed to the parse stage
+                self.metrics.add("parse", bytes=f.tell(), calls=0)
+
+            self.manifest.complete(file_hash)
+            self._archive(filepath)
 
             self.total_files += 1
+            self.metrics.record_file(
+                filename,
+                rows_read=rows_committed - start_row,
+                rows_loaded=self.total_rows - rows_loaded,
+                rows_updated=self.total_updated - rows_updated,
+                rows_rejected=rows_rejected,
+                rows_duplicate=self.total_duplicates - rows_duplicate,
+                bytes=file_size,
+                seconds=round(time.perf_counter() - file_start, 3),
+            )
 
         except Exception as e:
             logger.error(f"Error splitting {filepath}: {e}")
+            if file_hash and self.manifest.get(file_hash):
+                self.manifest.fail(file_hash, e)
             self.move_file(filepath, "failed")
 
-    def process_all_files(self):
-        """Process all CSV files in input directory"""
+    def _archive(self, filepath):
+        """Move original file to archive"""
+        archive_dir = os.path.join("data/archive", datetime.now().strftime("%Y%m%d"))
+        self._move_into(filepath, archive_dir)
+
+    def _read_chunks(self, source, start_row=0, parquet=False):
+        """
+        Yield the input as DataFrames of at most config "chunk_size" rows.
+
+        Args:
+            source: File path, or a file opened in binary mode (its tell()
+                    then shows how far through the file parsing has got)
+            start_row: Data rows to skip (already committed). The index is
+                shifted so it still counts rows from the top of the file.
+            parquet: Source is Parquet - read only INPUT_COLUMNS from it
+        """
+        chunk_size = self.config.get("chunk_size")
+
+        if parquet:
+            yield from read_parquet_chunks(source, INPUT_COLUMNS, chunk_size, start_row)
+            return
+
+        skiprows = range(1, start_row + 1) if start_row else None
+
+        if not chunk_size:
+            df = pd.read_csv(source, dtype=str, skiprows=skiprows)
+            df.index += start_row
+            yield df
+            return
+
+        with pd.read_csv(
+            source, dtype=str, skiprows=skiprows, chunksize=chunk_size
+        ) as reader:
+            for df in reader:
+                df.index += start_row
+                yield df
+
+    def _process_chunk(
+        self, df, loader, sink, valid_filepath, invalid_filepath, written, replayed=False
+    ):
+        """
+        Validate one chunk, drop emails that are already stored (or seen
+        earlier in the run), load (and commit) the remaining valid rows,
+        then store its rejects in lead_rejects (see RejectSink).
+
+        The load, the rejects and the checkpoint are committed one after
+        the other, so a run that dies in between leaves a chunk loaded but
+        not checkpointed. The resumed run processes it again (replayed):
+        - its loaded rows are found again - by the email index, or by ON
+          CONFLICT with dedup off - and counted as duplicates, but with
+          replayed=True stored emails are not written to lead_rejects as
+          duplicate_email, since they are most likely this file's own rows
+          (repeats within the chunk still are)
+        - its invalid rows are quarantined again if the run died after
+          storing its rejects but before the checkpoint
+
+        Returns:
+            Number of rows rejected by validation
+
+        Raises:
+            ChunkLoadError: the load was rolled back as a whole (nothing
+                            committed), so the chunk must not be checkpointed
+        """
+        with self.metrics.stage("validate") as record:
+            df = df.fillna("")
+
+            # Validate every row at once, then split with two boolean indexings
+            valid_mask, error_codes = self.validator.validate_frame(df)
+            valid_df = df[valid_mask]
+            invalid_df = df[~valid_mask].assign(error_codes=error_codes[~valid_mask])
+            record.rows = len(df)
+
+        # Duplicate emails never reach the database
+        index = self.get_email_index()
+        duplicate_df = valid_df.iloc[:0]
+        if index is not None and not valid_df.empty:
+            with self.metrics.stage("dedup") as record:
+                duplicate_mask = index.duplicates(valid_df["email"])
+                rejected_mask = duplicate_mask
+                if replayed:
+                    # Only repeats within the chunk are certain duplicates
+                    rejected_mask = duplicate_mask & valid_df["email"].duplicated().to_numpy()
+                duplicate_df = valid_df[rejected_mask]
+                valid_df = valid_df[~duplicate_mask]
+                record.rows = len(duplicate_mask)
+            self.total_duplicates += int(duplicate_mask.sum())
+
+        load_errors = []
+
+        # Load valid rows straight from memory (already validated above)
+        if not valid_df.empty:
+            stats = loader.load_dataframe(valid_df, "leads")
+
+            # A whole-load failure has no row number (CSVLoader stats)
+            rolled_back = [error for error in stats["errors"] if error["row"] is None]
+            if rolled_back:
+                raise ChunkLoadError(
+                    f"Load of {len(valid_df)} rows rolled back: {rolled_back[0]['error'][0]}"
+                )
+
+            self.total_rows += stats["loaded"]
+            self.total_updated += stats["updated"]
+            self.total_errors += stats["failed"]
+            # Rows ON CONFLICT skipped anyway (e.g. loaded by another worker)
+            self.total_duplicates += stats["duplicates"]
+            load_errors = stats["errors"]
+
+            if index is not None:
+                self._index_loaded(index, valid_df, load_errors)
+
+            # Optional copy of the valid rows, written after the load
+            if self.config.get("write_processed", False):
+                with self.metrics.stage("write_processed") as record:
+                    self._write_rows(valid_df, valid_filepath, written)
+                    record.rows = len(valid_df)
+
+        # Quarantine invalid rows, duplicates and rows the database refused
+        if not invalid_df.empty or not duplicate_df.empty or load_errors:
+            rejects_df = pd.concat(
+                [invalid_df, duplicate_df.assign(error_codes=DUPLICATE_CODE)]
+            )
+            with self.metrics.stage("write_rejects") as record:
+                record.rows = sink.write_frame(rejects_df, rejects_df["error_codes"])
+                record.rows += sink.write_load_errors(load_errors)
+
+                # Optional file copy of the rejected rows
+                if self.config.get("write_rejects_file", False) and not rejects_df.empty:
+                    self._write_rows(rejects_df, invalid_filepath, written)
+
+        return len(invalid_df)
+
+    def _index_loaded(self, index, valid_df, load_errors):
+        """
+        Add the emails of a loaded chunk to the email index, leaving out
+        rows the database refused.
+        """
+        failed_rows = {error["row"] for error in load_errors}
+        emails = valid_df["email"]
+        if failed_rows:
+            # Row numbers are 1-based file rows, the index counts from 0
+            emails = emails[~(valid_df.index + 1).isin(failed_rows)]
+        index.add(emails)
+
+    def _output_path(self, destination, prefix, filename):
+        """
+        Where prefix ("valid"/"invalid") rows of an input file are written:
+        <prefix>_<file>.csv, or a <prefix>_<file>.parquet dataset directory
+        with config "output_format" = "parquet"
+        """
+        stem = os.path.splitext(filename)[0]
+        suffix = PARQUET_SUFFIX if self.config.get("output_format") == "parquet" else ".csv"
+        return os.path.join(self.config["paths"][destination], f"{prefix}_{stem}{suffix}")
+
+    def _write_rows(self, df, filepath, written):
+        """
+        CSV: start filepath on the first chunk, append (without header) after.
+        Parquet: write the chunk as its own compressed part file.
+        """
+        if is_parquet(filepath):
+            write_parquet_part(
+                df,
+                filepath,
+                compression=self.config.get("parquet_compression", DEFAULT_COMPRESSION),
+            )
+            written.add(filepath)
+            return
+
+        if filepath in written:
+            df.to_csv(filepath, mode="a", header=False, index=False)
+        else:
+            df.to_csv(filepath, index=False)
+            written.add(filepath)
+
+    def process_all_files(self, workers=None):
+        """
+        Process all CSV / Parquet files in input directory
+
+        Args:
+            workers: Number of worker processes (default: config "workers").
+                     1 processes files one after another in this process.
+        """
         logger.info("Starting pipeline execution")
 
         input_dir = self.config["paths"][
@@ -105,56 +495,144 @@ class ETL:
         ]  # Use dictionary key access, not dot notation
         print(f"Looking for files in: {input_dir}")
 
-        csv_files = [f for f in os.listdir(input_dir) if f.endswith(".csv")]
+        input_files = sorted(
+            f for f in os.listdir(input_dir) if f.lower().endswith(INPUT_SUFFIXES)
+        )
+        filepaths = [os.path.join(input_dir, filename) for filename in input_files]
+
+        workers = workers or self.config.get("workers", 1)
 
-        for filename in csv_files:
-            filepath = os.path.join(input_dir, filename)
-            self.process_file(filepath)
+        if workers > 1 and len(filepaths) > 1:
+            self._process_parallel(filepaths, workers)
+        else:
+            for filepath in filepaths:
+                self.process_file(filepath)
 
         logger.info("Pipeline execution complete")
 
-    def generate_reports(self):
-        """Generate all analytics reports"""
-        logger.info("Generating reports")
+    def _process_parallel(self, filepaths, workers):
+        """
+        Process whole files in a pool of worker processes.
 
-        with QueryRunner(self.config["db_config"]) as runner:
-            runner.export_to_csv(
-                "SELECT status, COUNT(*) as count FROM leads GROUP BY status",
-                "reports/daily/leads_by_status.csv",
-            )
+        While one worker parses/validates, another can be loading, so the
+        database and the CPU are both kept busy. Each worker keeps one ETL
+        (pool, email index) for all its files, see _init_worker.
+        """
+        workers = min(workers, len(filepaths))
+        logger.info(f"Processing {len(filepaths)} files with {workers} workers")
+
+        # Workers tag their rejects with this run's id
+        worker_config = {**self.config, "run_id": self.run_id}
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(worker_config,)
+        ) as executor:
+            futures = {
+                executor.submit(_process_file_worker, filepath): filepath
+                for filepath in filepaths
+            }
+
+            for future in as_completed(futures):
+                try:
+                    self.merge_counters(future.result())
+                except Exception as e:
+                    # process_file handles its own errors - this is a crashed worker
+                    logger.error(f"Worker failed on {futures[future]}: {e}")
+
+    def get_counters(self):
+        """Raw counters, in the form merge_counters() accepts"""
+        return {
+            "total_files": self.total_files,
+            "total_skipped": self.total_skipped,
+            "total_rows": self.total_rows,
+            "total_updated": self.total_updated,
+            "total_errors": self.total_errors,
+            "total_duplicates": self.total_duplicates,
+            "metrics": self.metrics.to_dict(),
+        }
 
-            runner.export_to_csv(
-                "SELECT industry, COUNT(*) as count FROM leads GROUP BY industry",
-                "reports/daily/leads_by_industry.csv",
-            )
+    def reset_counters(self):
+        """
+        Zero the counters and stage metrics (a worker's ETL reports each
+        file's counters separately, see _process_file_worker)
+        """
+        self.total_files = 0
+        self.total_skipped = 0
+        self.total_rows = 0
+        self.total_errors = 0
+        self.total_updated = 0
+        self.total_duplicates = 0
+        self.metrics = PipelineMetrics()
+
+    def merge_counters(self, counters):
+        """Add another ETL's counters (e.g. from a worker) to this one"""
+        self.total_files += counters["total_files"]
+        self.total_skipped += counters["total_skipped"]
+        self.total_rows += counters["total_rows"]
+        self.total_updated += counters["total_updated"]
+        self.total_errors += counters["total_errors"]
+        self.total_duplicates += counters["total_duplicates"]
+        if "metrics" in counters:
+            self.metrics.merge(counters["metrics"])
 
-            # Error report (simpler version)
-            runner.export_to_csv(
-                """SELECT
-                    'Total Rows' as metric,
-                    COUNT(*) as value
-                  FROM leads
-                  UNION ALL
-                  SELECT
-                    'Rows by Status' as metric,
-                    COUNT(*) as value
-                  FROM leads
-                  WHERE status IS NOT NULL
-                  UNION ALL
-                  SELECT
-                    'Rows without Industry' as metric,
-                    COUNT(*) as value
-                  FROM leads
-                  WHERE industry IS NULL OR industry = ''""",
-                "reports/errors/data_quality_report.csv",
+    def generate_reports(self):
+        """
+        Generate all analytics reports in one query (see ReportEngine) -
+        over the summary tables when they're maintained, else over leads
+        """
+        logger.info("Generating reports")
+
+        with QueryRunner(
+            self.config["db_config"], pool=self.get_pool(), metrics=self.metrics
+        ) as runner, self.metrics.stage("reports", cursor=runner.cursor) as record:
+            engine = ReportEngine(
+                runner,
+                daily_dir=self.config["paths"]["reports_daily"],
+                errors_dir=self.config["paths"]["reports_errors"],
+                from_aggregates=self.config.get("aggregates", config.AGGREGATES),
+                output_format=self.config.get("output_format", "csv"),
+                compression=self.config.get("parquet_compression", DEFAULT_COMPRESSION),
             )
+            written = engine.generate()
+            written.update(engine.generate_rejects(self.run_id))
+            record.rows = sum(written.values())
 
         logger.info("Reports generated")
 
     def get_summary(self):
         """Return pipeline execution summary"""
         return {
+            "run_id": self.run_id,
             "files_processed": self.total_files,
+            "files_skipped": self.total_skipped,
             "total_rows_loaded": self.total_rows,
+            "total_rows_updated": self.total_updated,
             "total_errors": self.total_errors,
+            "total_duplicates": self.total_duplicates,
+            "stages": self.metrics.to_dict()["stages"],
+        }
+
+    def write_metrics(self):
+        """
+        Write this run's stage metrics as JSON and as a Prometheus
+        textfile (paths from config "metrics"). Returns the paths written.
+        """
+        settings = self.config.get("metrics")
+        if not settings:
+            return []
+
+        summary = {
+            "run_id": self.run_id,
+            "files_processed": self.total_files,
+            "files_skipped": self.total_skipped,
+            "rows_loaded": self.total_rows,
+            "rows_updated": self.total_updated,
+            "errors": self.total_errors,
+            "duplicates": self.total_duplicates,
         }
+        paths = [
+            self.metrics.write_json(settings["json_dir"], summary),
+            self.metrics.write_prometheus(settings["prometheus_file"], summary),
+        ]
+        logger.info(f"Metrics written to {paths}")
+        return paths
@@ -0,0 +1,233 @@
+import re
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+# Per-table data versions (see migrations/007_table_versions.sql)
+VERSIONS_TABLE = "table_versions"
+
+# SQL split into what matters for finding tables: comments, string
+# literals, identifiers, brackets and commas (anything else is one char)
+SQL_TOKEN_PATTERN = re.compile(
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|[A-Za-z_][\w.$]*|\S",
+    re.DOTALL,
+)
+
+# Keywords that end a FROM list (a comma after them isn't another table)
+FROM_LIST_END = {
+    "WHERE", "GROUP", "HAVING", "WINDOW", "ORDER", "LIMIT", "OFFSET", "FETCH",
+    "FOR", "UNION", "INTERSECT", "EXCEPT", "RETURNING", "SELECT",
+}
+
+# Words that can sit between FROM / JOIN / "," and the table name
+TABLE_PREFIXES = {"ONLY", "LATERAL"}
+
+# Only plain reads are cached (leading "--" comment lines are skipped)
+CACHEABLE_PREFIXES = ("SELECT", "WITH")
+LEADING_COMMENTS_PATTERN = re.compile(r"\A(?:\s*--[^\n]*)*\s*")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 300
+
+
+def referenced_tables(sql):
+    """
+    Sorted table names read by sql (schema "public." dropped).
+
+    Every item of a FROM list counts (FROM leads l, industry_summary s),
+    as does every JOIN target, at any subquery depth. Over-matching is
+    harmless (a CTE or function name just stays at version 0).
+    """
+    names = set()
+    # One frame per bracket depth: [inside a FROM list, next name is a table]
+    frames = [[False, False]]
+
+    for token in SQL_TOKEN_PATTERN.findall(sql):
+        frame = frames[-1]
+        word = token.upper()
+
+        if token.startswith(("--", "/*", "'")):
+            continue
+        if token in ("(", "["):
+            frame[1] = False  # a subquery / function call stands in for a table
+            frames.append([False, False])
+        elif token in (")", "]"):
+            if len(frames) > 1:
+                frames.pop()
+        elif word in ("FROM", "JOIN"):
+            frame[0] = frame[1] = True
+        elif word in FROM_LIST_END:
+            frame[0] = frame[1] = False
+        elif token == ",":
+            frame[1] = frame[0]
+        elif frame[1] and word not in TABLE_PREFIXES:
+            if token[0].isalpha() or token[0] in '_"':
+                names.add(token.replace('"', "").lower().removeprefix("public."))
+            frame[1] = False
+
+    return sorted(names)
+
+
+def is_cacheable(sql):
+    start = LEADING_COMMENTS_PATTERN.match(sql).end()
+    return sql[start:].upper().startswith(CACHEABLE_PREFIXES)
+
+
+def bump_versions(cursor, tables):
+    """
+    Increment the data version of tables, in the caller's transaction
+    (call right before commit, so readers never see new data with an old
+    version). Tables are sorted so concurrent writers lock version rows
+    in the same order.
+    """
+    tables = sorted(set(tables))
+    if not tables:
+        return
+
+    cursor.execute(
+        f"""
+        INSERT INTO {VERSIONS_TABLE} (table_name, version)
+        SELECT unnest(%s::text[]), 1
+        ON CONFLICT (table_name) DO UPDATE
+        SET version = {VERSIONS_TABLE}.version + 1, updated_at = CURRENT_TIMESTAMP
+        """,
+        (tables,),
+    )
+
+
+def fetch_versions(cursor, tables):
+    """{table: version} for tables (0 for tables never bumped)"""
+    if not tables:
+        return {}
+
+    cursor.execute(
+        f"SELECT table_name, version FROM {VERSIONS_TABLE} WHERE table_name = ANY(%s)",
+        (list(tables),),
+    )
+    versions = dict.fromkeys(tables, 0)
+    versions.update(cursor.fetchall())
+    return versions
+
+
+def _freeze(value):
+    """Hashable form of query params (lists -> tuples, dicts -> sorted items)"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _result_size(rows):
+    """Approximate bytes held by a list of row dicts (column names are shared)"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+    return size
+
+
+class QueryCache:
+    """
+    LRU cache of query results for QueryRunner.run_query.
+
+    - keyed by SQL text + params
+    - each entry remembers the data versions of the tables it read; a
+      lookup with newer versions (something was loaded since) drops it
+    - entries also expire after ttl_seconds (covers tables nobody bumps)
+    - least recently used entries are evicted to stay under max_bytes
+
+    One cache can be shared by many QueryRunners (and threads).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # key -> (rows, versions, expires_at, size)
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0  # dropped: data version changed
+        self.expirations = 0  # dropped: TTL ran out
+        self.evictions = 0  # dropped: over the memory budget
+
+    @staticmethod
+    def key(sql, params=None):
+        """Cache key, or None if params can't be hashed (not cached)"""
+        key = (sql, _freeze(params))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key, versions):
+        """
+        Cached rows for key if they were computed at these table versions
+        and haven't expired, else None (counted as a miss).
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                rows, entry_versions, expires_at, size = entry
+                if entry_versions != versions:
+                    self._drop(key)
+                    self.invalidations += 1
+                elif time.monotonic() >= expires_at:
+                    self._drop(key)
+                    self.expirations += 1
+                else:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return rows
+
+            self.misses += 1
+            return None
+
+    def put(self, key, rows, versions):
+        """Store rows computed at versions (skipped if bigger than the budget)"""
+        size = _result_size(rows)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self.entries:
+                self._drop(key)
+
+            self.entries[key] = (rows, versions, time.monotonic() + self.ttl_seconds, size)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def _drop(self, key):
+        self.bytes -= self.entries.pop(key)[3]
+
+    def get_metrics(self):
+        """Snapshot of cache usage (like ConnectionPool.get_metrics)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
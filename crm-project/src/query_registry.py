@@ -0,0 +1,185 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+import weakref
+
+
+logger = logging.getLogger(__name__)
+
+# Named-query file the runners read by default (see archive/queries.sql)
+DEFAULT_QUERY_FILE = os.path.join("archive", "queries.sql")
+
+# Line that starts a named query; the name is the rest of the line
+QUERY_MARKER = "-- @query:"
+
+# psycopg2 placeholders, rewritten as $1, $2, ... for PREPARE. Same rules
+# as psycopg2 itself: with parameters, %s / %(name)s anywhere are
+# placeholders and %% is a literal %; without any, the text is left alone.
+PLACEHOLDER_PATTERN = re.compile(
+    r"%\((?P<name>\w+)\)s|(?P<positional>%s)|(?P<percent>%%)"
+)
+
+
+class NamedQuery:
+    """
+    One query from a -- @query: file.
+
+    sql is the text as written (psycopg2 %s / %(name)s placeholders), for
+    run_query / export_to_csv. statement_sql is the same query with $1,
+    $2, ... for PREPARE. The statement name is derived from the text, so
+    an edited query is prepared again under a new name.
+    """
+
+    def __init__(self, name, sql):
+        self.name = name
+        self.sql = sql
+        self.param_names = []  # %(name)s names in $n order, or [] if positional
+        self.param_count = 0
+        if re.search(r"%(?:\(\w+\))?s", sql):
+            self.statement_sql = PLACEHOLDER_PATTERN.sub(self._number, sql)
+        else:
+            self.statement_sql = sql
+        digest = hashlib.sha1(self.statement_sql.encode()).hexdigest()[:16]
+        self.statement_name = f"crm_q_{digest}"
+
+    def _number(self, match):
+        if match.group("percent"):
+            return "%"
+
+        name = match.group("name")
+        if name is None:
+            self.param_count += 1
+            return f"${self.param_count}"
+
+        # Named: the same name reuses its number
+        if name not in self.param_names:
+            self.param_names.append(name)
+        self.param_count = len(self.param_names)
+        return f"${self.param_names.index(name) + 1}"
+
+    @property
+    def execute_sql(self):
+        """EXECUTE statement for cursor.execute() (params bound client-side)"""
+        if not self.param_count:
+            return f"EXECUTE {self.statement_name}"
+        return f"EXECUTE {self.statement_name} ({', '.join(['%s'] * self.param_count)})"
+
+    def bind(self, params):
+        """params (tuple, or dict for %(name)s queries) in $n order"""
+        params = params or ()
+        if self.param_names:
+            return tuple(params[name] for name in self.param_names)
+
+        if len(params) != self.param_count:
+            raise ValueError(
+                f"Query '{self.name}' takes {self.param_count} parameters, "
+                f"got {len(params)}"
+            )
+        return tuple(params)
+
+
+def parse_queries(sql_text):
+    """
+    Split a SQL file of named queries.
+
+    Expected format:
+    -- @query: query_name
+    SELECT ...
+
+    Returns:
+        dict[str, str] -> {query_name: sql} (trailing ";" removed - the
+        text is embedded in PREPARE / COPY)
+    """
+    queries = {}
+    current_name = None
+    buffer = []
+
+    for line in sql_text.splitlines():
+        line = line.rstrip()
+
+        if line.startswith(QUERY_MARKER):
+            if current_name:
+                queries[current_name] = _finish(buffer)
+            current_name = line[len(QUERY_MARKER):].strip()
+            buffer = []
+        else:
+            buffer.append(line)
+
+    if current_name:
+        queries[current_name] = _finish(buffer)
+
+    return queries
+
+
+def _finish(lines):
+    return "\n".join(lines).strip().rstrip(";").rstrip()
+
+
+class QueryRegistry:
+    """
+    Named queries from -- @query: files, parsed once per file version.
+
+    A file is re-read only when its mtime or size changes. The registry
+    also remembers which statements are PREPAREd on which connection
+    (prepared statements live as long as the session, so a pooled
+    connection keeps them across checkouts).
+
+    Thread-safe; one registry is normally shared by every QueryRunner
+    (REGISTRY).
+    """
+
+    def __init__(self):
+        self._files = {}  # path -> (mtime_ns, size, {name: NamedQuery})
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> {statement}
+        self._lock = threading.Lock()
+
+    def load(self, filepath):
+        """
+        All queries of filepath as {name: NamedQuery}.
+
+        Raises:
+            FileNotFoundError: filepath doesn't exist
+        """
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
+
+        with open(path, "r") as f:
+            queries = {
+                name: NamedQuery(name, sql) for name, sql in parse_queries(f.read()).items()
+            }
+
+        with self._lock:
+            self._files[path] = (stat.st_mtime_ns, stat.st_size, queries)
+
+        logger.info(f"Parsed {len(queries)} named queries from {filepath}")
+        return queries
+
+    def get(self, filepath, name):
+        """
+        One named query.
+
+        Raises:
+            KeyError: no query called name in filepath
+        """
+        queries = self.load(filepath)
+        if name not in queries:
+            raise KeyError(
+                f"No query '{name}' in {filepath} (available: {', '.join(queries)})"
+            )
+        return queries[name]
+
+    def prepared_on(self, conn):
+        """Set of statement names already PREPAREd on conn (mutable)"""
+        with self._lock:
+            return self._prepared.setdefault(conn, set())
+
+
+# Shared by QueryRunners that aren't given their own
+REGISTRY = QueryRegistry()
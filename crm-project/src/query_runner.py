@@ -1,6 +1,33 @@
 # File: query_runner.py
+import os
 import psycopg2
 import csv
+import uuid
+import logging
+
+from src.metrics import CountingCursor, PipelineMetrics
+from src.parquet_io import DEFAULT_COMPRESSION, ParquetStreamWriter, is_parquet
+from src.query_cache import fetch_versions, is_cacheable, referenced_tables
+from src.query_registry import DEFAULT_QUERY_FILE, REGISTRY
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rows per round-trip when streaming through a server-side cursor
+EXPORT_FETCH_SIZE = 10_000
+
+
+class _CountingWriter:
+    """Binary file wrapper that counts write() calls (one per COPY row)"""
+
+    def __init__(self, f):
+        self._file = f
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return self._file.write(data)
 
 
 class QueryRunner:
@@ -11,12 +38,35 @@ class QueryRunner:
     This class handles database interaction, your app uses the results.
     """
 
-    def __init__(self, db_config):
+    def __init__(
+        self,
+        db_config,
+        pool=None,
+        metrics=None,
+        cache=None,
+        registry=None,
+        query_file=DEFAULT_QUERY_FILE,
+    ):
         """
         Initialize with database configuration.
         Don't connect yet - connection will be made in __enter__
+
+        Args:
+            db_config: Dictionary with connection parameters
+            pool: Optional ConnectionPool to borrow the connection from
+            metrics: Optional PipelineMetrics to record "query" / "export" in
+            cache: Optional QueryCache for run_query results (can be shared
+                   by many runners)
+            registry: QueryRegistry for named queries (default: the shared
+                      REGISTRY, so every runner reuses its parsed files)
+            query_file: File run_named / export_named read queries from
         """
         self.db_config = db_config  # Store config
+        self.pool = pool
+        self.metrics = metrics or PipelineMetrics()
+        self.cache = cache
+        self.registry = registry or REGISTRY
+        self.query_file = query_file
         self.conn = None  # Will be set in __enter__
         self.cursor = None  # Will be set in __enter__
         print("QueryRunner initialized (connection not yet established)")
@@ -27,8 +77,11 @@ class QueryRunner:
         Called when using 'with QueryRunner()'
         """
         print("QueryRunner: Establishing connection...")
-        self.conn = psycopg2.connect(**self.db_config)
-        self.cursor = self.conn.cursor()
+        if self.pool:
+            self.conn = self.pool.getconn()
+        else:
+            self.conn = psycopg2.connect(**self.db_config)
+        self.cursor = self.conn.cursor(cursor_factory=CountingCursor)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -58,21 +111,54 @@ class QueryRunner:
         - More readable: row['company_name'] vs row[0]
         - Self-documenting: know what each value represents
         - Resilient: column order changes don't break code
+
+        With a cache, a SELECT is answered from it when the tables it reads
+        haven't changed since (one small table_versions lookup instead of
+        the query itself). Callers get their own copy of the rows.
+        """
+        return self._cached(sql, params, lambda: self._run_query(sql, params))
+
+    def _cached(self, sql, params, run):
         """
+        Result of run() through the cache (if any): sql / params identify
+        the result and name the tables it depends on.
+        """
+        key = self.cache.key(sql, params) if self.cache and is_cacheable(sql) else None
+        if key is None:
+            return run()
+
+        versions = fetch_versions(self.cursor, referenced_tables(sql))
+        results = self.cache.get(key, versions)
+        if results is None:
+            # Versions were read first: a load committed meanwhile only
+            # makes this entry look older than it is (never newer)
+            results = run()
+            self.cache.put(key, results, versions)
+
+        return [dict(row) for row in results]
+
+    def _run_query(self, sql, params=None):
+        """Execute sql on the database and return the rows as dicts"""
         # Execute query with optional parameters
         # Using params prevents SQL injection attacks:
         #   SAFE:   cursor.execute("WHERE id = %s", (user_input,))
         #   UNSAFE: cursor.execute(f"WHERE id = {user_input}")
-        self.cursor.execute(sql, params)
+        with self.metrics.stage("query", cursor=self.cursor) as record:
+            self.cursor.execute(sql, params)
+            rows = self.cursor.fetchall()
+            record.rows = len(rows)
+
+        return self._as_dicts(rows)
 
+    def _as_dicts(self, rows):
+        """Rows just fetched from self.cursor, as dicts"""
         # cursor.description is metadata about result columns
         # It's a tuple of tuples: ((name, type, size, ...), ...)
         # We only need the first element (name) from each tuple
         # List comprehension: [desc[0] for desc in self.cursor.description]
         columns = [desc[0] for desc in self.cursor.description]
 
-        # Fetch all rows as tuples: [(val1, val2, ...), ...]
-        rows = self.cursor.fetchall()
+        # Rows were fetched above as tuples: [(val1, val2, ...), ...]
 
         # Transform tuples to dictionaries using zip
         # zip(columns, row) pairs each column name with its value
@@ -82,7 +168,7 @@ class QueryRunner:
 
         return results
 
-    def run_query_from_file(self, filepath, query_name):
+    def run_query_from_file(self, filepath, query_name, params=None):
         """
         Read SQL file, find named query, execute it.
 
@@ -92,18 +178,82 @@ class QueryRunner:
 
         -- @query: another_query
         SELECT ...
+
+        The file is parsed once (and again only when it changes, see
+        QueryRegistry), and the query is PREPAREd once per connection:
+        running it again skips both parsing and planning on the server.
+
+        Args:
+            params: Tuple for %s placeholders, dict for %(name)s ones
+
+        Returns:
+            List of dicts, like run_query()
         """
-        # TODO: Read file, parse queries, find the one matching query_name, run it
-        pass
+        query = self.registry.get(filepath, query_name)
+        return self._cached(
+            query.sql, params, lambda: self._run_prepared(query, params)
+        )
+
+    def run_named(self, name, params=None):
+        """run_query_from_file() on this runner's query_file"""
+        return self.run_query_from_file(self.query_file, name, params)
 
-    def export_to_csv(self, sql, output_file, params=None):
+    def export_named(self, name, output_file, params=None):
         """
-        Run query and export results to CSV file.
+        Export a named query from query_file to CSV (or Parquet, by the
+        output_file extension).
+
+        Exports stream through COPY / a server-side cursor, which can't
+        run a prepared statement - so the parsed text is used (the file
+        is still only read once).
+
+        Returns:
+            Number of rows exported
+        """
+        query = self.registry.get(self.query_file, name)
+        if is_parquet(output_file):
+            return self.export_to_parquet(query.sql, output_file, params)
+        return self.export_to_csv(query.sql, output_file, params)
+
+    def _run_prepared(self, query, params=None):
+        """EXECUTE query's prepared statement (PREPAREd on first use)"""
+        values = query.bind(params) or None
+        prepared = self.registry.prepared_on(self.conn)
+
+        with self.metrics.stage("query", cursor=self.cursor) as record:
+            try:
+                self._prepare(query, prepared)
+                self.cursor.execute(query.execute_sql, values)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # Statement gone (e.g. DISCARD ALL on the session) - redo it
+                self.conn.rollback()
+                prepared.discard(query.statement_name)
+                self._prepare(query, prepared)
+                self.cursor.execute(query.execute_sql, values)
+
+            rows = self.cursor.fetchall()
+            record.rows = len(rows)
+
+        return self._as_dicts(rows)
+
+    def _prepare(self, query, prepared):
+        if query.statement_name in prepared:
+            return
+
+        self.cursor.execute(f"PREPARE {query.statement_name} AS {query.statement_sql}")
+        prepared.add(query.statement_name)
+        logger.info(f"Prepared '{query.name}' as {query.statement_name}")
+
+    def export_to_csv(self, sql, output_file, params=None, transform=None):
+        """
+        Run query and stream the results to a CSV file.
 
         Args:
             sql: SQL query to execute
             output_file: Path to output CSV file
             params: Optional query parameters
+            transform: Optional function applied to each row dict before
+                       writing (return None to drop the row)
 
         Returns:
             Number of rows exported
@@ -112,36 +262,130 @@ class QueryRunner:
         - Handles file I/O (different concern than querying)
         - Can add formatting/encoding logic here
         - Easier to test independently
+
+        Nothing is collected in Python memory:
+        - no transform: COPY (query) TO STDOUT - the server formats the CSV
+          and we write it straight to disk
+        - transform: named (server-side) cursor, fetched in batches
         """
-        # Get results as dictionaries
-        results = self.run_query(sql, params)
+        with self.metrics.stage("export", cursor=self.cursor) as record:
+            if transform is None:
+                count = self._copy_to_csv(sql, output_file, params)
+            else:
+                count = self._stream_to_csv(sql, output_file, params, transform, record)
+            record.rows = count
+            record.bytes = os.path.getsize(output_file)
+
+        print(f"Exported {count} rows to {output_file}")
+        return count
+
+    def export_to_parquet(
+        self, sql, output_file, params=None, compression=DEFAULT_COMPRESSION
+    ):
+        """
+        Run query and stream the results to a compressed Parquet file.
+
+        Typed and columnar, so downstream jobs read only the columns (and
+        row groups) they need instead of re-parsing CSV. Fetched through a
+        named cursor, one EXPORT_FETCH_SIZE batch (= one row group) at a
+        time. Needs pyarrow.
+
+        Returns:
+            Number of rows exported
+        """
+        count = 0
+
+        with self.metrics.stage("export", cursor=self.cursor) as record:
+            with self.conn.cursor(
+                name=f"export_{uuid.uuid4().hex}", cursor_factory=CountingCursor
+            ) as cursor:
+                cursor.itersize = EXPORT_FETCH_SIZE
+                cursor.execute(sql, params)
+
+                # Named cursors only fill description after a fetch; the
+                # file's schema comes from it, before any batch is written
+                rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                writer = ParquetStreamWriter(
+                    output_file, cursor.description, compression=compression
+                )
+                try:
+                    while rows:
+                        writer.write(rows)
+                        count += len(rows)
+                        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                finally:
+                    writer.close()
+
+                record.round_trips += cursor.round_trips
+
+            record.rows = count
+            record.bytes = os.path.getsize(output_file)
+
+        print(f"Exported {count} rows to {output_file}")
+        return count
+
+    def _copy_to_csv(self, sql, output_file, params=None):
+        """Export with COPY ... TO STDOUT WITH CSV HEADER"""
+        # COPY can't take %s parameters, so bind them client-side first
+        # (mogrify quotes values exactly like execute() would)
+        query = self.cursor.mogrify(sql, params).decode().strip().rstrip(";")
+
+        with open(output_file, "wb") as f:
+            counting_file = _CountingWriter(f)
+            self.cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH CSV HEADER", counting_file
+            )
+
+        # psycopg2 writes COPY output one row per write(); first is the header
+        return max(counting_file.writes - 1, 0)
+
+    def _stream_to_csv(self, sql, output_file, params, transform, stage):
+        """
+        Export through a server-side cursor, EXPORT_FETCH_SIZE rows at a time
+        (its round-trips are charged to the export stage record)
+        """
+        count = 0
+
+        # A named cursor keeps the result set on the server; fetchmany()
+        # pulls it over in batches instead of all at once
+        with self.conn.cursor(
+            name=f"export_{uuid.uuid4().hex}", cursor_factory=CountingCursor
+        ) as cursor:
+            cursor.itersize = EXPORT_FETCH_SIZE
+            cursor.execute(sql, params)
+
+            with open(output_file, "w", newline="") as f:
+                writer = None
+
+                while True:
+                    rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+                    if not rows:
+                        break
+
+                    # Named cursors only fill description after a fetch
+                    columns = [desc[0] for desc in cursor.description]
 
-        # Handle empty results gracefully
-        if not results:
-            print(f"No results to export to {output_file}")
-            return 0
+                    for row in rows:
+                        record = transform(dict(zip(columns, row)))
+                        if record is None:
+                            continue
 
-        # Open file in write mode
-        # newline='' prevents extra blank lines on Windows
-        with open(output_file, "w", newline="") as f:
-            # Get column names from first result dictionary
-            # .keys() returns all keys (column names)
-            # list() converts to list for DictWriter
-            fieldnames = list(results[0].keys())
+                        if writer is None:
+                            writer = csv.DictWriter(f, fieldnames=list(record.keys()))
+                            writer.writeheader()
 
-            # DictWriter writes dictionaries to CSV
-            # It knows to match dict keys to CSV columns
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+                        writer.writerow(record)
+                        count += 1
 
-            # Write header row (column names)
-            writer.writeheader()
+                # Nothing written (empty result, or every row dropped by
+                # transform): still write the header, from the query's
+                # columns, so the file has the same shape as COPY's
+                if writer is None and cursor.description:
+                    csv.writer(f).writerow(desc[0] for desc in cursor.description)
 
-            # Write all data rows
-            # writerows() takes list of dicts, writes each as row
-            writer.writerows(results)
+            stage.round_trips += cursor.round_trips
 
-        print(f"Exported {len(results)} rows to {output_file}")
-        return len(results)
+        return count
 
     def get_summary_stats(self, table_name):
         """
@@ -176,7 +420,16 @@ class QueryRunner:
 
         Always call this when done! Prevents resource leaks.
         Alternative: use context manager (we'll learn later).
+        Pooled connections are returned to the pool instead of closed.
         """
-        self.cursor.close()
-        self.conn.close()
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+
+        if self.conn:
+            if self.pool:
+                self.pool.putconn(self.conn)
+            else:
+                self.conn.close()
+            self.conn = None
         print("Connection closed")
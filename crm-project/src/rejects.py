@@ -0,0 +1,138 @@
+import io
+import csv
+import json
+import logging
+
+from src.data_loader import COPY_BUFFER_SIZE, COPY_NULL, IteratorReader
+from src.query_cache import bump_versions
+
+
+logger = logging.getLogger(__name__)
+
+# Quarantine table (see migrations/004_lead_rejects.sql)
+REJECTS_TABLE = "lead_rejects"
+
+REJECT_COLUMNS = ("run_id", "source_file", "row_num", "raw_row", "error_codes")
+
+# Code recorded for rows the database refused (constraint violations etc.)
+DB_ERROR_CODE = "db_error"
+
+
+class RejectSink:
+    """
+    Writes rejected rows to lead_rejects with COPY.
+
+    One sink per input file. Each write_*() call is a single COPY plus a
+    commit on the sink's own (pooled) connection, so rejects of a chunk
+    are stored before the chunk is checkpointed in the manifest.
+    """
+
+    def __init__(self, pool, run_id, source_file):
+        """
+        Args:
+            pool: ConnectionPool to borrow a connection from
+            run_id: Pipeline run the rejects belong to
+            source_file: Input file name recorded with every reject
+        """
+        self.pool = pool
+        self.run_id = run_id
+        self.source_file = source_file
+        self.conn = None
+        self.written = 0
+
+    def __enter__(self):
+        self.conn = self.pool.getconn()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def write_frame(self, df, error_codes):
+        """
+        Store the invalid rows of a validated chunk.
+
+        Args:
+            df: DataFrame of invalid rows (index = file row - 1, as in
+                CSVLoader.load_dataframe)
+            error_codes: ";"-joined error codes per row (validate_frame)
+
+        Returns:
+            Rows written
+        """
+        columns = [column for column in df.columns if column != "error_codes"]
+        records = (
+            (int(idx) + 1, dict(zip(columns, values)), codes.split(";"))
+            for idx, values, codes in zip(
+                df.index, df[columns].itertuples(index=False), error_codes
+            )
+        )
+        return self._copy(records)
+
+    def write_load_errors(self, errors):
+        """
+        Store rows the database refused, from CSVLoader stats["errors"].
+
+        A merge the database refused is bisected by the loader, so these
+        are single rows. Entries without a row (the whole load was rolled
+        back) are skipped - ETL fails the file on those instead of
+        checkpointing the chunk (see ChunkLoadError).
+        """
+        records = (
+            (error["row"], error["data"], [DB_ERROR_CODE])
+            for error in errors
+            if error["row"] is not None
+        )
+        return self._copy(records)
+
+    def _copy(self, records):
+        """COPY (row_num, raw row dict, [codes]) records, then commit"""
+        counter = {"rows": 0}
+
+        with self.conn.cursor() as cursor:
+            cursor.copy_expert(
+                f"""
+                COPY {REJECTS_TABLE} ({", ".join(REJECT_COLUMNS)})
+                FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')
+                """,
+                IteratorReader(self._copy_lines(records, counter)),
+                size=COPY_BUFFER_SIZE,
+            )
+            if counter["rows"]:
+                bump_versions(cursor, [REJECTS_TABLE])
+        self.conn.commit()
+
+        self.written += counter["rows"]
+        return counter["rows"]
+
+    def _copy_lines(self, records, counter):
+        """Encode records as CSV text for COPY, in ~64KB chunks"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        for row_num, raw_row, codes in records:
+            writer.writerow(
+                [
+                    self.run_id,
+                    self.source_file,
+                    COPY_NULL if row_num is None else row_num,
+                    json.dumps(raw_row, default=str),
+                    "{" + ",".join(codes) + "}",
+                ]
+            )
+            counter["rows"] += 1
+
+            if buffer.tell() >= COPY_BUFFER_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self.conn:
+            self.conn.rollback()  # nothing half-written stays open
+            self.pool.putconn(self.conn)
+            self.conn = None
+            logger.info(f"{self.written} rejects from {self.source_file} stored")
@@ -0,0 +1,207 @@
+import os
+import csv
+import logging
+
+import pandas as pd
+
+from src.parquet_io import (
+    DEFAULT_COMPRESSION,
+    PARQUET_SUFFIX,
+    is_parquet,
+    require_pyarrow,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Breakdowns: column to group leads by -> report file name
+REPORT_BREAKDOWNS = {
+    "status": "leads_by_status.csv",
+    "industry": "leads_by_industry.csv",
+}
+
+# Data quality metrics: (metric name, row filter or None for all rows)
+QUALITY_METRICS = [
+    ("Total Rows", None),
+    ("Rows by Status", "status IS NOT NULL"),
+    ("Rows without Industry", "industry IS NULL OR industry = ''"),
+]
+
+# Summary table maintained by the loader (see
+# migrations/002_summary_tables.sql). It has one row per (status, industry)
+# with a lead_count, so every default report can be answered from it
+# without touching leads.
+SUMMARY_TABLE = "lead_counts_by_status_industry"
+
+# Reject reasons of one run, from the quarantine table (run_id is indexed)
+REJECTS_BY_CODE_SQL = """
+    SELECT code AS error_code, COUNT(*) AS row_count
+    FROM lead_rejects, unnest(error_codes) AS code
+    WHERE run_id = %s
+    GROUP BY code
+    ORDER BY row_count DESC, code
+"""
+
+
+class ReportEngine:
+    """
+    Computes every report from ONE scan of the leads table.
+
+    Instead of one GROUP BY query per report (plus a UNION ALL that scans
+    the table once per metric), a single GROUPING SETS query returns:
+      - one row per value of each breakdown column
+      - one grand-total row carrying all the FILTER'ed quality metrics
+    The result is tiny (O(groups)), and is fanned out to the CSV files here.
+    Adding a breakdown adds a grouping set, not another table scan.
+
+    With from_aggregates=True the same query runs over the loader-maintained
+    summary table (summing lead_count), so it reads O(groups) rows
+    instead of O(leads).
+    """
+
+    def __init__(
+        self,
+        runner,
+        daily_dir,
+        errors_dir,
+        breakdowns=None,
+        metrics=None,
+        table_name="leads",
+        from_aggregates=False,
+        output_format="csv",
+        compression=DEFAULT_COMPRESSION,
+    ):
+        """
+        Args:
+            runner: Open QueryRunner
+            daily_dir: Directory for breakdown reports
+            errors_dir: Directory for the data quality report
+            breakdowns: {column: filename}, defaults to REPORT_BREAKDOWNS
+            metrics: [(name, filter SQL)], defaults to QUALITY_METRICS
+            table_name: Table to report on
+            from_aggregates: Read SUMMARY_TABLE instead (breakdowns must be
+                             status and/or industry)
+            output_format: "csv" or "parquet" (same file names, .parquet)
+            compression: Parquet codec (config.PARQUET_COMPRESSION)
+        """
+        self.runner = runner
+        self.daily_dir = daily_dir
+        self.errors_dir = errors_dir
+        self.breakdowns = breakdowns or REPORT_BREAKDOWNS
+        self.metrics = metrics or QUALITY_METRICS
+        self.table_name = SUMMARY_TABLE if from_aggregates else table_name
+        # How to count leads in a group: rows, or pre-aggregated counts
+        self.count_expr = "SUM(lead_count)" if from_aggregates else "COUNT(*)"
+        self.output_format = output_format
+        self.compression = compression
+
+    def build_query(self):
+        """
+        One aggregate query for all breakdowns and metrics.
+
+        GROUPING(a, b, ...) returns a bitmask with a 1 for every column
+        NOT grouped in that row - it tells us which grouping set a result
+        row belongs to (grand total = all bits set).
+        """
+        columns = list(self.breakdowns)
+        grouping_sets = ", ".join(f"({column})" for column in columns)
+        metric_sql = ",\n                ".join(
+            f"{self._count(condition)} AS metric_{i}"
+            for i, (_, condition) in enumerate(self.metrics)
+        )
+
+        return f"""
+            SELECT
+                {", ".join(columns)},
+                GROUPING({", ".join(columns)}) AS grouping_id,
+                {self._count()} AS count,
+                {metric_sql}
+            FROM {self.table_name}
+            GROUP BY GROUPING SETS ({grouping_sets}, ())
+        """
+
+    def _count(self, condition=None):
+        """Count expression, optionally FILTERed to rows matching condition"""
+        expr = self.count_expr
+        if condition:
+            expr = f"{expr} FILTER (WHERE {condition})"
+        return f"COALESCE({expr}, 0)::bigint"
+
+    def generate(self):
+        """
+        Run the single-scan query and write every report.
+
+        Returns:
+            dict: {output file: rows written}
+        """
+        rows = self.runner.run_query(self.build_query())
+
+        columns = list(self.breakdowns)
+        all_bits = (1 << len(columns)) - 1
+        written = {}
+
+        # Rows of breakdown i have every bit set except column i's
+        for i, column in enumerate(columns):
+            set_id = all_bits & ~(1 << (len(columns) - 1 - i))
+            output_file = self._report_path(self.daily_dir, self.breakdowns[column])
+            written[output_file] = self._write_report(
+                output_file,
+                [column, "count"],
+                [(row[column], row["count"]) for row in rows if row["grouping_id"] == set_id],
+            )
+
+        total = next((row for row in rows if row["grouping_id"] == all_bits), None)
+        output_file = self._report_path(self.errors_dir, "data_quality_report.csv")
+        written[output_file] = self._write_report(
+            output_file,
+            ["metric", "value"],
+            [
+                (name, total[f"metric_{i}"] if total else 0)
+                for i, (name, _) in enumerate(self.metrics)
+            ],
+        )
+
+        logger.info(f"Reports written from one scan: {written}")
+        return written
+
+    def generate_rejects(self, run_id):
+        """
+        Write rejected rows per error code for one run.
+
+        Returns:
+            dict: {output file: rows written}
+        """
+        rows = self.runner.run_query(REJECTS_BY_CODE_SQL, (run_id,))
+
+        output_file = self._report_path(self.errors_dir, "rejects_by_error_code.csv")
+        count = self._write_report(
+            output_file,
+            ["error_code", "row_count"],
+            [(row["error_code"], row["row_count"]) for row in rows],
+        )
+        return {output_file: count}
+
+    def _report_path(self, directory, filename):
+        """Report file path, with a .parquet extension in parquet mode"""
+        if self.output_format == "parquet":
+            filename = os.path.splitext(filename)[0] + PARQUET_SUFFIX
+        return os.path.join(directory, filename)
+
+    def _write_report(self, output_file, header, rows):
+        """Write one report as CSV, or as compressed Parquet (by extension)"""
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+
+        if is_parquet(output_file):
+            require_pyarrow()
+            pd.DataFrame(list(rows), columns=header).to_parquet(
+                output_file, engine="pyarrow", compression=self.compression, index=False
+            )
+        else:
+            with open(output_file, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+        print(f"Exported {len(rows)} rows to {output_file}")
+        return len(rows)
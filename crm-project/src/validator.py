@@ -1,5 +1,187 @@
 import re
 import config
+import pandas as pd
+
+
+# Shared by the per-row and the DataFrame validation paths. Classes are
+# spelled out in ASCII: to Python's re \d and \s are Unicode-aware (full-width
+# digits, NBSP), to the pyarrow (RE2) path they are not
+ASCII_WHITESPACE = r" \t\r\n\f\v"
+COMPANY_NAME_PATTERN = rf'^[a-zA-Z0-9{ASCII_WHITESPACE}\-\&.,\'"]+$'
+EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+PHONE_NUM_PATTERN = rf"^\(?[0-9]{{3}}\)?[-{ASCII_WHITESPACE}]?[0-9]{{3}}[-{ASCII_WHITESPACE}]?[0-9]{{4}}$"
+
+# Declarative rule spec - one dict per rule, checked in order.
+#
+# Keys:
+#   field     - lead field the rule applies to
+#   kind      - required | min_length | max_length | pattern | allowed |
+#               prefix | contains | required_when (cross-field)
+#   value / pattern / allowed / prefixes / when_field + when_value
+#             - the kind's parameter
+#   code      - short error code (stored per failing row)
+#   message   - human readable text, built only when asked for
+#               ("{allowed}" expands to the allowed values)
+#   severity  - "error" (default, row is invalid) or "warning"
+#   stop      - skip the field's remaining rules when this one fails
+#
+# Fields are optional unless they have a "required" rule: an empty value
+# skips every other rule for that field (required_when rules excepted).
+LEAD_RULES = [
+    {"field": "company_name", "kind": "required", "code": "company_required",
+     "message": "Company name is required"},
+    {"field": "company_name", "kind": "min_length", "value": 2,
+     "code": "company_too_short",
+     "message": "Company name must be at least 2 characters"},
+    {"field": "company_name", "kind": "max_length", "value": 255,
+     "code": "company_too_long",
+     "message": "Company name cannot exceed 255 characters"},
+    {"field": "company_name", "kind": "pattern", "pattern": COMPANY_NAME_PATTERN,
+     "code": "company_invalid_chars",
+     "message": "Company name contains invalid characters"},
+    {"field": "email", "kind": "required", "code": "email_required",
+     "message": "Email is required"},
+    {"field": "email", "kind": "pattern", "pattern": EMAIL_PATTERN,
+     "code": "email_invalid_format", "message": "Invalid email format"},
+    {"field": "email", "kind": "max_length", "value": 255,
+     "code": "email_too_long", "message": "Email cannot exceed 255 chars"},
+    {"field": "industry", "kind": "allowed", "allowed": config.ALLOWED_INDUSTRIES,
+     "code": "industry_invalid", "message": "Industry must be of of: {allowed}"},
+    {"field": "status", "kind": "allowed", "allowed": config.VALID_STATUSES,
+     "code": "status_invalid", "message": "Status must be one of: {allowed}"},
+    {"field": "phone_num", "kind": "pattern", "pattern": PHONE_NUM_PATTERN,
+     "code": "phone_invalid", "message": "Invalid phone number"},
+    {"field": "website", "kind": "prefix", "prefixes": ("http://", "https://"),
+     "code": "website_invalid_scheme", "stop": True,
+     "message": "Website must start with http:// or https://"},
+    {"field": "website", "kind": "contains", "value": ".",
+     "code": "website_missing_domain", "message": "Website must contain a domain"},
+    {"field": "contact_person", "kind": "required_when",
+     "when_field": "status", "when_value": "Converted",
+     "code": "converted_without_contact",
+     "message": "Status cannot be converted without contact person"},
+]
+
+# Error codes of the default rules, in check order
+ERROR_CODES = tuple(rule["code"] for rule in LEAD_RULES)
+
+
+def _value_test(rule):
+    """
+    Compile one non-required rule into a test(value) -> truthy-if-ok.
+
+    Regexes are compiled and allowed lists frozen here, once, instead of
+    on every call.
+    """
+    kind = rule["kind"]
+
+    if kind == "min_length":
+        minimum = rule["value"]
+        return lambda value: len(value) >= minimum
+    if kind == "max_length":
+        maximum = rule["value"]
+        return lambda value: len(value) <= maximum
+    if kind == "pattern":
+        # fullmatch, not match: "$" alone lets re accept a trailing "\n",
+        # which the pandas (pyarrow) path would reject. re.ASCII keeps any
+        # \d / \s / \w in a custom rule ASCII-only, as RE2 reads them.
+        return re.compile(rule["pattern"], re.ASCII).fullmatch
+    if kind == "allowed":
+        return frozenset(rule["allowed"]).__contains__
+    if kind == "prefix":
+        prefixes = tuple(rule["prefixes"])
+        return lambda value: value.startswith(prefixes)
+    if kind == "contains":
+        needle = rule["value"]
+        return lambda value: needle in value
+
+    raise ValueError(f"Unknown rule kind: {kind}")
+
+
+class CompiledRules:
+    """
+    A rule spec compiled once into fast per-row checks.
+
+    Per field: (field, required_code or None, ((test, code, stop), ...)).
+    Cross-field rules are kept apart since they look at the whole lead.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.by_code = {rule["code"]: rule for rule in self.rules}
+        self.warning_codes = frozenset(
+            rule["code"]
+            for rule in self.rules
+            if rule.get("severity", "error") != "error"
+        )
+        self._messages = {}
+
+        # Group rules by field, keeping first-seen field order
+        groups = {}
+        self.cross_field = []
+        for rule in self.rules:
+            if rule["kind"] == "required_when":
+                self.cross_field.append(rule)
+            else:
+                groups.setdefault(rule["field"], []).append(rule)
+
+        self.fields = []
+        for field, field_rules in groups.items():
+            required_code = None
+            tests = []
+            for rule in field_rules:
+                if rule["kind"] == "required":
+                    required_code = rule["code"]
+                else:
+                    tests.append((_value_test(rule), rule["code"], rule.get("stop", False)))
+            self.fields.append((field, required_code, tuple(tests)))
+
+        self._cross_checks = tuple(
+            (rule["field"], rule["when_field"], rule["when_value"], rule["code"])
+            for rule in self.cross_field
+        )
+
+    def failed_codes(self, lead):
+        """Return the codes of every rule the lead breaks, in rule order"""
+        failed = []
+        get = lead.get
+
+        for field, required_code, tests in self.fields:
+            value = get(field)
+
+            if not value:
+                if required_code is not None:
+                    failed.append(required_code)
+                continue
+
+            for test, code, stop in tests:
+                if not test(value):
+                    failed.append(code)
+                    if stop:
+                        break
+
+        # lead.get() returns None for a missing field, which never
+        # equals "" - only a present but empty field fails
+        for field, when_field, when_value, code in self._cross_checks:
+            if get(when_field) == when_value and get(field) == "":
+                failed.append(code)
+
+        return failed
+
+    def is_error(self, code):
+        return code not in self.warning_codes
+
+    def message(self, code):
+        """Human readable message for a code (built on first request, then cached)"""
+        if code not in self._messages:
+            rule = self.by_code[code]
+            allowed = ", ".join(rule.get("allowed", ()))
+            self._messages[code] = rule["message"].format(allowed=allowed)
+        return self._messages[code]
+
+
+# The default rules are compiled once and shared by every LeadValidator
+DEFAULT_RULES = CompiledRules(LEAD_RULES)
 
 
 class ValidationError(Exception):
@@ -14,11 +196,21 @@ class LeadValidator:
 
     Design pattern: Collect all errors instead of fail-fast.
     This gives user complete feedback, not just first error.
+
+    The rules themselves live in LEAD_RULES (declarative spec) and are
+    compiled once - add a rule there (or pass your own spec) instead of
+    editing this class.
     """
 
-    def __init__(self):
-        """Initialize with empty error list"""
-        self.errors = []  # List to collect all validation errors
+    def __init__(self, rules=None):
+        """
+        Args:
+            rules: Optional rule spec (list of dicts like LEAD_RULES).
+                   Defaults to the shared, pre-compiled LEAD_RULES.
+        """
+        self.rules = DEFAULT_RULES if rules is None else CompiledRules(rules)
+        self.error_codes = []  # Codes of failed error-severity rules
+        self.warning_codes = []  # Codes of failed warning-severity rules
 
     def validate_lead(self, lead):
         """
@@ -30,151 +222,117 @@ class LeadValidator:
         Returns:
             bool: True if valid, False if errors found
 
-        Side effect: Populates self.errors list
-        """
-        # Clear previous errors
-        self.errors = []
-
-        # Run all validation checks
-        # Note: We DON'T use try-except here because we want
-        # to collect all errors, not stop at first one
-        self._validate_company_name(lead)
-        self._validate_email(lead)
-        self._validate_industry(lead)
-        self._validate_status(lead)
-        self._validate_phone(lead)
-        self._validate_website(lead)
-        self._validate_cross_field(lead)
-
-        # Return True if no errors found
-        return len(self.errors) == 0
-
-    def _validate_company_name(self, lead):
+        Side effect: Populates self.error_codes / self.warning_codes.
+        Messages are only built if get_errors() is called.
         """
-        Validate company name field.
-
-        Rules:
-        - Required (not None, not empty)
-        - Between 2 and 255 characters
-        - No special characters except spaces, hyphens, ampersands
-
-        Why underscore prefix (_validate)?
-        Indicates tis is private - only used internally
-        """
-        company = lead.get("company_name")
-
-        # Check if exists
-        if not company:
-            self.errors.append("Company name is required")
-            return
+        failed = self.rules.failed_codes(lead)
 
-        # Check length
-        if len(company) < 2:
-            self.errors.append("Company name must be at least 2 characters")
+        if failed and self.rules.warning_codes:
+            warnings = self.rules.warning_codes
+            self.error_codes = [code for code in failed if code not in warnings]
+            self.warning_codes = [code for code in failed if code in warnings]
+        else:
+            self.error_codes = failed
+            self.warning_codes = []
 
-        if len(company) > 255:
-            self.errors.append("Company name cannot exceed 255 characters")
-
-        # Check for invalid characters
-        # Regex ^ = start, $ = end, [] = allowed chars, + = one or more
-        if not re.match(r'^[a-zA-Z0-9\s\-\&.,\'"]+$', company):
-            self.errors.append("Company name contains invalid characters")
-
-    def _validate_email(self, lead):
-        """
-        Validate email field.
+        # Return True if no errors found
+        return len(self.error_codes) == 0
 
-        Rules:
-        - Required
-        - Valid email format (simple check)
-        - Max 255 chars
+    def validate_frame(self, df):
         """
-        email = lead.get("email")
-
-        if not email:
-            self.errors.append("Email is required")
-            return
+        Validate every row of a DataFrame at once.
 
-        # Simple email regex
-        # Breakdown: something @ something . something
-        email_pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(email_pattern, email):
-            self.errors.append("Invalid email format")
+        Applies the same rules as validate_lead(), but as column-wise
+        pandas operations instead of a Python loop over rows.
 
-        if len(email) > 255:
-            self.errors.append("Email cannot exceed 255 chars")
+        Args:
+            df: DataFrame of leads (missing values already filled with "")
 
-    def _validate_industry(self, lead):
+        Returns:
+            (valid_mask, error_codes):
+              valid_mask  - boolean Series, True for rows with no errors
+              error_codes - string Series, ";"-joined error codes per row
+                            ("" for valid rows)
         """
-        Validate industry field
+        checks = self._frame_checks(df)
 
-        Rules:
-        - Optional (can be None or empty)
-        - If provided, must be from allowed list
-        """
-        industry = lead.get("industry")
+        valid_mask = pd.Series(True, index=df.index)
+        error_codes = pd.Series("", index=df.index, dtype=object)
 
-        # Skip validation if not provided (optional field)
-        if not industry:
-            return
+        for code, failed in checks.items():
+            if not self.rules.is_error(code):
+                continue
+            valid_mask &= ~failed
+            error_codes = error_codes.mask(failed, error_codes + code + ";")
 
-        if industry not in config.ALLOWED_INDUSTRIES:
-            self.errors.append(
-                f"Industry must be of of: {', '.join(config.ALLOWED_INDUSTRIES)}"
-            )
+        return valid_mask, error_codes.str.rstrip(";")
 
-    def _validate_status(self, lead):
+    def _frame_checks(self, df):
         """
-        Validate status field.
+        Build one boolean "rule failed" Series per rule code.
 
-        Rules:
-        - Optional (defaults no 'New' in database)
-        - If provided, must be valid status
+        Same semantics as failed_codes(): empty optional fields are
+        skipped, a failed "required" or "stop" rule skips the rest of
+        the field's rules for that row.
         """
-        status = lead.get("status")
-
-        if not status:
-            return
-
-        if status not in config.VALID_STATUSES:
-            self.errors.append(
-                f"Status must be one of: {', '.join(config.VALID_STATUSES)}"
-            )
 
-    def _validate_phone(self, lead):
-        phone_num = lead.get("phone_num")
-
-        if not phone_num:
-            return
-
-        phone_num_pattern = r"^\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}$"
-        if not re.match(phone_num_pattern, phone_num):
-            self.errors.append("Invalid phone number")
-
-    def _validate_website(self, lead):
-        website = lead.get("website")
-
-        if not website:
-            return
-
-        if not (website.startswith("http://") or website.startswith("https://")):
-            self.errors.append("Website must start with http:// or https://")
-            return
-
-        if "." not in website:
-            self.errors.append("Website must contain a domain")
-
-    def _validate_cross_field(self, lead):
-        status = lead.get("status")
-        contact_person = lead.get("contact_person")
-
-        if status == "Converted" and contact_person == "":
-            self.errors.append("Status cannot be converted without contact person")
+        def column(name):
+            if name not in df.columns:
+                return pd.Series("", index=df.index, dtype=object)
+            return df[name].fillna("").astype(str)
+
+        checks = {}
+
+        for field, required_code, tests in self.rules.fields:
+            values = column(field)
+            active = values != ""  # rows still being checked for this field
+
+            if required_code is not None:
+                checks[required_code] = ~active
+
+            for _, code, stop in tests:
+                failed = active & ~self._frame_test(values, self.rules.by_code[code])
+                checks[code] = failed
+                if stop:
+                    active &= ~failed
+
+        for rule in self.rules.cross_field:
+            # A missing column behaves like lead.get() -> None: never fails
+            if rule["field"] in df.columns:
+                empty = df[rule["field"]].fillna("") == ""
+            else:
+                empty = pd.Series(False, index=df.index)
+            checks[rule["code"]] = (column(rule["when_field"]) == rule["when_value"]) & empty
+
+        return {code: failed.astype(bool) for code, failed in checks.items()}
+
+    def _frame_test(self, values, rule):
+        """Vectorized version of _value_test(): True where the rule passes"""
+        kind = rule["kind"]
+
+        if kind == "min_length":
+            return values.str.len() >= rule["value"]
+        if kind == "max_length":
+            return values.str.len() <= rule["value"]
+        if kind == "pattern":
+            return values.str.fullmatch(rule["pattern"])
+        if kind == "allowed":
+            return values.isin(rule["allowed"])
+        if kind == "prefix":
+            return values.str.startswith(tuple(rule["prefixes"]))
+        if kind == "contains":
+            return values.str.contains(rule["value"], regex=False)
+
+        raise ValueError(f"Unknown rule kind: {kind}")
 
     def get_errors(self):
-        """Return list of all validation errors"""
-        return self.errors
+        """Return list of all validation error messages (built on demand)"""
+        return [self.rules.message(code) for code in self.error_codes]
+
+    def get_warnings(self):
+        """Return list of warning messages from the last validation"""
+        return [self.rules.message(code) for code in self.warning_codes]
 
     def is_valid(self):
         """Check if last validation passed"""
-        return len(self.errors) == 0
+        return len(self.error_codes) == 0
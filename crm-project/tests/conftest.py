@@ -0,0 +1,41 @@
+"""
+Shared fixtures. Run the tests from crm-project/: python -m pytest
+
+Tests that need PostgreSQL use the db fixture. Point CRM_TEST_DATABASE at
+a database they may wipe (host/user/password come from config.DB_CONFIG);
+without it those tests are skipped.
+"""
+
+import os
+
+import psycopg2
+import pytest
+
+import config
+from src.data_loader import CSVLoader
+from src.migrations import MigrationRunner
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db():
+    """db_config of a migrated scratch database, with empty lead tables"""
+    database = os.environ.get("CRM_TEST_DATABASE")
+    if not database:
+        pytest.skip("CRM_TEST_DATABASE not set")
+
+    db_config = {**config.DB_CONFIG, "database": database}
+    try:
+        with MigrationRunner(db_config, os.path.join(PROJECT_DIR, "migrations")) as runner:
+            runner.migrate()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL not reachable: {e}")
+
+    with CSVLoader(db_config, aggregates=True, history=True) as loader:
+        loader.clear_table("leads")
+        loader.cursor.execute("TRUNCATE lead_rejects")
+        loader.conn.commit()
+
+    return db_config
@@ -0,0 +1,27 @@
+"""Small helpers shared by the test modules"""
+
+import psycopg2
+
+
+def make_lead(**fields):
+    """A valid lead, with fields overriding its values"""
+    lead = {
+        "company_name": "Acme",
+        "contact_person": "Jane",
+        "email": "jane@acme.com",
+        "industry": "Technology",
+        "status": "New",
+    }
+    lead.update(fields)
+    return lead
+
+
+def fetch(db_config, sql, params=None):
+    """All rows of one query, on a connection of its own"""
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    finally:
+        conn.close()
@@ -0,0 +1,129 @@
+"""Tests for CSVLoader and the row mapping in src/data_loader.py"""
+
+import psycopg2
+import pytest
+
+import src.data_loader as data_loader
+from src.data_loader import LOAD_STRATEGIES, CSVLoader, lead_values
+
+from tests.helpers import fetch, make_lead
+
+
+def test_blank_status_and_industry_are_staged_as_defaults():
+    assert lead_values(make_lead(status="", industry=" ")) == (
+        "Acme", "Jane", "jane@acme.com", None, "New"
+    )
+
+
+def test_load_is_retried_after_a_deadlock(monkeypatch):
+    monkeypatch.setattr(data_loader, "RETRY_BACKOFF_SECONDS", 0)
+    loader = CSVLoader({})
+    monkeypatch.setattr(loader, "_rollback", lambda: None)
+    attempts = []
+
+    def load_rows(rows, table_name, strategy, stats):
+        attempts.append([row_num for row_num, _ in rows])
+        if len(attempts) == 1:
+            raise psycopg2.errors.DeadlockDetected("deadlock detected")
+        stats["loaded"] = len(attempts[-1])
+
+    monkeypatch.setattr(loader, "_load_rows", load_rows)
+    stats = loader.load_records([make_lead(), make_lead(email="joe@acme.com")], "leads")
+
+    assert attempts == [[1, 2], [1, 2]]
+    assert stats["total_rows"] == 2 and stats["loaded"] == 2
+
+
+def test_load_gives_up_after_repeated_deadlocks(monkeypatch):
+    monkeypatch.setattr(data_loader, "RETRY_BACKOFF_SECONDS", 0)
+    loader = CSVLoader({})
+    monkeypatch.setattr(loader, "_rollback", lambda: None)
+
+    def load_rows(rows, table_name, strategy, stats):
+        raise psycopg2.errors.DeadlockDetected("deadlock detected")
+
+    monkeypatch.setattr(loader, "_load_rows", load_rows)
+    stats = loader.load_records([make_lead()], "leads")
+
+    assert stats["failed"] == 1 and stats["loaded"] == 0
+    assert [error["row"] for error in stats["errors"]] == [None]
+
+
+def test_upsert_keeps_stored_values_the_file_leaves_blank(db):
+    with CSVLoader(db, strategy="upsert", aggregates=True, history=True) as loader:
+        loader.load_records([make_lead()], "leads")
+        # A status-only file: no industry, no contact
+        stats = loader.load_records(
+            [make_lead(status="Contacted", industry="", contact_person="")], "leads"
+        )
+        assert stats["updated"] == 1
+
+        # The same file again changes nothing, so nothing is written
+        stats = loader.load_records(
+            [make_lead(status="Contacted", industry="", contact_person="")], "leads"
+        )
+        assert stats["updated"] == 0 and stats["duplicates"] == 1
+
+    assert fetch(db, "SELECT contact_person, industry, status FROM leads") == [
+        ("Jane", "Technology", "Contacted")
+    ]
+
+
+@pytest.mark.parametrize("strategy", LOAD_STRATEGIES)
+def test_every_strategy_writes_the_row_hash(db, strategy):
+    with CSVLoader(db, strategy=strategy) as loader:
+        loader.load_records([make_lead(), make_lead(email="joe@acme.com", industry="")], "leads")
+
+    assert fetch(
+        db,
+        """
+        SELECT COUNT(*) FROM leads
+        WHERE row_hash = lead_row_hash(company_name, contact_person, industry, status)
+        """,
+    ) == [(2,)]
+
+
+def test_default_loader_keeps_summaries_and_history_current(db):
+    with CSVLoader(db, strategy="copy") as loader:
+        loader.load_records([make_lead(), make_lead(email="joe@acme.com")], "leads")
+        assert loader.get_row_count("leads") == 2
+
+    assert fetch(db, "SELECT SUM(lead_count) FROM lead_counts_by_status_industry") == [(2,)]
+    assert fetch(db, "SELECT COUNT(*) FROM leads_history WHERE is_current") == [(2,)]
+
+    # Clearing leads clears what describes it, whatever the loader maintains
+    with CSVLoader(db, aggregates=False, history=False) as loader:
+        loader.clear_table("leads")
+
+    assert fetch(db, "SELECT COUNT(*) FROM lead_counts_by_status_industry") == [(0,)]
+    assert fetch(db, "SELECT row_count FROM table_row_counts WHERE table_name = 'leads'") == [(0,)]
+    assert fetch(db, "SELECT COUNT(*) FROM leads_history") == [(0,)]
+
+
+@pytest.mark.parametrize("strategy", LOAD_STRATEGIES)
+def test_strategy_rejects_only_the_rows_the_database_refuses(db, strategy):
+    records = [
+        make_lead(email="a@acme.com"),
+        make_lead(email="b@acme.com", company_name=" "),  # check_company_not_empty
+        make_lead(email="c@acme.com", status=""),  # blank -> "New"
+        make_lead(email="a@acme.com", status="Contacted"),  # repeat of row 1
+    ]
+
+    with CSVLoader(db, strategy=strategy, aggregates=True, history=True) as loader:
+        stats = loader.load_records(records, "leads")
+
+    assert stats["loaded"] == 2
+    assert stats["failed"] == 1
+    assert [error["row"] for error in stats["errors"]] == [2]
+    assert stats["errors"][0]["data"]["email"] == "b@acme.com"
+
+    # The rows around the refused one are committed
+    rows = dict(fetch(db, "SELECT email, status FROM leads"))
+    if strategy == "upsert":
+        assert rows == {"a@acme.com": "Contacted", "c@acme.com": "New"}
+    else:
+        assert rows == {"a@acme.com": "New", "c@acme.com": "New"}
+        assert stats["duplicates"] == 1
+
+    counts = dict(fetch(db, "SELECT status, SUM(lead_count) FROM lead_counts_by_status_industry GROUP BY 1"))
+    assert sum(counts.values()) == 2
@@ -0,0 +1,48 @@
+"""Tests for the pre-load email index in src/dedup.py"""
+
+import pandas as pd
+
+from src.dedup import EmailIndex, email_keys
+from src.data_loader import CSVLoader
+
+from tests.helpers import make_lead
+
+
+def test_duplicates_flags_known_emails_and_later_repeats():
+    index = EmailIndex()
+    index.add(pd.Series(["a@acme.com"]))
+
+    mask = index.duplicates(pd.Series(["a@acme.com", "b@acme.com", "b@acme.com", "B@acme.com"]))
+
+    # First occurrence kept; compared exactly, like UNIQUE (email)
+    assert mask.tolist() == [True, False, True, False]
+
+
+def test_added_runs_merge_without_losing_keys():
+    index = EmailIndex()
+    emails = [f"lead{n}@acme.com" for n in range(100)]
+
+    for start in range(0, 100, 3):
+        index.add(pd.Series(emails[start:start + 3]))
+    index.add(pd.Series(emails[:10]))  # re-adding is harmless
+
+    assert len(index) == 100
+    assert index.duplicates(pd.Series(emails)).all()
+    assert not index.duplicates(pd.Series(["new@acme.com"])).any()
+
+
+def test_keys_depend_only_on_the_email():
+    assert email_keys(["a@acme.com"])[0] == email_keys(pd.Series(["a@acme.com"]))[0]
+    assert email_keys(["a@acme.com"])[0] != email_keys(["b@acme.com"])[0]
+
+
+def test_load_reads_every_stored_email(db):
+    with CSVLoader(db, strategy="copy") as loader:
+        loader.load_records([make_lead(email=f"lead{n}@acme.com") for n in range(5)], "leads")
+
+        index = EmailIndex()
+        assert index.load(loader.conn) == 5
+
+    assert index.duplicates(pd.Series(["lead4@acme.com", "lead5@acme.com"])).tolist() == [
+        True, False
+    ]
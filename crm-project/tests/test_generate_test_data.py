@@ -0,0 +1,76 @@
+"""Tests for the bulk lead generator in generate_test_data.py"""
+
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import generate_test_data
+from generate_test_data import build_value_pools, generate_bulk, generate_rows, plan_files
+from src.validator import LeadValidator
+
+
+def _read_all(paths):
+    contents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            contents.append(f.read())
+    return contents
+
+
+# Forking next to pyarrow's / Faker's threads is fine for these workers
+@pytest.mark.filterwarnings("ignore:This process .* use of fork:DeprecationWarning")
+def test_same_seed_gives_the_same_files_with_any_worker_count(tmp_path):
+    one = generate_bulk(3_000, files=2, workers=1, output_dir=str(tmp_path / "one"))
+    two = generate_bulk(3_000, files=2, workers=2, output_dir=str(tmp_path / "two"))
+
+    assert [os.path.basename(path) for path in one] == ["leads_1.csv", "leads_2.csv"]
+    assert _read_all(one) == _read_all(two)
+
+    other = generate_bulk(3_000, files=2, seed=7, workers=1, output_dir=str(tmp_path / "other"))
+    assert _read_all(other) != _read_all(one)
+
+
+def test_plan_splits_rows_evenly_into_chunks():
+    assert plan_files(10, 3, chunk_size=2) == [
+        (0, [(0, 2), (2, 2)]),
+        (1, [(4, 2), (6, 1)]),
+        (2, [(7, 2), (9, 1)]),
+    ]
+
+
+def test_without_errors_every_row_is_valid_and_unique():
+    pools = build_value_pools(42, pool_size=50)
+    text = generate_rows(0, 500, 42, pools, {})
+
+    df = pd.read_csv(
+        io.StringIO(text), names=generate_test_data.FIELDNAMES, dtype=str, keep_default_na=False
+    )
+    valid_mask, _ = LeadValidator().validate_frame(df)
+
+    assert valid_mask.all()
+    assert df["email"].is_unique
+
+
+def test_ordered_results_keep_task_order_within_the_window(monkeypatch):
+    in_flight = []
+    running = set()
+
+    def generate_chunk(task):
+        running.add(task)
+        in_flight.append(len(running))
+        # Later tasks finish first
+        time.sleep(0.01 * (5 - task))
+        running.discard(task)
+        return task
+
+    monkeypatch.setattr(generate_test_data, "_generate_chunk", generate_chunk)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(generate_test_data._ordered_results(executor, range(5), window=2))
+
+    assert results == [0, 1, 2, 3, 4]
+    assert max(in_flight) <= 2
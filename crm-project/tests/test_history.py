@@ -0,0 +1,43 @@
+"""Tests for the SCD Type 2 lead history (src/history.py)"""
+
+import pytest
+
+from src.data_loader import CSVLoader
+
+from tests.helpers import fetch, make_lead
+
+
+def test_history_closes_a_version_when_a_lead_changes(db):
+    with CSVLoader(db, strategy="upsert", aggregates=True, history=True) as loader:
+        loader.load_records([make_lead(status="New")], "leads")
+        loader.load_records([make_lead(status="Contacted")], "leads")
+        # Unchanged rows add no version
+        stats = loader.load_records([make_lead(status="Contacted")], "leads")
+
+    assert stats["updated"] == 0 and stats["duplicates"] == 1
+
+    versions = fetch(
+        db,
+        """
+        SELECT status, is_current, valid_from, valid_to
+        FROM leads_history
+        WHERE email = %s
+        ORDER BY valid_from, history_id
+        """,
+        ("jane@acme.com",),
+    )
+    assert [(status, is_current) for status, is_current, _, _ in versions] == [
+        ("New", False),
+        ("Contacted", True),
+    ]
+    (_, _, _, closed_at), (_, _, opened_at, valid_to) = versions
+    assert closed_at == opened_at
+    assert valid_to.year > 9000  # 'infinity'
+
+
+@pytest.mark.parametrize("strategy", ["row", "batch"])
+def test_history_follows_row_and_batch_loads(db, strategy):
+    with CSVLoader(db, strategy=strategy, history=True) as loader:
+        loader.load_records([make_lead(), make_lead(email="joe@acme.com")], "leads")
+
+    assert fetch(db, "SELECT COUNT(*) FROM leads_history WHERE is_current") == [(2,)]
@@ -0,0 +1,85 @@
+"""Tests for the streaming error-log analyzer in src/log_analyzer.py"""
+
+import os
+
+import src.log_analyzer as log_analyzer
+from src.log_analyzer import LogAnalyzer, analyze_shard, merge_summaries, shard_bounds
+
+
+LOG_LINES = [
+    # RowErrorLog's one-line records
+    "2024-05-01 10:00:00,100 - ERROR - Row 2: Validation failed - "
+    "['Invalid email format', \"Company name can't be blank\"] | Data: {'email': 'x'}",
+    "2024-05-01 10:00:01,200 - ERROR - Row 3: Database error - "
+    "duplicate key value | Data: {'email': 'y'}",
+    # The older three-line format
+    "2024-05-01 10:00:02,300 - ERROR - Row 4: Validation failed",
+    "2024-05-01 10:00:02,300 - ERROR -    Errors: ['Invalid email format']",
+    "2024-05-01 10:00:02,300 - ERROR -    Data: {'email': 'z'}",
+    # Unrelated lines and RowErrorLog.flush() totals
+    "2024-05-01 10:00:03,400 - INFO - Loaded 10 rows",
+    "2024-05-01 10:00:04,500 - ERROR - 1200 rows rejected: "
+    "{'email_invalid_format': 1000, 'db_error': 200}",
+]
+
+
+def _write_log(path, lines):
+    with open(path, "a") as f:
+        f.writelines(line + "\n" for line in lines)
+    return str(path)
+
+
+def test_analyze_shard_reads_both_record_formats_and_totals(tmp_path):
+    log_file = _write_log(tmp_path / "etl_errors.log", LOG_LINES)
+
+    summary = analyze_shard(log_file, 0, os.path.getsize(log_file))
+
+    assert summary["records"] == 3
+    assert summary["by_type"] == {"validation": 2, "database": 1}
+    assert summary["messages"] == {
+        "Invalid email format": 2,
+        "Company name can't be blank": 1,
+        "duplicate key value": 1,
+    }
+    assert summary["summarised_rows"] == 1200
+    assert summary["rejects_by_code"] == {"email_invalid_format": 1000, "db_error": 200}
+    assert summary["first_timestamp"] == "2024-05-01 10:00:00,100"
+    assert summary["last_timestamp"] == "2024-05-01 10:00:02,300"
+
+
+def test_shards_add_up_to_the_whole_file(tmp_path, monkeypatch):
+    log_file = _write_log(tmp_path / "etl_errors.log", LOG_LINES * 50)
+    size = os.path.getsize(log_file)
+    monkeypatch.setattr(log_analyzer, "MIN_SHARD_SIZE", 1)
+
+    bounds = shard_bounds(log_file, 0, size, 7)
+    assert len(bounds) > 1
+    assert bounds[0][0] == 0 and bounds[-1][1] == size
+
+    sharded = log_analyzer.empty_summary()
+    for start, end in bounds:
+        merge_summaries(sharded, analyze_shard(log_file, start, end))
+
+    assert sharded == analyze_shard(log_file, 0, size)
+
+
+def test_analyzer_continues_from_its_state_file(tmp_path):
+    log_file = _write_log(tmp_path / "etl_errors.log", LOG_LINES[:2])
+    state_file = str(tmp_path / "state" / "analyzer.json")
+
+    first = LogAnalyzer(log_file, state_file, workers=1).analyze()
+    assert first["records"] == 2
+
+    # A line still being written (no newline yet) waits for the next run
+    _write_log(log_file, LOG_LINES[2:5])
+    with open(log_file, "a") as f:
+        f.write("2024-05-01 10:00:05,000 - ERROR - Row 9: Valid")
+
+    second = LogAnalyzer(log_file, state_file, workers=1).analyze()
+    assert second["records"] == 3
+    assert second["messages"]["Invalid email format"] == 2
+
+    # A truncated (rotated) log is read from the start
+    open(log_file, "w").close()
+    _write_log(log_file, LOG_LINES[:1])
+    assert LogAnalyzer(log_file, state_file, workers=1).analyze()["records"] == 1
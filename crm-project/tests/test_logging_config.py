@@ -0,0 +1,41 @@
+"""Tests for the sampled reject logging in logging_config.py"""
+
+import logging
+
+from logging_config import RowErrorLog
+
+
+def _row_error_log(caplog, **kwargs):
+    caplog.set_level(logging.ERROR, logger="test.rows")
+    return RowErrorLog(logging.getLogger("test.rows"), **kwargs)
+
+
+def test_first_rejects_are_logged_verbatim_then_counted(caplog):
+    log = _row_error_log(caplog, verbatim=2, summary_every=4)
+
+    for row_num in range(1, 10):
+        codes = ["email_invalid_format"] if row_num % 3 else ["email_invalid_format", "db_error"]
+        log.reject(row_num, codes, "Validation failed", {"row": row_num})
+    log.flush()
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Row 1: Validation failed | Data: {'row': 1}",
+        "Row 2: Validation failed | Data: {'row': 2}",
+        "Logged 2 rejected rows verbatim - counting per error type from here on",
+        # Rows 3-4: the verbatim rows are not counted again
+        "Rejected rows since last summary: {'email_invalid_format': 2, 'db_error': 1}",
+        # Rows 5-8
+        "Rejected rows since last summary: {'email_invalid_format': 4, 'db_error': 1}",
+        "9 rows rejected: {'email_invalid_format': 9, 'db_error': 3}",
+    ]
+
+
+def test_a_few_rejects_need_no_summary(caplog):
+    log = _row_error_log(caplog, verbatim=5, summary_every=2)
+
+    log.reject(7, ["db_error"], "Database error - boom")
+    log.flush()
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "Row 7: Database error - boom"
+    ]
@@ -0,0 +1,95 @@
+"""Tests for the ingestion manifest (src/manifest.py) and resuming files"""
+
+import os
+import shutil
+
+import pandas as pd
+
+from src.data_loader import CSVLoader
+from src.manifest import COMPLETE, FAILED, IngestionManifest
+from src.pipeline import ETL
+
+from tests.helpers import fetch, make_lead
+
+
+def test_manifest_resumes_after_the_last_checkpoint(tmp_path):
+    manifest = IngestionManifest(str(tmp_path / "manifest"))
+    source = tmp_path / "leads.csv"
+    source.write_text("company_name,email\nAcme,a@acme.com\n")
+    file_hash = manifest.file_hash(str(source))
+
+    manifest.start(file_hash, str(source))
+    manifest.checkpoint(file_hash, 100)
+    manifest.fail(file_hash, RuntimeError("connection lost"))
+    assert manifest.get(file_hash)["status"] == FAILED
+    assert manifest.resume_offset(file_hash) == 100
+
+    # A retry keeps the checkpoint
+    manifest.start(file_hash, str(source))
+    assert manifest.resume_offset(file_hash) == 100
+
+    manifest.complete(file_hash)
+    assert manifest.is_complete(file_hash)
+    assert manifest.resume_offset(file_hash) == 0
+
+
+def test_rolled_back_chunk_fails_the_file_and_resumes_there(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the archive is relative to the working directory
+    paths = {
+        name: str(tmp_path / name)
+        for name in ("input", "processed", "failed", "manifest", "reports_daily", "reports_errors")
+    }
+    os.makedirs(paths["input"])
+    source = os.path.join(paths["input"], "leads.csv")
+    pd.DataFrame(
+        [make_lead(email=f"lead{n}@acme.com") for n in range(1, 6)]
+    ).to_csv(source, index=False)
+
+    etl_config = {
+        "db_config": db,
+        "paths": paths,
+        "load_strategy": "copy",
+        "chunk_size": 2,
+        "aggregates": True,
+        "history": True,
+        "dedup_emails": True,
+    }
+
+    # COPY of the second chunk fails: nothing of it reaches the database
+    copy_lines = CSVLoader._copy_lines
+    calls = []
+
+    def failing_copy_lines(self, rows, counter):
+        calls.append(counter)
+        if len(calls) == 2:
+            raise OSError("simulated COPY failure")
+        yield from copy_lines(self, rows, counter)
+
+    monkeypatch.setattr(CSVLoader, "_copy_lines", failing_copy_lines)
+
+    etl = ETL(etl_config)
+    try:
+        etl.process_file(source)
+    finally:
+        etl.close()
+
+    file_hash = IngestionManifest.file_hash(os.path.join(paths["failed"], "leads.csv"))
+    entry = etl.manifest.get(file_hash)
+    assert entry["status"] == FAILED
+    assert entry["rows_committed"] == 2
+    assert fetch(db, "SELECT COUNT(*) FROM leads") == [(2,)]
+
+    # Dropped in again, the file resumes at the chunk that failed
+    monkeypatch.setattr(CSVLoader, "_copy_lines", copy_lines)
+    shutil.move(os.path.join(paths["failed"], "leads.csv"), source)
+
+    etl = ETL(etl_config)
+    try:
+        etl.process_file(source)
+    finally:
+        etl.close()
+
+    assert etl.manifest.get(file_hash)["status"] == COMPLETE
+    assert etl.total_rows == 3
+    assert fetch(db, "SELECT COUNT(*) FROM leads") == [(5,)]
+    assert fetch(db, "SELECT COUNT(*) FROM lead_rejects") == [(0,)]
@@ -0,0 +1,27 @@
+"""Tests for the migration runner in src/migrations.py"""
+
+from src.migrations import created_indexes, split_statements
+
+
+def test_split_statements_keeps_dollar_quoted_bodies_whole():
+    assert split_statements(
+        "-- migrate: no-transaction\n"
+        "-- a comment; with a semicolon\n"
+        "CREATE FUNCTION f() RETURNS INT LANGUAGE SQL AS $$ SELECT 1; $$;\n"
+        "DO $body$ BEGIN PERFORM 1; END $body$;\n"
+        "CREATE INDEX CONCURRENTLY i ON t (c)\n"
+    ) == [
+        "CREATE FUNCTION f() RETURNS INT LANGUAGE SQL AS $$ SELECT 1; $$",
+        "DO $body$ BEGIN PERFORM 1; END $body$",
+        "CREATE INDEX CONCURRENTLY i ON t (c)",
+    ]
+
+
+def test_created_indexes_reads_index_names():
+    assert created_indexes(
+        [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leads_status ON leads (status)",
+            'create unique index "Odd Name" on leads (email)',
+            "CREATE TABLE t (id INT)",
+        ]
+    ) == ["idx_leads_status", '"Odd Name"']
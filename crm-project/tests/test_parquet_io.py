@@ -0,0 +1,76 @@
+"""Tests for the Parquet helpers in src/parquet_io.py"""
+
+from decimal import Decimal
+
+import pytest
+from psycopg2.extensions import Column
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+import src.query_runner as query_runner
+from src.data_loader import CSVLoader
+from src.parquet_io import ParquetStreamWriter
+from src.query_runner import QueryRunner
+
+from tests.helpers import make_lead
+
+
+def test_stream_writer_types_columns_from_the_description(tmp_path):
+    path = str(tmp_path / "export.parquet")
+    description = [
+        Column(name="id", type_code=23),
+        Column(name="industry", type_code=25),  # text
+        Column(name="average", type_code=1700),  # unconstrained numeric
+        Column(name="amount", type_code=1700, precision=10, scale=2),
+        Column(name="tags", type_code=3807),  # jsonb
+    ]
+
+    writer = ParquetStreamWriter(path, description)
+    # All NULL in the first batch: not typed null, so the next batch fits
+    writer.write([(1, None, None, None, None)])
+    writer.write([(3, "Tech", Decimal("1.3333333333333333"), Decimal("9.50"), {"a": 1})])
+    writer.close()
+
+    table = pq.read_table(path)
+    assert [str(field.type) for field in table.schema] == [
+        "int32", "string", "double", "decimal128(10, 2)", "string"
+    ]
+    assert table.to_pylist()[1] == {
+        "id": 3,
+        "industry": "Tech",
+        "average": pytest.approx(4 / 3),
+        "amount": Decimal("9.50"),
+        "tags": '{"a": 1}',
+    }
+
+
+def test_stream_writer_without_rows_still_writes_the_schema(tmp_path):
+    path = str(tmp_path / "empty.parquet")
+
+    ParquetStreamWriter(path, [Column(name="day", type_code=1082)]).close()
+
+    table = pq.read_table(path)
+    assert table.num_rows == 0
+    assert str(table.schema.field("day").type) == "date32[day]"
+
+
+def test_export_to_parquet_survives_a_null_first_batch(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(query_runner, "EXPORT_FETCH_SIZE", 1)
+    path = str(tmp_path / "leads.parquet")
+
+    with CSVLoader(db, strategy="copy") as loader:
+        loader.load_records(
+            [make_lead(email="a@acme.com", industry=""), make_lead(email="b@acme.com")],
+            "leads",
+        )
+
+    with QueryRunner(db) as runner:
+        count = runner.export_to_parquet(
+            "SELECT email, industry FROM leads ORDER BY email", path
+        )
+
+    assert count == 2
+    assert pq.read_table(path).to_pylist() == [
+        {"email": "a@acme.com", "industry": None},
+        {"email": "b@acme.com", "industry": "Technology"},
+    ]
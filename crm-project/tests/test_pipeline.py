@@ -0,0 +1,118 @@
+"""Tests for the ETL pipeline in src/pipeline.py"""
+
+import os
+import shutil
+import multiprocessing.util
+
+import pandas as pd
+
+import src.pipeline as pipeline
+from src.manifest import IngestionManifest
+from src.pipeline import ETL
+
+from tests.helpers import fetch, make_lead
+
+
+class FakePool:
+    """Stands in for ConnectionPool: counts the pools opened and closed"""
+
+    opened = 0
+
+    def __init__(self, db_config, **settings):
+        FakePool.opened += 1
+        self.closed = False
+
+    def get_metrics(self):
+        return {}
+
+    def close(self):
+        self.closed = True
+
+
+def _etl_config(tmp_path):
+    return {
+        "db_config": {},
+        "paths": {"manifest": str(tmp_path / "manifest")},
+    }
+
+
+def test_worker_reuses_one_etl_for_all_its_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "setup_logging", lambda: None)
+    monkeypatch.setattr(pipeline, "ConnectionPool", FakePool)
+    monkeypatch.setattr(FakePool, "opened", 0)
+    finalizers = []
+    monkeypatch.setattr(
+        multiprocessing.util, "Finalize", lambda *args, **kwargs: finalizers.append(args)
+    )
+
+    pipeline._init_worker(_etl_config(tmp_path))
+    etl = pipeline._worker_etl
+    pool = etl.get_pool()
+    processed = []
+
+    def process_file(filepath):
+        assert etl.get_pool() is pool
+        processed.append(filepath)
+        etl.total_files += 1
+        etl.total_rows += 10
+
+    monkeypatch.setattr(etl, "process_file", process_file)
+    try:
+        # Each file reports its own counters, not the running total
+        for filepath in ("a.csv", "b.csv"):
+            counters = pipeline._process_file_worker(filepath)
+            assert (counters["total_files"], counters["total_rows"]) == (1, 10)
+        assert processed == ["a.csv", "b.csv"]
+        assert pipeline._worker_etl is etl
+        assert finalizers == [(None, pipeline._close_worker)]
+    finally:
+        pipeline._close_worker()
+
+    assert FakePool.opened == 1 and pool.closed
+    assert pipeline._worker_etl is None
+
+
+def test_replayed_chunk_is_not_quarantined_as_duplicates(db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the archive is relative to the working directory
+    paths = {
+        name: str(tmp_path / name)
+        for name in ("input", "processed", "failed", "manifest", "reports_daily", "reports_errors")
+    }
+    os.makedirs(paths["input"])
+    source = os.path.join(paths["input"], "leads.csv")
+    pd.DataFrame(
+        [make_lead(email=f"lead{n}@acme.com") for n in range(1, 5)]
+    ).to_csv(source, index=False)
+
+    etl_config = {
+        "db_config": db,
+        "paths": paths,
+        "load_strategy": "copy",
+        "chunk_size": 2,
+        "dedup_emails": True,
+    }
+
+    # The run dies after the first chunk is committed, before its checkpoint
+    def crash(self, file_hash, rows_committed):
+        raise OSError("simulated crash")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(IngestionManifest, "checkpoint", crash)
+        etl = ETL(etl_config)
+        try:
+            etl.process_file(source)
+        finally:
+            etl.close()
+    assert fetch(db, "SELECT COUNT(*) FROM leads") == [(2,)]
+
+    shutil.move(os.path.join(paths["failed"], "leads.csv"), source)
+    etl = ETL(etl_config)
+    try:
+        etl.process_file(source)
+    finally:
+        etl.close()
+
+    # The first chunk's rows are found again, but are not rejects
+    assert (etl.total_rows, etl.total_duplicates) == (2, 2)
+    assert fetch(db, "SELECT COUNT(*) FROM leads") == [(4,)]
+    assert fetch(db, "SELECT COUNT(*) FROM lead_rejects") == [(0,)]
@@ -0,0 +1,63 @@
+"""Tests for QueryRunner's result cache in src/query_cache.py"""
+
+from src.data_loader import CSVLoader
+from src.query_cache import QueryCache, is_cacheable, referenced_tables
+from src.query_runner import QueryRunner
+
+from tests.helpers import make_lead
+
+
+def test_referenced_tables_covers_every_from_list_item():
+    assert referenced_tables(
+        "SELECT * FROM leads l, industry_summary s WHERE l.industry = s.industry"
+    ) == ["industry_summary", "leads"]
+    assert referenced_tables(
+        "SELECT 'FROM x, y' FROM (SELECT email FROM public.leads) a, lead_rejects r "
+        "JOIN lead_counts_daily d ON d.day = ANY(ARRAY[r.created_at::date, now()::date]) "
+        "WHERE r.row_num IN (1, 2) ORDER BY a.email, r.row_num"
+    ) == ["lead_counts_daily", "lead_rejects", "leads"]
+
+
+def test_is_cacheable_only_for_reads():
+    assert is_cacheable("-- counts\nSELECT COUNT(*) FROM leads")
+    assert is_cacheable("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not is_cacheable("UPDATE leads SET status = 'Lost'")
+
+
+def test_query_cache_invalidates_expires_and_evicts():
+    cache = QueryCache()
+    key = cache.key("SELECT * FROM leads", None)
+    cache.put(key, [{"n": 1}], {"leads": 1})
+
+    assert cache.get(key, {"leads": 1}) == [{"n": 1}]
+    assert cache.get(key, {"leads": 2}) is None
+    assert cache.get_metrics()["invalidations"] == 1
+
+    expired = QueryCache(ttl_seconds=0)
+    expired.put(key, [{"n": 1}], {"leads": 1})
+    assert expired.get(key, {"leads": 1}) is None
+    assert expired.get_metrics()["expirations"] == 1
+
+    small = QueryCache(max_bytes=2_000)
+    for n in range(10):
+        small.put(small.key("SELECT %s", (n,)), [{"n": n}], {})
+    assert small.get_metrics()["evictions"] > 0
+    assert small.bytes <= small.max_bytes
+
+    assert cache.key("SELECT %s", ([{"unhashable": {1}}],)) is None
+
+
+def test_cached_query_sees_rows_loaded_since(db):
+    cache = QueryCache()
+    sql = "SELECT COUNT(*) AS n FROM (SELECT 1) one, leads"
+
+    with QueryRunner(db, cache=cache) as runner:
+        assert runner.run_query(sql) == [{"n": 0}]
+        assert runner.run_query(sql) == [{"n": 0}]
+        assert cache.get_metrics()["hits"] == 1
+
+        with CSVLoader(db, strategy="copy") as loader:
+            loader.load_records([make_lead()], "leads")
+
+        assert runner.run_query(sql) == [{"n": 1}]
+        assert cache.get_metrics()["invalidations"] == 1
@@ -0,0 +1,87 @@
+"""Tests for the named-query registry in src/query_registry.py"""
+
+import pytest
+
+from src.data_loader import CSVLoader
+from src.query_registry import NamedQuery, QueryRegistry, parse_queries
+from src.query_runner import QueryRunner
+
+from tests.helpers import make_lead
+
+
+def test_parse_queries_splits_on_markers_and_drops_semicolons():
+    queries = parse_queries(
+        "-- header comment\n"
+        "-- @query: First\n"
+        "SELECT 1;\n"
+        "\n"
+        "-- @query: Second\n"
+        "SELECT *\n"
+        "FROM leads\n"
+        "WHERE status = %s;\n"
+    )
+
+    assert queries == {
+        "First": "SELECT 1",
+        "Second": "SELECT *\nFROM leads\nWHERE status = %s",
+    }
+
+
+def test_named_query_numbers_placeholders_for_prepare():
+    positional = NamedQuery("p", "SELECT * FROM leads WHERE status = %s AND email LIKE %s")
+    assert positional.statement_sql.endswith("status = $1 AND email LIKE $2")
+    assert positional.execute_sql.endswith("(%s, %s)")
+    assert positional.bind(("New", "%@acme.com")) == ("New", "%@acme.com")
+
+    named = NamedQuery(
+        "n", "SELECT %(day)s, %(status)s WHERE %(day)s > now() AND x LIKE 'a%%'"
+    )
+    assert named.statement_sql == "SELECT $1, $2 WHERE $1 > now() AND x LIKE 'a%'"
+    assert named.bind({"status": "New", "day": "2024-01-01"}) == ("2024-01-01", "New")
+
+    # Without placeholders psycopg2 leaves "%" alone, and so does PREPARE
+    literal = NamedQuery("l", "SELECT * FROM leads WHERE email LIKE '%%@acme.com'")
+    assert literal.statement_sql == literal.sql
+    assert literal.execute_sql == f"EXECUTE {literal.statement_name}"
+
+    assert NamedQuery("p", positional.sql + " ").statement_name != positional.statement_name
+
+
+def test_named_query_rejects_wrong_parameter_count():
+    query = NamedQuery("p", "SELECT * FROM leads WHERE status = %s")
+
+    with pytest.raises(ValueError):
+        query.bind(("New", "extra"))
+
+
+def test_registry_rereads_a_file_only_when_it_changes(tmp_path):
+    path = tmp_path / "queries.sql"
+    path.write_text("-- @query: Count\nSELECT COUNT(*) FROM leads;\n")
+    registry = QueryRegistry()
+
+    first = registry.load(str(path))
+    assert registry.load(str(path)) is first
+
+    path.write_text("-- @query: Count\nSELECT COUNT(*) AS n FROM leads;\n")
+    assert registry.get(str(path), "Count").sql == "SELECT COUNT(*) AS n FROM leads"
+
+    with pytest.raises(KeyError):
+        registry.get(str(path), "Missing")
+
+
+def test_named_query_runs_as_a_prepared_statement(db, tmp_path):
+    path = tmp_path / "queries.sql"
+    path.write_text("-- @query: By status\nSELECT COUNT(*) AS n FROM leads WHERE status = %s;\n")
+    registry = QueryRegistry()
+
+    with CSVLoader(db, strategy="copy") as loader:
+        loader.load_records([make_lead()], "leads")
+
+    with QueryRunner(db, registry=registry) as runner:
+        assert runner.run_query_from_file(str(path), "By status", ("New",)) == [{"n": 1}]
+        statement = registry.get(str(path), "By status").statement_name
+        assert registry.prepared_on(runner.conn) == {statement}
+
+        # A session reset drops the statement: it is prepared again
+        runner.cursor.execute("DEALLOCATE ALL")
+        assert runner.run_query_from_file(str(path), "By status", ("Lost",)) == [{"n": 0}]
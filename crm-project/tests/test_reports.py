@@ -0,0 +1,95 @@
+"""Tests for the single-scan ReportEngine in src/reports.py"""
+
+import csv
+
+from src.data_loader import CSVLoader
+from src.query_runner import QueryRunner
+from src.reports import ReportEngine
+
+from tests.helpers import make_lead
+
+
+class FakeRunner:
+    """Returns canned rows for the one query ReportEngine runs"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def run_query(self, sql, params=None):
+        self.queries.append(sql)
+        return self.rows
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def _engine(runner, tmp_path, **kwargs):
+    return ReportEngine(
+        runner, daily_dir=str(tmp_path / "daily"), errors_dir=str(tmp_path / "errors"), **kwargs
+    )
+
+
+def test_grouping_ids_fan_out_to_one_file_per_report(tmp_path):
+    # GROUPING(status, industry): a 1 bit for each column NOT grouped
+    metrics = {"metric_0": 0, "metric_1": 0, "metric_2": 0}
+    runner = FakeRunner(
+        [
+            {"status": "New", "industry": None, "grouping_id": 0b01, "count": 3, **metrics},
+            {"status": "Lost", "industry": None, "grouping_id": 0b01, "count": 1, **metrics},
+            # A NULL industry group: told apart from the total by grouping_id
+            {"status": None, "industry": None, "grouping_id": 0b10, "count": 2, **metrics},
+            {"status": None, "industry": "Technology", "grouping_id": 0b10, "count": 2, **metrics},
+            {"status": None, "industry": None, "grouping_id": 0b11, "count": 4,
+             "metric_0": 4, "metric_1": 4, "metric_2": 2},
+        ]
+    )
+
+    written = _engine(runner, tmp_path).generate()
+
+    assert len(runner.queries) == 1
+    assert "GROUPING SETS ((status), (industry), ())" in runner.queries[0]
+    assert _read(tmp_path / "daily" / "leads_by_status.csv") == [
+        ["status", "count"], ["New", "3"], ["Lost", "1"]
+    ]
+    assert _read(tmp_path / "daily" / "leads_by_industry.csv") == [
+        ["industry", "count"], ["", "2"], ["Technology", "2"]
+    ]
+    assert _read(tmp_path / "errors" / "data_quality_report.csv") == [
+        ["metric", "value"],
+        ["Total Rows", "4"],
+        ["Rows by Status", "4"],
+        ["Rows without Industry", "2"],
+    ]
+    assert sorted(written.values()) == [2, 2, 3]
+
+
+def test_empty_table_still_writes_every_report(tmp_path):
+    _engine(FakeRunner([]), tmp_path).generate()
+
+    assert _read(tmp_path / "daily" / "leads_by_status.csv") == [["status", "count"]]
+    assert _read(tmp_path / "errors" / "data_quality_report.csv")[1] == ["Total Rows", "0"]
+
+
+def test_summary_tables_give_the_same_reports_as_leads(db, tmp_path):
+    with CSVLoader(db, strategy="copy") as loader:
+        loader.load_records(
+            [
+                make_lead(email="a@acme.com"),
+                make_lead(email="b@acme.com", status="Lost", industry=""),
+                make_lead(email="c@acme.com", status="Lost"),
+            ],
+            "leads",
+        )
+
+    with QueryRunner(db) as runner:
+        _engine(runner, tmp_path / "leads").generate()
+        _engine(runner, tmp_path / "summary", from_aggregates=True).generate()
+
+    for report in ("daily/leads_by_status.csv", "daily/leads_by_industry.csv",
+                   "errors/data_quality_report.csv"):
+        from_leads = _read(tmp_path / "leads" / report)
+        assert sorted(from_leads) == sorted(_read(tmp_path / "summary" / report))
+    assert ["Rows without Industry", "1"] in from_leads
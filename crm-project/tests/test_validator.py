@@ -0,0 +1,64 @@
+"""Tests for LeadValidator's row and DataFrame paths in src/validator.py"""
+
+import pandas as pd
+import pytest
+
+from src.validator import LeadValidator
+
+from tests.helpers import make_lead
+
+
+# Values that sit on the edges of the validation patterns. "$" alone
+# would let Python's re accept a trailing newline; pandas must agree.
+# Non-ASCII digits / spaces are \d / \s to Python's re, not to RE2.
+EDGE_VALUES = {
+    "email": [
+        "a@b.com",
+        "a@b.com\n",
+        "\na@b.com",
+        "a@b.com ",
+        "a@b.c",
+        "first.last+tag@sub.example.org",
+        "a@@b.com",
+        "",
+    ],
+    "company_name": [
+        "Acme", "Acme\n", "A", "Acme & Sons, Inc.", "Acme!", "Äcme", "Acme\u00a0Corp", "",
+    ],
+    "phone_num": [
+        "(240)4808282",
+        "240-480-8282\n",
+        "240 480 8282",
+        "24048082821",
+        "２４０４８０８２８２",
+        "240\u00a0480\u00a08282",
+        "",
+    ],
+    "status": ["New", "new", "New\n", ""],
+}
+
+
+# Frames from CSV hold pyarrow strings (RE2); from Parquet, objects (re)
+@pytest.mark.parametrize("dtype", ["str", object])
+@pytest.mark.parametrize(
+    "field,value",
+    [(field, value) for field, values in EDGE_VALUES.items() for value in values],
+)
+def test_frame_and_row_validation_agree(field, value, dtype):
+    lead = make_lead(**{field: value})
+    validator = LeadValidator()
+
+    row_valid = validator.validate_lead(lead)
+    row_codes = ";".join(validator.error_codes)
+
+    valid_mask, error_codes = validator.validate_frame(pd.DataFrame([lead], dtype=dtype))
+
+    assert bool(valid_mask.iloc[0]) == row_valid
+    assert error_codes.iloc[0] == row_codes
+
+
+def test_trailing_newline_email_is_rejected():
+    validator = LeadValidator()
+
+    assert not validator.validate_lead(make_lead(email="a@b.com\n"))
+    assert validator.error_codes == ["email_invalid_format"]